@@ -0,0 +1,167 @@
+"""
+Generator Benchmarks
+Times every generator stage at several scale points and compares against a stored JSON baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import time
+from typing import Callable, List, Dict
+
+import numpy as np
+
+from generate_design_data import (
+    NUM_PROJECTS, generate_design_projects, generate_lifecycle_assessments, generate_material_alternatives,
+)
+from generate_dryfood_data import (
+    NUM_BATCHES, generate_dehydration_batches, generate_temperature_humidity_logs, generate_waste_impact_records,
+)
+from generate_production_data import (
+    NUM_ORDERS, generate_dpp_records, generate_orders, generate_quality_checks, generate_stage_tracking,
+)
+from generate_steel_data import (
+    FURNACES, METRICS_DAYS, SITE_REGION, generate_furnace_metrics, generate_timestamp_series,
+)
+from grid_intensity import GridIntensity
+from steel_status_timeline import build_fleet_timelines
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+
+def timed(results: Dict[str, Dict], name: str, fn: Callable, *args):
+    """Run one stage, recording seconds and output size; returns its output"""
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        output = fn(*args)
+    results[name] = {"seconds": time.perf_counter() - started, "records": len(output)}
+    return output
+
+
+def bench_steel(scale: int) -> Dict[str, Dict]:
+    """Furnace metrics for main()'s window, stretched by scale"""
+    results = {}
+    timelines = build_fleet_timelines(FURNACES, days_back=METRICS_DAYS * scale)
+    timestamps = timed(results, "generate_timestamp_series", generate_timestamp_series, METRICS_DAYS * scale)
+    grid = GridIntensity.load()
+    intensities = timed(results, "grid intensity lookup",
+                        lambda: grid.at(SITE_REGION, np.array(timestamps)).tolist())
+    timed(results, "generate_furnace_metrics", lambda: [
+        generate_furnace_metrics(furnace, ts, timelines[furnace["id"]].state_at_epoch(ts), intensity)
+        for furnace in FURNACES for ts, intensity in zip(timestamps, intensities)
+    ])
+    return results
+
+
+def bench_production(scale: int) -> Dict[str, Dict]:
+    results = {}
+    orders = timed(results, "generate_orders", generate_orders, NUM_ORDERS * scale)
+    timed(results, "generate_stage_tracking", generate_stage_tracking, orders)
+    timed(results, "generate_dpp_records", generate_dpp_records, orders)
+    timed(results, "generate_quality_checks", generate_quality_checks, orders)
+    return results
+
+
+def bench_dryfood(scale: int) -> Dict[str, Dict]:
+    results = {}
+    batches = timed(results, "generate_dehydration_batches", generate_dehydration_batches, NUM_BATCHES * scale)
+    timed(results, "generate_temperature_humidity_logs", generate_temperature_humidity_logs, batches)
+    timed(results, "generate_waste_impact_records", generate_waste_impact_records, batches)
+    return results
+
+
+def bench_design(scale: int) -> Dict[str, Dict]:
+    results = {}
+    projects = timed(results, "generate_design_projects", generate_design_projects, NUM_PROJECTS * scale)
+    timed(results, "generate_material_alternatives", generate_material_alternatives, projects)
+    timed(results, "generate_lifecycle_assessments", generate_lifecycle_assessments, projects)
+    return results
+
+
+BENCHMARKS = {
+    "steel": bench_steel,
+    "production": bench_production,
+    "dryfood": bench_dryfood,
+    "design": bench_design,
+}
+
+
+def run(scales: List[int], repeats: int) -> Dict[str, Dict]:
+    """Best-of-repeats seconds per "generator.stage@scale" key"""
+    results: Dict[str, Dict] = {}
+    for scale in scales:
+        # One pass is plenty once a stage takes seconds
+        rounds = repeats if scale < 100 else 1
+        for generator, bench in BENCHMARKS.items():
+            for _ in range(rounds):
+                random.seed(scale)
+                for stage, stats in bench(scale).items():
+                    key = f"{generator}.{stage}@{scale}x"
+                    best = results.get(key)
+                    if best is None or stats["seconds"] < best["seconds"]:
+                        results[key] = stats
+            print(f"   ✅ {generator} @ {scale}x")
+    return {
+        key: {
+            "seconds": round(stats["seconds"], 4),
+            "records": stats["records"],
+            "records_per_second": round(stats["records"] / stats["seconds"], 1) if stats["seconds"] > 0 else None,
+        }
+        for key, stats in results.items()
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """Keys that got slower than the baseline by more than tolerance"""
+    regressions = []
+    for key, stats in results.items():
+        base = baseline.get(key)
+        if not base or base["seconds"] < 0.001:
+            continue  # Sub-millisecond stages are all noise
+        ratio = stats["seconds"] / base["seconds"]
+        marker = "⚠️ " if ratio > 1 + tolerance else "  "
+        print(f" {marker} {key:.<60} {base['seconds']:>9.4f}s -> {stats['seconds']:>9.4f}s ({ratio:.2f}x)")
+        if ratio > 1 + tolerance:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    """Benchmark the generators; exits non-zero on regressions against the baseline"""
+    parser = argparse.ArgumentParser(description="Benchmark the data generators")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100],
+                        help="Multiples of the default record counts")
+    parser.add_argument("--repeats", type=int, default=3, help="Best-of rounds below 100x")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3,
+                        help="Allowed slowdown before a stage counts as a regression (0.3 = 30%%)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("⏱️  GENERATOR BENCHMARKS")
+    print("=" * 60)
+    results = run(args.scales, args.repeats)
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\n✅ Baseline written to {args.baseline}")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    print("\n📊 Against baseline:")
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} stage(s) regressed by more than {args.tolerance:.0%}")
+        sys.exit(1)
+    print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
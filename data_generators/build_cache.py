@@ -0,0 +1,367 @@
+"""
+Build Cache
+Content-addressed cache of generator outputs: a target reruns only when its code, reference data, options, seed or upstream outputs change
+"""
+
+import argparse
+import ast
+import hashlib
+import importlib
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+from typing import Any, List, Dict, Optional
+
+import numpy as np
+
+from partitioned_output import MANIFEST_FILE, update_manifest
+
+GENERATOR_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(GENERATOR_DIR, ".build_cache")
+DEFAULT_OUT_DIR = os.path.join(GENERATOR_DIR, "generated_data")
+ENTRY_FILE = "entry.json"
+LATEST_FILE = "latest.json"
+KEEP_ENTRIES = 3  # Builds kept per target; older ones are pruned
+
+# Each target runs one script. Its key covers the script and every local
+# module it imports, the named reference tables, the data files it reads,
+# the options its script's arg_parser() defines and the seed (for targets
+# that take options) and the keys of the targets in deps, so a change to
+# steel or production also rebuilds the emissions roll-up.
+TARGETS = {
+    "steel": {
+        "script": "generate_steel_data.py",
+        "reference": ["FURNACES", "ROUTE_FACTORS", "STEEL_GRADES", "STATUS_LOAD_FACTORS", "SITE_REGION"],
+        "data": ["grid_profiles"],
+        "deps": [],
+        "options": True,
+    },
+    "production": {
+        "script": "generate_production_data.py",
+        "reference": ["STAGES", "FABRIC_TYPES", "GARMENT_TYPES", "SUPPLIERS", "CUSTOMERS"],
+        "data": ["grid_profiles"],
+        "deps": [],
+        "options": True,
+    },
+    "dryfood": {
+        "script": "generate_dryfood_data.py",
+        "reference": ["FOOD_TYPES", "DEHYDRATORS", "SITE_REGION"],
+        "data": ["grid_profiles"],
+        "deps": [],
+        "options": True,
+    },
+    "design": {
+        "script": "generate_design_data.py",
+        "reference": ["INDUSTRIES", "MATERIALS", "PROCESSES", "COMPANIES"],
+        "data": [],
+        "deps": [],
+        "options": True,
+    },
+    "emissions": {
+        "script": "emissions_graph.py",
+        "reference": [],
+        "data": [],
+        "deps": ["steel", "production"],
+        "options": False,
+    },
+}
+
+# Options that only change how a run is measured; builds with them always run
+UNCACHED_OPTIONS = ("--profile", "--cprofile")
+
+
+def add_seed_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--seed", type=int,
+                        help="Seed the random generator so runs are reproducible (and cacheable by build_cache.py)")
+
+
+def apply_seed(args: argparse.Namespace):
+    if args.seed is not None:
+        random.seed(args.seed)
+
+
+def digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def canonical(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode()
+
+
+def local_modules(script: str) -> List[str]:
+    """The script and every module of this directory it imports, transitively"""
+    seen = []
+    pending = [os.path.splitext(script)[0]]
+    while pending:
+        name = pending.pop()
+        path = os.path.join(GENERATOR_DIR, f"{name}.py")
+        if name in seen or not os.path.exists(path):
+            continue
+        seen.append(name)
+        with open(path) as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                pending.extend(alias.name.split(".")[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                pending.append(node.module.split(".")[0])
+    return sorted(seen)
+
+
+def code_hash(script: str) -> Dict[str, str]:
+    hashes = {}
+    for name in local_modules(script):
+        with open(os.path.join(GENERATOR_DIR, f"{name}.py"), "rb") as f:
+            hashes[name] = digest(f.read())
+    return hashes
+
+
+def script_module(script: str):
+    if GENERATOR_DIR not in sys.path:
+        sys.path.insert(0, GENERATOR_DIR)
+    return importlib.import_module(os.path.splitext(script)[0])
+
+
+def reference_hash(script: str, names: List[str]) -> Dict[str, str]:
+    """Each reference table's loaded value, so rebuild messages can name the table that changed"""
+    if not names:
+        return {}
+    module = script_module(script)
+    return {name: digest(canonical(getattr(module, name))) for name in names}
+
+
+def option_values(action: argparse.Action, rest: List[str]) -> int:
+    """How many of the tokens after a flag are its values"""
+    if action.nargs is None:
+        return 1
+    if action.nargs in ("?", "*", "+"):
+        values = next((i for i, token in enumerate(rest) if token.startswith("-")), len(rest))
+        return min(values, 1) if action.nargs == "?" else values
+    return action.nargs
+
+
+def split_options(names: List[str], options: List[str]) -> Dict[str, List[str]]:
+    """Each target's share of the generator options: those its script's arg_parser() defines"""
+    parsers = {name: script_module(TARGETS[name]["script"]).arg_parser()
+               for name in names if TARGETS[name]["options"]}
+    split: Dict[str, List[str]] = {name: [] for name in names}
+    i = 0
+    while i < len(options):
+        flag, inline = options[i].split("=", 1)[0], "=" in options[i]
+        actions = {name: parser._option_string_actions[flag]
+                   for name, parser in parsers.items() if flag in parser._option_string_actions}
+        if not actions:
+            raise ValueError(f"no generator takes {options[i]}")
+        count = 1 + (0 if inline else option_values(next(iter(actions.values())), options[i + 1:]))
+        for name in actions:
+            split[name].extend(options[i:i + count])
+        i += count
+    return split
+
+
+def data_hash(paths: List[str]) -> Dict[str, str]:
+    hashes = {}
+    for path in paths:
+        full = os.path.join(GENERATOR_DIR, path)
+        files = [full] if os.path.isfile(full) else sorted(
+            os.path.join(root, name) for root, _, names in os.walk(full) for name in names)
+        for file in files:
+            with open(file, "rb") as f:
+                hashes[os.path.relpath(file, GENERATOR_DIR)] = digest(f.read())
+    return hashes
+
+
+def target_inputs(name: str, options: List[str], seed: Optional[int], dep_keys: Dict[str, str]) -> Dict:
+    """Everything a target's outputs are a function of"""
+    target = TARGETS[name]
+    return {
+        "code": code_hash(target["script"]),
+        "reference": reference_hash(target["script"], target["reference"]),
+        "data": data_hash(target["data"]),
+        "options": options,
+        "seed": seed if target["options"] else None,
+        # Generated windows end at the time of the run, so entries expire daily
+        "as_of": date.today().isoformat(),
+        "toolchain": {"python": sys.version.split()[0], "numpy": np.__version__},
+        "deps": {dep: dep_keys[dep] for dep in target["deps"]},
+    }
+
+
+def inputs_key(inputs: Dict) -> str:
+    return digest(canonical(inputs))[:24]
+
+
+def changed_inputs(previous: Optional[Dict], inputs: Dict) -> List[str]:
+    """Which inputs differ from the target's last build, for the rebuild message"""
+    if previous is None:
+        return ["not built before"]
+    changes = []
+    for field, value in inputs.items():
+        old = previous.get(field)
+        if old == value:
+            continue
+        if isinstance(value, dict) and isinstance(old, dict) and field in ("code", "reference", "data", "deps"):
+            names = sorted(key for key in set(value) | set(old) if value.get(key) != old.get(key))
+            changes.append(f"{field}: {', '.join(names)}")
+        else:
+            changes.append(field)
+    return changes
+
+
+def target_order(names: List[str]) -> List[str]:
+    """The requested targets and their dependencies, dependencies first"""
+    order: List[str] = []
+
+    def visit(name: str):
+        if name not in order:
+            for dep in TARGETS[name]["deps"]:
+                visit(dep)
+            order.append(name)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+def run_target(name: str, options: List[str], seed: Optional[int], cwd: str, out_dir: str):
+    target = TARGETS[name]
+    if target["options"]:
+        args = [*options, "--seed", str(seed)] if seed is not None else options
+    else:
+        args = ["--data-dir", out_dir]
+    result = subprocess.run([sys.executable, os.path.join(GENERATOR_DIR, target["script"]), *args], cwd=cwd)
+    if result.returncode != 0:
+        raise RuntimeError(f"{target['script']} exited with status {result.returncode}")
+
+
+def restore(entry_dir: str, out_dir: str):
+    """Copy a cached build into the output directory; partition manifest entries are merged, not replaced"""
+    os.makedirs(out_dir, exist_ok=True)
+    for item in sorted(os.listdir(entry_dir)):
+        source = os.path.join(entry_dir, item)
+        destination = os.path.join(out_dir, item)
+        if item == ENTRY_FILE:
+            continue
+        if item == MANIFEST_FILE:
+            with open(source) as f:
+                for table, entry in json.load(f)["tables"].items():
+                    update_manifest(out_dir, table, entry)
+        elif os.path.isdir(source):
+            shutil.rmtree(destination, ignore_errors=True)
+            shutil.copytree(source, destination)
+        else:
+            shutil.copy2(source, destination)
+
+
+def prune(target_dir: str, keep: int = KEEP_ENTRIES):
+    entries = [os.path.join(target_dir, name) for name in os.listdir(target_dir)
+               if os.path.exists(os.path.join(target_dir, name, ENTRY_FILE))]
+    entries.sort(key=lambda path: os.path.getmtime(os.path.join(path, ENTRY_FILE)), reverse=True)
+    for path in entries[keep:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def build(names: List[str], options: List[str], seed: Optional[int], out_dir: str, cache_dir: str,
+          use_cache: bool = True) -> Dict[str, Dict]:
+    """Bring each target's outputs in out_dir up to date, reusing cached builds where the inputs match"""
+    report: Dict[str, Dict] = {}
+    keys: Dict[str, str] = {}
+    order = target_order(names)
+    own_options = split_options(order, options)
+    os.makedirs(out_dir, exist_ok=True)
+    for name in order:
+        started = time.perf_counter()
+        options = own_options[name]
+        inputs = target_inputs(name, options, seed, keys)
+        key = keys[name] = inputs_key(inputs)
+        target_dir = os.path.join(cache_dir, name)
+        entry_dir = os.path.join(target_dir, key)
+
+        if not use_cache:
+            print(f"🔨 {name}: running uncached")
+            run_target(name, options, seed, out_dir, out_dir)
+            report[name] = {"key": key, "status": "uncached", "seconds": round(time.perf_counter() - started, 2)}
+            continue
+
+        latest_path = os.path.join(target_dir, LATEST_FILE)
+        previous = None
+        if os.path.exists(latest_path):
+            with open(latest_path) as f:
+                previous = json.load(f)
+
+        if os.path.exists(os.path.join(entry_dir, ENTRY_FILE)):
+            restore(entry_dir, out_dir)
+            os.utime(os.path.join(entry_dir, ENTRY_FILE))  # Keep recently used entries from being pruned
+            status, changes = "cached", []
+            print(f"♻️  {name}: up to date, reused {key}")
+        else:
+            changes = changed_inputs(previous, inputs)
+            print(f"🔨 {name}: building {key} ({'; '.join(changes)})")
+            os.makedirs(target_dir, exist_ok=True)
+            staging = tempfile.mkdtemp(prefix="staging-", dir=target_dir)
+            try:
+                run_target(name, options, seed, staging, out_dir)
+                with open(os.path.join(staging, ENTRY_FILE), "w") as f:
+                    json.dump({"key": key, "inputs": inputs, "seconds": round(time.perf_counter() - started, 2)},
+                              f, indent=2, sort_keys=True)
+                shutil.rmtree(entry_dir, ignore_errors=True)  # A build interrupted before its entry was written
+                os.replace(staging, entry_dir)
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+            restore(entry_dir, out_dir)
+            prune(target_dir)
+            status = "built"
+
+        with open(latest_path, "w") as f:
+            json.dump(inputs, f, indent=2, sort_keys=True)
+        report[name] = {"key": key, "status": status, "changes": changes,
+                        "seconds": round(time.perf_counter() - started, 2)}
+    return report
+
+
+def main():
+    """Build the requested targets, reusing cached outputs; other options go to the generators that take them"""
+    parser = argparse.ArgumentParser(description="Generate demo data, reusing cached outputs whose inputs are unchanged")
+    parser.add_argument("--target", action="append", choices=list(TARGETS), dest="targets",
+                        help="Target to build, with its dependencies; repeatable (default: all)")
+    parser.add_argument("--out-dir", default=DEFAULT_OUT_DIR)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true", help="Run every target, as generate_all.sh used to")
+    add_seed_args(parser)
+    args, options = parser.parse_known_args()
+
+    use_cache = not args.no_cache
+    if use_cache and args.seed is None:
+        print("ℹ️  No --seed: every run draws new data, so nothing is cached")
+        use_cache = False
+    elif use_cache and any(option.split("=")[0] in UNCACHED_OPTIONS for option in options):
+        print("ℹ️  Profiling measures a real run, so nothing is cached")
+        use_cache = False
+
+    out_dir = os.path.abspath(args.out_dir)
+    started = time.perf_counter()
+    try:
+        split_options(target_order(args.targets or list(TARGETS)), options)
+    except ValueError as e:
+        parser.error(str(e))
+    report = build(args.targets or list(TARGETS), options, args.seed, out_dir, os.path.abspath(args.cache_dir),
+                   use_cache)
+
+    print("\n" + "=" * 60)
+    print("📦 BUILD SUMMARY")
+    print("=" * 60)
+    for name, result in report.items():
+        print(f"{name:.<20} {result['status']:<10} {result['seconds']:>7.2f}s  {result['key']}")
+    print("=" * 60)
+    print(f"✅ {sum(r['status'] == 'cached' for r in report.values())}/{len(report)} targets reused "
+          f"in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
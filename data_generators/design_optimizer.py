@@ -0,0 +1,130 @@
+"""
+Zero@Design Material Scenario Optimizer
+Enumerates every feasible material combination and keeps the CO2/cost/recyclability Pareto front
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import permutations
+from typing import Callable, List, Dict, Optional, Tuple
+
+import numpy as np
+
+# Above this many (combination x project) scores a batch is split over a process pool
+PARALLEL_THRESHOLD = 2_000_000
+
+
+@lru_cache(maxsize=None)
+def combination_matrix(num_materials: int, slots: int) -> np.ndarray:
+    """Every ordered assignment of distinct materials to weight slots, as an index matrix"""
+    return np.array(list(permutations(range(num_materials), slots)), dtype=np.intp).reshape(-1, slots)
+
+
+def pareto_mask(co2: np.ndarray, cost: np.ndarray, recyclability: np.ndarray) -> np.ndarray:
+    """Mask of points no other point beats on every objective
+
+    CO2 and cost are minimized, recyclability is maximized. Recyclability is
+    a recyclable share by weight, so a project's combinations take at most
+    2^slots values of it. Levels are swept from most recyclable down: a
+    point loses to a more recyclable front point no worse on CO2 and cost,
+    or to a point of its own level ahead of it in (CO2, cost) order with no
+    higher cost. Tied points keep each other.
+    """
+    mask = np.zeros(len(co2), dtype=bool)
+    front_co2, front_cost = co2[:0], cost[:0]
+    for level in np.unique(recyclability)[::-1]:
+        members = np.flatnonzero(recyclability == level)
+        members = members[np.lexsort((cost[members], co2[members]))]
+        level_co2, level_cost = co2[members], cost[members]
+
+        beaten = ((front_co2[:, None] <= level_co2) & (front_cost[:, None] <= level_cost)).any(axis=0)
+        # Cheapest cost among points strictly ahead in (CO2, cost) order, skipping exact ties
+        cheapest = np.minimum.accumulate(np.concatenate([[np.inf], level_cost[:-1]]))
+        tie_start = np.concatenate([[True], (np.diff(level_co2) != 0) | (np.diff(level_cost) != 0)])
+        first_of_tie = np.maximum.accumulate(np.where(tie_start, np.arange(len(members)), 0))
+        beaten |= cheapest[first_of_tie] <= level_cost
+
+        kept = members[~beaten]
+        mask[kept] = True
+        front_co2 = np.concatenate([front_co2, co2[kept]])
+        front_cost = np.concatenate([front_cost, cost[kept]])
+    return mask
+
+
+def score_group(materials: List[Dict], weights: np.ndarray, units: np.ndarray,
+                current: np.ndarray) -> List[List[Dict]]:
+    """Score all combinations for projects sharing an industry and slot count
+
+    ``weights`` and ``current`` (the material index in each slot today) are
+    (projects x slots) and ``units`` is (projects,). All scores come out of
+    three matrix products, one per objective. The current combination takes
+    part in the front but is not listed as an alternative to itself.
+    """
+    combos = combination_matrix(len(materials), weights.shape[1])
+    co2_factors = np.array([m["co2_kg_per_kg"] for m in materials])[combos]
+    price_factors = np.array([m["price_per_kg"] for m in materials])[combos]
+    recyclable = np.array([m["recyclable"] for m in materials], dtype=float)[combos]
+
+    co2 = co2_factors @ weights.T                      # combos x projects
+    cost = (price_factors @ weights.T) * units         # combos x projects
+    # Recyclable share by weight, as the LCA engine scores projects
+    recyclability = (recyclable @ weights.T) / weights.sum(axis=1)
+
+    fronts = []
+    for p in range(weights.shape[0]):
+        mask = pareto_mask(co2[:, p], cost[:, p], recyclability[:, p])
+        front = np.flatnonzero(mask & (combos != current[p]).any(axis=1))
+        front = front[np.argsort(co2[front, p], kind="stable")]
+        fronts.append([
+            {
+                "materials": [materials[i]["name"] for i in combos[c]],
+                "co2_kg": float(co2[c, p]),
+                "cost_usd": float(cost[c, p]),
+                "recyclability": float(recyclability[c, p]),
+            }
+            for c in front
+        ])
+    return fronts
+
+
+def optimize_projects(projects: List[Dict], candidates: Callable[[str], List[Dict]],
+                      workers: Optional[int] = None) -> Dict[str, List[Dict]]:
+    """Pareto-optimal material alternatives to every project's current set, keyed by project_id
+
+    ``candidates(industry)`` is the material set projects of that industry
+    choose from, so every slot a project filled can be swapped. Projects are
+    grouped by industry and number of materials so each group is scored in
+    one batch. Large groups are chunked across a process pool.
+    """
+    groups: Dict[Tuple[str, int], List[Tuple[Dict, List[Dict]]]] = {}
+    for project in projects:
+        current = json.loads(project["materials_used"])
+        groups.setdefault((project["industry"], len(current)), []).append((project, current))
+
+    jobs = []
+    for (industry, slots), members in groups.items():
+        industry_materials = candidates(industry)
+        if slots > len(industry_materials):
+            continue  # No combination of distinct candidate materials fills every slot
+        index = {m["name"]: i for i, m in enumerate(industry_materials)}
+        combos = len(combination_matrix(len(industry_materials), slots))
+        chunk = max(1, PARALLEL_THRESHOLD // combos)
+        for start in range(0, len(members), chunk):
+            part = members[start:start + chunk]
+            weights = np.array([[cm["weight_kg"] for cm in current] for _, current in part])
+            units = np.array([project["units_planned"] for project, _ in part], dtype=float)
+            in_use = np.array([[index.get(cm["name"], -1) for cm in current] for _, current in part], dtype=np.intp)
+            jobs.append(([project["project_id"] for project, _ in part], industry_materials, weights, units, in_use))
+
+    results: Dict[str, List[Dict]] = {}
+    if len(jobs) > 1 and sum(len(j[0]) * len(combination_matrix(len(j[1]), j[2].shape[1])) for j in jobs) > PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = [(ids, pool.submit(score_group, *args)) for ids, *args in jobs]
+            for ids, future in futures:
+                results.update(zip(ids, future.result()))
+    else:
+        for ids, *args in jobs:
+            results.update(zip(ids, score_group(*args)))
+    return results
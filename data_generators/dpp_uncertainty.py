@@ -0,0 +1,101 @@
+"""
+Zero@Production DPP Uncertainty
+Monte Carlo confidence intervals for order and passport CO2, water and energy figures
+"""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional
+
+import numpy as np
+
+DRAWS = 10_000
+PERCENTILES = (5, 50, 95)
+
+# Relative spread (lognormal sigma) of the emission and water factors
+EMISSION_FACTOR_SIGMA = 0.25
+WATER_FACTOR_SIGMA = 0.15
+
+# Orders per array chunk: chunk x draws x stages float32 samples stay around 10 MB
+CHUNK_ORDERS = 32
+# Above this many orders the chunks are spread over a process pool
+PARALLEL_THRESHOLD = 2000
+
+
+def simulate_chunk(weights: np.ndarray, water: np.ndarray, energy: np.ndarray, stage_factors: np.ndarray,
+                   durations: np.ndarray, draws: int, seed: int) -> Dict[str, np.ndarray]:
+    """Percentiles for one chunk of orders, each an (orders x len(PERCENTILES)) array
+
+    Each draw scales every stage's emission factor by a mean-one lognormal
+    and by how long the stage ran relative to its mean duration (stages
+    emit while they run). Energy follows the total duration; water follows
+    its own lognormal factor.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(weights)
+    stages = len(stage_factors)
+    low, high = durations[:, 0], durations[:, 1]
+    mean_duration = (low + high) / 2
+
+    # float32 samples halve the memory traffic; reductions over the short
+    # stage axis go through matmul, which beats .sum(axis=2) many times over
+    sampled = rng.random(size=(n, draws, stages), dtype=np.float32)
+    sampled *= (high - low).astype(np.float32)
+    sampled += low.astype(np.float32)
+    energy_draws = energy[:, None] * (sampled @ np.full(stages, 1 / mean_duration.sum(), dtype=np.float32))
+    noise = rng.standard_normal(size=(n, draws, stages), dtype=np.float32)
+    noise *= EMISSION_FACTOR_SIGMA
+    noise -= EMISSION_FACTOR_SIGMA ** 2 / 2
+    np.exp(noise, out=noise)
+    noise *= sampled
+    co2 = weights[:, None] * (noise @ (stage_factors / mean_duration).astype(np.float32))
+    water_draws = water[:, None] * rng.lognormal(-WATER_FACTOR_SIGMA ** 2 / 2, WATER_FACTOR_SIGMA, size=(n, draws))
+
+    return {
+        "co2_kg": np.percentile(co2, PERCENTILES, axis=1).T,
+        "water_liters": np.percentile(water_draws, PERCENTILES, axis=1).T,
+        "energy_kwh": np.percentile(energy_draws, PERCENTILES, axis=1).T,
+    }
+
+
+def simulate_orders(orders: List[Dict], stages: List[Dict], fabric_types: List[Dict], draws: int = DRAWS,
+                    workers: Optional[int] = None) -> Dict[str, Dict[str, List[float]]]:
+    """p5/p50/p95 of CO2, water and energy for every order, keyed by order_id
+
+    Chunk seeds are drawn from ``random`` up front, so results follow the
+    generator's seed and do not depend on the number of workers.
+    """
+    water_per_kg = {f["name"]: f["water_liters_per_kg"] for f in fabric_types}
+    stage_factors = np.array([s["co2_per_kg"] for s in stages], dtype=float)
+    durations = np.array([s["duration_hours"] for s in stages], dtype=float)
+    weights = np.array([o["weight_kg"] for o in orders], dtype=float)
+    water = np.array([water_per_kg[o["fabric_type"]] * o["weight_kg"] for o in orders], dtype=float)
+    energy = np.array([o["energy_usage_kwh"] for o in orders], dtype=float)
+
+    chunks = [
+        (weights[i:i + CHUNK_ORDERS], water[i:i + CHUNK_ORDERS], energy[i:i + CHUNK_ORDERS],
+         stage_factors, durations, draws, random.getrandbits(63))
+        for i in range(0, len(orders), CHUNK_ORDERS)
+    ]
+    if len(orders) > PARALLEL_THRESHOLD and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            results = list(pool.map(simulate_chunk, *zip(*chunks)))
+    else:
+        results = [simulate_chunk(*chunk) for chunk in chunks]
+
+    simulated = {}
+    for start, result in zip(range(0, len(orders), CHUNK_ORDERS), results):
+        for offset, order in enumerate(orders[start:start + CHUNK_ORDERS]):
+            simulated[order["order_id"]] = {metric: values[offset].tolist() for metric, values in result.items()}
+    return simulated
+
+
+def interval_summary(percentiles: Dict[str, List[float]], divisor: float = 1.0, digits: int = 2) -> Dict:
+    """{"co2_kg": {"p5": .., "p50": .., "p95": ..}, ...}, optionally per unit"""
+    summary = {
+        metric: {f"p{p}": round(value / divisor, digits) for p, value in zip(PERCENTILES, values)}
+        for metric, values in percentiles.items()
+    }
+    summary["draws"] = DRAWS
+    return summary
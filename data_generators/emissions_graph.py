@@ -0,0 +1,213 @@
+"""
+Supply-Chain Emissions Graph
+Scope 1/2/3 roll-ups per customer, supplier and furnace, updated incrementally as records arrive
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import List, Dict, Iterable, Tuple
+
+from generate_production_data import STAGES
+from generate_steel_data import EAF_DIRECT_SHARE, FURNACES_BY_ID
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated_data")
+STAGES_BY_ID = {stage["id"]: stage for stage in STAGES}
+SCOPES = (1, 2, 3)
+
+NodeId = Tuple[str, str]
+
+
+class Node:
+    """Own emissions per scope plus the roll-up of everything below it"""
+
+    __slots__ = ("own", "total", "parents", "children")
+
+    def __init__(self):
+        self.own = [0.0, 0.0, 0.0]
+        self.total = [0.0, 0.0, 0.0]
+        self.parents: List[NodeId] = []
+        self.children = 0
+
+
+class EmissionsGraph:
+    """supplier <- stage -> order -> customer and furnace <- batch, rolled up by scope
+
+    Every node's total is its own emissions plus its children's totals.
+    Adding or replacing a record computes the change to its own emissions and
+    adds it to its ancestors only, so a stage update costs a walk of three
+    nodes however many orders exist. The graph never reaches an ancestor by
+    two paths, so each ancestor receives the change exactly once.
+    """
+
+    def __init__(self):
+        self._nodes: Dict[NodeId, Node] = {}
+        self._suppliers: Dict[str, str] = {}
+        self._supplier_stages: Dict[str, List[str]] = {}
+        self.updates = 0
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def _node(self, node_id: NodeId) -> Node:
+        node = self._nodes.get(node_id)
+        if node is None:
+            node = self._nodes[node_id] = Node()
+        return node
+
+    def _propagate(self, parents: Iterable[NodeId], delta: List[float]):
+        pending = list(parents)
+        while pending:
+            node = self._nodes[pending.pop()]
+            self.updates += 1
+            for scope in range(3):
+                node.total[scope] += delta[scope]
+            pending.extend(node.parents)
+
+    def upsert(self, node_id: NodeId, own: List[float], parents: List[NodeId]):
+        """Add or replace one node's own emissions and parents, updating only its ancestors"""
+        node = self._node(node_id)
+        for parent in parents:
+            self._node(parent)
+        if parents != node.parents:
+            # Move the whole subtree: take it out of the old ancestors, add it to the new ones
+            self._propagate(node.parents, [-value for value in node.total])
+            for parent in node.parents:
+                self._nodes[parent].children -= 1
+            node.total = [total - old + new for total, old, new in zip(node.total, node.own, own)]
+            node.own = list(own)
+            node.parents = list(parents)
+            for parent in parents:
+                self._nodes[parent].children += 1
+            self._propagate(parents, node.total)
+            return
+        delta = [new - old for new, old in zip(own, node.own)]
+        node.own = list(own)
+        for scope in range(3):
+            node.total[scope] += delta[scope]
+        self._propagate(parents, delta)
+
+    def add_order(self, order: Dict):
+        """An order emits nothing of its own
+
+        Stage records carry all-in CO2, electricity included, so an order with
+        every stage recorded rolls up to its ``total_co2_kg``. Its
+        ``energy_co2_kg`` is reported beside that figure, not added to it.
+        """
+        order_id = order["order_id"]
+        previous_supplier = self._suppliers.get(order_id)
+        self._suppliers[order_id] = order["supplier_id"]
+        self.upsert(("order", order_id), [0.0, 0.0, 0.0], [("customer", order["customer_id"])])
+        if previous_supplier not in (None, order["supplier_id"]):
+            # Move the supplier-side stages already recorded to the new supplier
+            for tracking_id in self._supplier_stages.get(order_id, []):
+                node = self._nodes[("stage", tracking_id)]
+                self.upsert(("stage", tracking_id), node.own, [("order", order_id), ("supplier", order["supplier_id"])])
+
+    def add_stage(self, record: Dict):
+        """A stage record's CO2 in its stage's scope; fibre and fabric also roll up to the supplier"""
+        supplier_id = self._suppliers.get(record["order_id"])
+        if supplier_id is None:
+            raise KeyError(f"Stage {record['tracking_id']} arrived before order {record['order_id']}")
+        stage = STAGES_BY_ID[record["stage_id"]]
+        own = [0.0, 0.0, 0.0]
+        own[stage["scope"] - 1] = record["co2_emissions_kg"] or 0.0
+        parents = [("order", record["order_id"])]
+        if stage.get("at_supplier"):
+            parents.append(("supplier", supplier_id))
+            stages = self._supplier_stages.setdefault(record["order_id"], [])
+            if record["tracking_id"] not in stages:
+                stages.append(record["tracking_id"])
+        self.upsert(("stage", record["tracking_id"]), own, parents)
+
+    def add_batch(self, batch: Dict):
+        """Blast furnaces are all scope 1; arc furnaces split direct and grid CO2"""
+        co2 = batch["co2_emitted_kg"] or 0.0
+        if FURNACES_BY_ID[batch["furnace_id"]]["type"] == "electric":
+            own = [co2 * EAF_DIRECT_SHARE, co2 * (1 - EAF_DIRECT_SHARE), 0.0]
+        else:
+            own = [co2, 0.0, 0.0]
+        self.upsert(("batch", batch["batch_id"]), own, [("furnace", batch["furnace_id"])])
+
+    def totals(self, kind: str, key: str) -> Dict:
+        node = self._nodes[(kind, key)]
+        return {
+            **{f"scope{scope}_kg": round(node.total[scope - 1], 2) for scope in SCOPES},
+            "total_kg": round(sum(node.total), 2),
+            "records": node.children,
+        }
+
+    def report(self, kinds: Iterable[str] = ("customer", "supplier", "furnace")) -> Dict[str, Dict]:
+        """Roll-ups of every node of the given kinds, keyed by kind then id"""
+        return {
+            kind: {key: self.totals(kind, key) for node_kind, key in sorted(self._nodes) if node_kind == kind}
+            for kind in kinds
+        }
+
+    def drift(self) -> float:
+        """Largest gap between the incremental totals and a full recompute, in kg"""
+        totals = {node_id: list(node.own) for node_id, node in self._nodes.items()}
+        for node in self._nodes.values():
+            pending = list(node.parents)
+            while pending:
+                parent = pending.pop()
+                for scope in range(3):
+                    totals[parent][scope] += node.own[scope]
+                pending.extend(self._nodes[parent].parents)
+        return max((abs(a - b) for node_id, node in self._nodes.items()
+                    for a, b in zip(node.total, totals[node_id])), default=0.0)
+
+
+def build(data_dir: str) -> EmissionsGraph:
+    """Graph of the generated orders, stage records and steel batches, parents first"""
+    graph = EmissionsGraph()
+    for filename, add in [
+        ("production_orders.json", graph.add_order),
+        ("production_stage_tracking.json", graph.add_stage),
+        ("steel_production_batches.json", graph.add_batch),
+    ]:
+        path = os.path.join(data_dir, filename)
+        if not os.path.exists(path):
+            print(f"   ⚠️  {filename} not found, skipped")
+            continue
+        with open(path) as f:
+            for record in json.load(f):
+                add(record)
+    return graph
+
+
+def main():
+    """Roll generated data up to customers, suppliers and furnaces by scope"""
+    parser = argparse.ArgumentParser(description="Scope 1/2/3 emission roll-ups of the generated data")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--output", default="emissions_rollup.json")
+    parser.add_argument("--check", action="store_true", help="Verify incremental totals against a full recompute")
+    args = parser.parse_args()
+
+    print("🌍 Building supply-chain emissions graph...")
+    started = time.perf_counter()
+    graph = build(args.data_dir)
+    print(f"   ✅ {len(graph):,} nodes, {graph.updates:,} ancestor updates "
+          f"in {time.perf_counter() - started:.2f}s")
+
+    if args.check:
+        drift = graph.drift()
+        print(f"   {'✅' if drift < 1e-6 else '❌'} Max drift against full recompute: {drift:.2e} kg")
+
+    report = graph.report()
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print("\n" + "=" * 60)
+    print("📊 CUSTOMER FOOTPRINTS (kg CO2)")
+    print("=" * 60)
+    for customer_id, totals in sorted(report["customer"].items(), key=lambda item: -item[1]["total_kg"]):
+        print(f"{customer_id:.<16} S1 {totals['scope1_kg']:>12,.0f}  S2 {totals['scope2_kg']:>10,.0f}  "
+              f"S3 {totals['scope3_kg']:>12,.0f}")
+    print("=" * 60)
+    print(f"✅ {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,26 @@
 
 # Zero@Ecosystem - Generate All Demo Data
 # Run all data generators
+# Usage: ./generate_all.sh [generator options]
+#   --profile                  time every stage of every generator
+#   --timestamp-format epoch   write integer epoch seconds instead of ISO text
+#   --partitioned              also write per-entity/per-day NDJSON partitions + manifest.json
+#   --seed N                   reproducible data; generators whose inputs are unchanged are
+#                              restored from .build_cache/ instead of rerun
+#   --no-cache                 rerun every generator even when seeded
+# Options are passed to every generator through build_cache.py.
+
+GENERATOR_ARGS="$*"
+PROFILING=""
+case " $GENERATOR_ARGS " in
+    *" --profile "*)
+        PROFILING=1
+        rm -f generated_data/*_profile.json
+        ;;
+esac
+case " $GENERATOR_ARGS " in
+    *" --partitioned "*) rm -f generated_data/manifest.json ;;
+esac
 
 echo "🚀 Zero@Ecosystem Demo Data Generation"
 echo "======================================"
@@ -14,32 +34,21 @@ cd generated_data
 echo "📊 Starting data generation..."
 echo ""
 
-# Generate Steel data
-echo "1/4 - Zero@Steel"
-python3 ../generate_steel_data.py
+# Generate Steel, Production, DryFood and Design data, then the emissions roll-up
+python3 ../build_cache.py --out-dir . $GENERATOR_ARGS
 echo ""
 
-# Generate Production data
-echo "2/4 - Zero@Production"
-python3 ../generate_production_data.py
-echo ""
-
-# Generate DryFood data
-echo "3/4 - Zero@DryFood"
-python3 ../generate_dryfood_data.py
-echo ""
-
-# Generate Design data
-echo "4/4 - Zero@Design"
-python3 ../generate_design_data.py
-echo ""
+if [ -n "$PROFILING" ]; then
+    python3 ../profiling.py
+    echo ""
+fi
 
 echo "======================================"
 echo "✅ ALL DATA GENERATED SUCCESSFULLY!"
 echo "======================================"
 echo ""
 echo "📁 Generated files:"
-ls -lh *.json | wc -l | xargs echo "Total JSON files:"
+ls -lh *.json | grep -v "_profile.json\|manifest.json" | wc -l | xargs echo "Total JSON files:"
 du -sh . | awk '{print "Total size: " $1}'
 echo ""
 echo "📌 Next steps:"
@@ -3,10 +3,20 @@ Zero@Design Dummy Data Generator
 Multi-industry design carbon tracking system
 """
 
+import argparse
 import random
 import json
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional
+
+from build_cache import add_seed_args, apply_seed
+from design_optimizer import optimize_projects
+from lca_engine import LCAEngine
+from partitioned_output import add_partition_args, write_partitions
+from profiling import GeneratorProfiler, add_profiling_args
+from record_ids import LegacyIds, RecordIds, add_id_args, ids_from_args
+from table_chunks import Chunk, chunked, collect
+from timestamps import TimestampFormatter, add_timestamp_args, now_epoch, to_epoch
 
 # Design industries
 INDUSTRIES = ["Textile", "Industrial", "Product", "Packaging"]
@@ -62,6 +72,8 @@ PROCESSES = [
     {"name": "Quality Control", "industry": "Product", "co2_kg_per_unit": 0.1, "duration_hours": 0.5, "energy_kwh_per_unit": 0.3},
 ]
 
+LCA_ENGINE = LCAEngine(MATERIALS, PROCESSES)
+
 # Design companies/clients
 COMPANIES = [
     {"name": "Nike", "industry": "Textile", "sustainability_target": 95},
@@ -76,8 +88,16 @@ COMPANIES = [
     {"name": "P&G", "industry": "Packaging", "sustainability_target": 88},
 ]
 
-def generate_design_projects(num_projects: int = 50) -> List[Dict]:
+# Projects in a default run
+NUM_PROJECTS = 50
+
+def candidate_materials(industry: str) -> List[Dict]:
+    """Materials a project of the industry chooses from: its own plus packaging"""
+    return [m for m in MATERIALS if m["category"] in (industry, "Packaging")]
+
+def generate_design_projects(num_projects: int = NUM_PROJECTS, ids: Optional[RecordIds] = None) -> List[Dict]:
     """Generate design projects across industries"""
+    ids = ids or LegacyIds()
     projects = []
     end_date = datetime.now()
     
@@ -89,8 +109,7 @@ def generate_design_projects(num_projects: int = 50) -> List[Dict]:
         industry = company["industry"]
         
         # Select materials appropriate for industry
-        industry_materials = [m for m in MATERIALS if m["category"] == industry or m["category"] == "Packaging"]
-        selected_materials = random.sample(industry_materials, k=random.randint(2, 4))
+        selected_materials = random.sample(candidate_materials(industry), k=random.randint(2, 4))
         
         # Select processes
         industry_processes = [p for p in PROCESSES if p["industry"] == industry]
@@ -113,50 +132,45 @@ def generate_design_projects(num_projects: int = 50) -> List[Dict]:
             progress = random.uniform(90, 100)
         
         # Calculate total carbon footprint
-        # Material carbon
-        material_weights = {m["name"]: random.uniform(0.5, 5.0) for m in selected_materials}
-        material_co2 = sum(m["co2_kg_per_kg"] * material_weights[m["name"]] for m in selected_materials)
-        
-        # Process carbon
+        material_weights = {m["name"]: round(random.uniform(0.5, 5.0), 2) for m in selected_materials}
         units_produced = random.randint(100, 5000)
-        process_co2 = sum(p["co2_kg_per_unit"] * units_produced for p in selected_processes)
+        lca = LCA_ENGINE.breakdown(
+            [(m["name"], material_weights[m["name"]]) for m in selected_materials],
+            [p["name"] for p in selected_processes],
+            units_produced
+        )
+        material_co2 = lca["material_co2_kg"]
+        process_co2 = lca["process_co2_kg"]
+        eol_co2 = lca["eol_co2_kg"]
+        recyclability_factor = lca["recyclability_factor"]
         
         # Transport carbon (estimated)
         transport_co2 = random.uniform(50, 200)
         
-        # End-of-life carbon
-        # Recycling reduces impact
-        recyclable_weight = sum(material_weights[m["name"]] for m in selected_materials if m["recyclable"])
-        total_weight = sum(material_weights.values())
-        recyclability_factor = recyclable_weight / total_weight if total_weight > 0 else 0
-        eol_co2 = total_weight * (0.5 * (1 - recyclability_factor))  # Lower if recyclable
-        
         total_co2 = material_co2 + process_co2 + transport_co2 + eol_co2
         
         # Sustainability score
         sustainability_score = (
             (recyclability_factor * 30) +  # Recyclability
-            (sum(1 for m in selected_materials if m["renewable"]) / len(selected_materials) * 20) +  # Renewable
+            (lca["renewable_fraction"] * 20) +  # Renewable
             (max(0, 100 - total_co2) / 100 * 30) +  # Low carbon
             (random.uniform(15, 20))  # Other factors
         )
         
         # Cost calculation
-        material_cost = sum(m["price_per_kg"] * material_weights[m["name"]] for m in selected_materials)
-        labor_cost = sum(p["duration_hours"] * 50 * units_produced for p in selected_processes)  # $50/hour
-        total_cost = material_cost * units_produced + labor_cost
+        total_cost = lca["material_cost_usd"] * units_produced + lca["labor_cost_usd"]
         
         project = {
-            "project_id": f"PRJ-{start_date.strftime('%Y%m')}-{i:04d}",
+            "project_id": ids.new("PRJ", to_epoch(start_date), i),
             "project_name": f"{industry} Design {random.choice(['Alpha', 'Beta', 'Gamma', 'Delta', 'Omega'])}",
             "client": company["name"],
             "industry": industry,
-            "start_date": start_date.isoformat(),
-            "target_completion": (start_date + timedelta(days=random.randint(90, 180))).isoformat(),
+            "start_date": to_epoch(start_date),
+            "target_completion": to_epoch(start_date + timedelta(days=random.randint(90, 180))),
             "phase": phase,
             "progress_percentage": round(progress, 1),
             "materials_used": json.dumps([
-                {"name": m["name"], "weight_kg": round(material_weights[m["name"]], 2)}
+                {"name": m["name"], "weight_kg": material_weights[m["name"]]}
                 for m in selected_materials
             ]),
             "processes_used": json.dumps([p["name"] for p in selected_processes]),
@@ -169,7 +183,7 @@ def generate_design_projects(num_projects: int = 50) -> List[Dict]:
             "co2_per_unit": round(total_co2 / units_produced, 3),
             "sustainability_score": round(sustainability_score, 1),
             "recyclability_percentage": round(recyclability_factor * 100, 1),
-            "renewable_content_percentage": round(sum(1 for m in selected_materials if m["renewable"]) / len(selected_materials) * 100, 1),
+            "renewable_content_percentage": round(lca["renewable_fraction"] * 100, 1),
             "total_cost_usd": round(total_cost, 2),
             "cost_per_unit": round(total_cost / units_produced, 2),
             "designer": random.choice(["Designer-A", "Designer-B", "Designer-C", "Designer-D"]),
@@ -189,33 +203,16 @@ def generate_design_projects(num_projects: int = 50) -> List[Dict]:
     return sorted(projects, key=lambda x: x["start_date"], reverse=True)
 
 def generate_material_alternatives(projects: List[Dict]) -> List[Dict]:
-    """Generate material alternative comparisons"""
+    """Generate Pareto-optimal material alternatives for every project"""
     alternatives = []
+    fronts = optimize_projects(projects, candidate_materials)
     
-    # For each project, generate alternative material scenarios
-    for project in random.sample(projects, k=min(20, len(projects))):
-        industry = project["industry"]
-        industry_materials = [m for m in MATERIALS if m["category"] == industry]
-        
-        # Current materials
+    for project in projects:
         current_materials = json.loads(project["materials_used"])
         
-        # Generate 2-3 alternatives
-        for alt_num in range(random.randint(2, 3)):
-            alt_materials = random.sample(industry_materials, k=len(current_materials))
-            
-            # Calculate alternative scenario metrics
-            alt_co2 = sum(
-                m["co2_kg_per_kg"] * cm["weight_kg"]
-                for m, cm in zip(alt_materials, current_materials)
-            )
-            
-            alt_cost = sum(
-                m["price_per_kg"] * cm["weight_kg"] * project["units_planned"]
-                for m, cm in zip(alt_materials, current_materials)
-            )
-            
-            alt_recyclability = sum(1 for m in alt_materials if m["recyclable"]) / len(alt_materials)
+        for alt_num, option in enumerate(fronts.get(project["project_id"], [])):
+            alt_co2 = option["co2_kg"]
+            alt_cost = option["cost_usd"]
             
             co2_difference = alt_co2 - project["material_co2_kg"]
             cost_difference = alt_cost - (project["total_cost_usd"] * 0.4)  # Assuming materials are 40% of cost
@@ -223,17 +220,17 @@ def generate_material_alternatives(projects: List[Dict]) -> List[Dict]:
             alternative = {
                 "alternative_id": f"{project['project_id']}-ALT-{alt_num}",
                 "project_id": project["project_id"],
-                "scenario_name": f"Alternative {alt_num + 1}",
+                "scenario_name": f"Pareto Option {alt_num + 1}",
                 "materials": json.dumps([
-                    {"name": m["name"], "weight_kg": cm["weight_kg"]}
-                    for m, cm in zip(alt_materials, current_materials)
+                    {"name": name, "weight_kg": cm["weight_kg"]}
+                    for name, cm in zip(option["materials"], current_materials)
                 ]),
                 "estimated_co2_kg": round(alt_co2, 2),
                 "co2_difference_kg": round(co2_difference, 2),
                 "co2_reduction_percentage": round((co2_difference / project["material_co2_kg"]) * 100, 1) if project["material_co2_kg"] > 0 else 0,
                 "estimated_cost_usd": round(alt_cost, 2),
                 "cost_difference_usd": round(cost_difference, 2),
-                "recyclability_percentage": round(alt_recyclability * 100, 1),
+                "recyclability_percentage": round(option["recyclability"] * 100, 1),
                 "recommendation": "Recommended" if co2_difference < 0 and cost_difference < project["total_cost_usd"] * 0.1 else "Consider",
                 "notes": f"{'Lower' if co2_difference < 0 else 'Higher'} carbon, {'Lower' if cost_difference < 0 else 'Higher'} cost"
             }
@@ -247,37 +244,24 @@ def generate_lifecycle_assessments(projects: List[Dict]) -> List[Dict]:
     
     for project in projects:
         if project["phase"] in ["testing", "completed"]:
+            # Re-derive the design breakdown; unchanged scenarios are served from the engine cache
+            breakdown = LCA_ENGINE.breakdown(
+                [(m["name"], m["weight_kg"]) for m in json.loads(project["materials_used"])],
+                json.loads(project["processes_used"]),
+                project["units_planned"]
+            )
+            breakdown["transport_co2_kg"] = project["transport_co2_kg"]
+            
             # Full lifecycle breakdown
             lca = {
                 "lca_id": f"LCA-{project['project_id']}",
                 "project_id": project["project_id"],
-                "assessment_date": datetime.now().isoformat(),
-                "lifecycle_stages": json.dumps({
-                    "raw_material_extraction": {
-                        "co2_kg": project["material_co2_kg"],
-                        "percentage": round((project["material_co2_kg"] / project["total_co2_kg"]) * 100, 1)
-                    },
-                    "manufacturing": {
-                        "co2_kg": project["process_co2_kg"],
-                        "percentage": round((project["process_co2_kg"] / project["total_co2_kg"]) * 100, 1)
-                    },
-                    "transportation": {
-                        "co2_kg": project["transport_co2_kg"],
-                        "percentage": round((project["transport_co2_kg"] / project["total_co2_kg"]) * 100, 1)
-                    },
-                    "use_phase": {
-                        "co2_kg": 0,  # Assuming no emissions during use
-                        "percentage": 0
-                    },
-                    "end_of_life": {
-                        "co2_kg": project["eol_co2_kg"],
-                        "percentage": round((project["eol_co2_kg"] / project["total_co2_kg"]) * 100, 1)
-                    }
-                }),
+                "assessment_date": now_epoch(),
+                "lifecycle_stages": json.dumps(LCA_ENGINE.lifecycle_stages(breakdown)),
                 "total_co2_kg": project["total_co2_kg"],
                 "co2_per_unit": project["co2_per_unit"],
                 "water_usage_liters": round(project["units_planned"] * random.uniform(10, 50), 2),
-                "energy_consumption_kwh": round(project["process_co2_kg"] * random.uniform(2, 4), 2),
+                "energy_consumption_kwh": round(breakdown["process_co2_kg"] * random.uniform(2, 4), 2),
                 "recyclability_score": project["recyclability_percentage"],
                 "circularity_score": round(random.uniform(60, 90), 1),
                 "improvement_recommendations": json.dumps([
@@ -290,66 +274,104 @@ def generate_lifecycle_assessments(projects: List[Dict]) -> List[Dict]:
     
     return lca_reports
 
+def tables(ids: Optional[RecordIds] = None, profiler: Optional[GeneratorProfiler] = None) -> Iterator[Chunk]:
+    """Zero@Design tables as (table, rows) chunks
+
+    A profiler stage stays open while its chunks are yielded, so it
+    includes the consumer's time.
+    """
+    profiler = profiler or GeneratorProfiler("design")
+    with profiler.stage("generate_design_projects"):
+        projects = generate_design_projects(NUM_PROJECTS, ids)
+    yield from chunked("design_projects", projects)
+    with profiler.stage("generate_material_alternatives"):
+        yield from chunked("design_material_alternatives", generate_material_alternatives(projects))
+    with profiler.stage("generate_lifecycle_assessments"):
+        yield from chunked("design_lifecycle_assessments", generate_lifecycle_assessments(projects))
+
+def arg_parser() -> argparse.ArgumentParser:
+    """Command line options"""
+    parser = argparse.ArgumentParser(description="Generate Zero@Design demo data")
+    add_profiling_args(parser)
+    add_timestamp_args(parser)
+    add_partition_args(parser)
+    add_id_args(parser)
+    add_seed_args(parser)
+    return parser
+
 def main():
     """Generate all design data"""
-    print("🎨 Generating Zero@Design Demo Data...")
-    
-    # Generate design projects
-    print("\n📐 Generating design projects...")
-    projects = generate_design_projects(50)
-    print(f"   ✅ Generated {len(projects)} projects")
+    args = arg_parser().parse_args()
+    apply_seed(args)
+    profiler = GeneratorProfiler.from_args("design", args)
+    formatter = TimestampFormatter(args.timestamp_format)
     
-    # Generate material alternatives
-    print("\n🔄 Generating material alternatives...")
-    alternatives = generate_material_alternatives(projects)
-    print(f"   ✅ Generated {len(alternatives)} alternative scenarios")
+    print("🎨 Generating Zero@Design Demo Data...")
     
-    # Generate LCA reports
-    print("\n♻️  Generating lifecycle assessments...")
-    lca_reports = generate_lifecycle_assessments(projects)
-    print(f"   ✅ Generated {len(lca_reports)} LCA reports")
+    # Design projects, material alternatives and LCA reports
+    data = collect(tables(ids_from_args(args), profiler))
+    projects = data["design_projects"]
+    print(f"\n📐 Generated {len(projects)} projects")
+    alternatives = data.get("design_material_alternatives", [])
+    print(f"🔄 Generated {len(alternatives)} alternative scenarios")
+    lca_reports = data.get("design_lifecycle_assessments", [])
+    print(f"♻️  Generated {len(lca_reports)} LCA reports")
+    lca_stats = LCA_ENGINE.stats()
+    print(f"   🗃️  LCA cache: {lca_stats['hits']} hits, {lca_stats['misses']} misses "
+          f"({lca_stats['hit_rate_percentage']}% hit rate)")
     
     # Save to JSON files
     print("\n💾 Saving to JSON files...")
     
-    with open('design_projects.json', 'w') as f:
-        json.dump(projects, f, indent=2)
+    with profiler.stage("json.dump design_projects.json"), open('design_projects.json', 'w') as f:
+        json.dump(formatter.format_records(projects, ["start_date", "target_completion"]), f, indent=2)
     print("   ✅ design_projects.json")
     
-    with open('design_material_alternatives.json', 'w') as f:
+    with profiler.stage("json.dump design_material_alternatives.json"), open('design_material_alternatives.json', 'w') as f:
         json.dump(alternatives, f, indent=2)
     print("   ✅ design_material_alternatives.json")
     
-    with open('design_lca_reports.json', 'w') as f:
-        json.dump(lca_reports, f, indent=2)
+    with profiler.stage("json.dump design_lca_reports.json"), open('design_lca_reports.json', 'w') as f:
+        json.dump(formatter.format_records(lca_reports, ["assessment_date"]), f, indent=2)
     print("   ✅ design_lca_reports.json")
     
+    if args.partitioned:
+        with profiler.stage("write partitions"):
+            for table, records in [
+                ("design_projects", projects),
+                ("design_material_alternatives", alternatives),
+                ("design_lifecycle_assessments", lca_reports),
+            ]:
+                write_partitions(".", table, records)
+        print("   ✅ partitioned layout + manifest.json")
+    
     # Generate summary
-    completed_projects = [p for p in projects if p["phase"] == "completed"]
+    with profiler.stage("summary"):
+        completed_projects = [p for p in projects if p["phase"] == "completed"]
     
-    total_co2 = sum(p["total_co2_kg"] for p in projects)
-    avg_sustainability = sum(p["sustainability_score"] for p in projects) / len(projects)
-    targets_met = len([p for p in projects if p["target_met"]])
+        total_co2 = sum(p["total_co2_kg"] for p in projects)
+        avg_sustainability = sum(p["sustainability_score"] for p in projects) / len(projects)
+        targets_met = len([p for p in projects if p["target_met"]])
     
-    summary = {
-        "total_projects": len(projects),
-        "by_industry": {
-            industry: len([p for p in projects if p["industry"] == industry])
-            for industry in INDUSTRIES
-        },
-        "completed_projects": len(completed_projects),
-        "in_progress_projects": len([p for p in projects if p["phase"] != "completed"]),
-        "total_co2_emissions_kg": round(total_co2, 2),
-        "avg_sustainability_score": round(avg_sustainability, 1),
-        "sustainability_targets_met": targets_met,
-        "target_achievement_rate": round((targets_met / len(projects)) * 100, 1),
-        "avg_recyclability": round(sum(p["recyclability_percentage"] for p in projects) / len(projects), 1),
-        "material_alternatives_analyzed": len(alternatives),
-        "lca_reports_completed": len(lca_reports),
-    }
+        summary = {
+            "total_projects": len(projects),
+            "by_industry": {
+                industry: len([p for p in projects if p["industry"] == industry])
+                for industry in INDUSTRIES
+            },
+            "completed_projects": len(completed_projects),
+            "in_progress_projects": len([p for p in projects if p["phase"] != "completed"]),
+            "total_co2_emissions_kg": round(total_co2, 2),
+            "avg_sustainability_score": round(avg_sustainability, 1),
+            "sustainability_targets_met": targets_met,
+            "target_achievement_rate": round((targets_met / len(projects)) * 100, 1),
+            "avg_recyclability": round(sum(p["recyclability_percentage"] for p in projects) / len(projects), 1),
+            "material_alternatives_analyzed": len(alternatives),
+            "lca_reports_completed": len(lca_reports),
+        }
     
-    with open('design_summary.json', 'w') as f:
-        json.dump(summary, f, indent=2)
+        with open('design_summary.json', 'w') as f:
+            json.dump(summary, f, indent=2)
     print("   ✅ design_summary.json")
     
     print("\n" + "="*60)
@@ -358,6 +380,7 @@ def main():
     for key, value in summary.items():
         print(f"{key:.<40} {value}")
     print("="*60)
+    profiler.finish()
     print("\n✅ All Zero@Design demo data generated successfully!")
     print("📁 Files ready for Supabase import\n")
 
@@ -3,10 +3,22 @@ Zero@DryFood Dummy Data Generator
 Generates dehydration process and food waste reduction data
 """
 
+import argparse
 import random
 import json
 from datetime import datetime, timedelta
-from typing import List, Dict
+from operator import itemgetter
+from typing import Iterator, List, Dict, Optional, Tuple
+
+from build_cache import add_seed_args, apply_seed
+from dryfood_scheduler import DehydratorScheduler
+from grid_intensity import GridIntensity
+from partitioned_output import add_partition_args, write_partitions
+from profiling import GeneratorProfiler, add_profiling_args
+from record_ids import LegacyIds, RecordIds, add_id_args, ids_from_args
+from table_chunks import Chunk, chunked, collect
+from time_order import release_sorted, sorted_uniforms
+from timestamps import TimestampFormatter, add_timestamp_args, to_epoch
 
 # Food types with their characteristics
 FOOD_TYPES = [
@@ -101,28 +113,70 @@ DEHYDRATORS = [
     {"id": "DH-005", "name": "Gas Dehydrator", "capacity_kg": 150, "energy_type": "gas"},
 ]
 
-def generate_dehydration_batches(num_batches: int = 100) -> List[Dict]:
-    """Generate dehydration batch records"""
-    batches = []
+# Grid profile (grid_profiles/<region>.csv) the electric dehydrators draw power from
+SITE_REGION = "TR"
+
+# Default run: batches requested over the last 60 days
+NUM_BATCHES = 100
+SCHEDULE_DAYS = 60
+
+# Logistics notes every impact analysis carries
+STORAGE_EFFICIENCY_NOTE = "Requires 80% less storage space"
+TRANSPORT_EFFICIENCY_NOTE = "60% lighter - reduced transport emissions"
+
+def generate_dehydration_batches(num_batches: int = NUM_BATCHES,
+                                 scheduler: Optional[DehydratorScheduler] = None,
+                                 grid: Optional[GridIntensity] = None,
+                                 ids: Optional[RecordIds] = None) -> List[Dict]:
+    """Generate dehydration batch records scheduled onto free dehydrators, newest first"""
+    batches = list(iter_dehydration_batches(num_batches, scheduler, grid, ids))
+    batches.reverse()
+    return batches
+
+def iter_dehydration_batches(num_batches: int = NUM_BATCHES,
+                             scheduler: Optional[DehydratorScheduler] = None,
+                             grid: Optional[GridIntensity] = None,
+                             ids: Optional[RecordIds] = None) -> Iterator[Dict]:
+    """Yield dehydration batch records oldest first
+
+    Electric batches are charged the site's mean grid intensity over the
+    hours they ran. Requested starts are drawn already in order, and a batch
+    never starts before its request, so only batches waiting for a free
+    machine are held back.
+    """
+    return release_sorted(_placed_batches(num_batches, scheduler, grid, ids or LegacyIds()),
+                          itemgetter("start_time"))
+
+def _placed_batches(num_batches: int, scheduler: Optional[DehydratorScheduler],
+                    grid: Optional[GridIntensity], ids: RecordIds) -> Iterator[Tuple[int, Dict]]:
+    """(requested start, batch) in order of requested start"""
     end_date = datetime.now()
+    window_start = end_date - timedelta(days=SCHEDULE_DAYS)
+    if scheduler is None:
+        scheduler = DehydratorScheduler(DEHYDRATORS, window_start)
+    if grid is None:
+        grid = GridIntensity.load()
     
-    for i in range(num_batches):
-        # Batch start time (last 60 days)
-        start_time = end_date - timedelta(days=random.randint(0, 60))
+    # Place batch requests on machines in time order
+    for i, offset in enumerate(sorted_uniforms(num_batches)):
+        earliest_start = window_start + timedelta(seconds=offset * SCHEDULE_DAYS * 86400)
         
         food = random.choice(FOOD_TYPES)
-        dehydrator = random.choice(DEHYDRATORS)
         
-        # Batch size
-        fresh_weight_kg = random.uniform(20, dehydrator["capacity_kg"])
-        
-        # Calculate dried weight
-        moisture_loss = food["initial_moisture"] - food["target_moisture"]
-        dried_weight_kg = fresh_weight_kg * (1 - moisture_loss / 100)
+        # Batch size, sized for a randomly requested machine class
+        fresh_weight_kg = random.uniform(20, random.choice(DEHYDRATORS)["capacity_kg"])
         
         # Dehydration duration (depends on moisture content and food type)
+        moisture_loss = food["initial_moisture"] - food["target_moisture"]
         duration_hours = random.uniform(6, 24) * (moisture_loss / 80)
-        end_time = start_time + timedelta(hours=duration_hours)
+        
+        placement = scheduler.place(fresh_weight_kg, earliest_start, duration_hours, end_date)
+        if placement is None:
+            continue
+        dehydrator, start_time, end_time = placement
+        
+        # Calculate dried weight
+        dried_weight_kg = fresh_weight_kg * (1 - moisture_loss / 100)
         
         # Energy consumption
         if dehydrator["energy_type"] == "solar":
@@ -130,7 +184,7 @@ def generate_dehydration_batches(num_batches: int = 100) -> List[Dict]:
             co2_kg = energy_kwh * 0.05  # Very low emissions for solar
         elif dehydrator["energy_type"] == "electric":
             energy_kwh = random.uniform(3, 6) * duration_hours
-            co2_kg = energy_kwh * 0.5  # Grid electricity
+            co2_kg = energy_kwh * grid.mean(SITE_REGION, to_epoch(start_time), to_epoch(end_time))
         else:  # gas
             energy_kwh = random.uniform(4, 8) * duration_hours
             co2_kg = energy_kwh * 0.4
@@ -152,13 +206,13 @@ def generate_dehydration_batches(num_batches: int = 100) -> List[Dict]:
         waste_prevented_kg = fresh_weight_kg * 0.3  # 30% would have been wasted
         
         batch = {
-            "batch_id": f"DH-{start_time.strftime('%Y%m%d')}-{i:04d}",
+            "batch_id": ids.new("DH", to_epoch(start_time), i),
             "dehydrator_id": dehydrator["id"],
             "dehydrator_name": dehydrator["name"],
             "food_type": food["name"],
             "food_category": food["category"],
-            "start_time": start_time.isoformat(),
-            "end_time": end_time.isoformat(),
+            "start_time": to_epoch(start_time),
+            "end_time": to_epoch(end_time),
             "duration_hours": round(duration_hours, 1),
             "fresh_weight_kg": round(fresh_weight_kg, 2),
             "dried_weight_kg": round(dried_weight_kg, 2),
@@ -191,9 +245,7 @@ def generate_dehydration_batches(num_batches: int = 100) -> List[Dict]:
                 ""
             ])
         }
-        batches.append(batch)
-    
-    return sorted(batches, key=lambda x: x["start_time"], reverse=True)
+        yield to_epoch(earliest_start), batch
 
 def generate_temperature_humidity_logs(batches: List[Dict]) -> List[Dict]:
     """Generate detailed temperature and humidity logs for batches"""
@@ -203,15 +255,14 @@ def generate_temperature_humidity_logs(batches: List[Dict]) -> List[Dict]:
     sample_batches = random.sample(batches, min(20, len(batches)))
     
     for batch in sample_batches:
-        start = datetime.fromisoformat(batch["start_time"])
-        end = datetime.fromisoformat(batch["end_time"])
-        duration_hours = (end - start).total_seconds() / 3600
+        start = batch["start_time"]
+        duration_hours = (batch["end_time"] - start) / 3600
         
         # Log every 30 minutes
         intervals = int(duration_hours * 2)
         
         for interval in range(intervals):
-            log_time = start + timedelta(minutes=30 * interval)
+            log_time = start + 1800 * interval
             
             # Temperature gradually increases then stabilizes
             progress = interval / intervals
@@ -227,7 +278,7 @@ def generate_temperature_humidity_logs(batches: List[Dict]) -> List[Dict]:
             log = {
                 "log_id": f"{batch['batch_id']}-LOG-{interval:03d}",
                 "batch_id": batch["batch_id"],
-                "timestamp": log_time.isoformat(),
+                "timestamp": log_time,
                 "temperature_c": round(temp, 1),
                 "humidity_percent": round(humidity, 1),
                 "fan_speed_percent": round(50 + progress * 30 + random.uniform(-5, 5), 1),
@@ -274,75 +325,126 @@ def generate_waste_impact_records(batches: List[Dict]) -> List[Dict]:
                 "value_added_through_processing_usd": batch["value_added_usd"],
                 "total_value_created_usd": round(batch["value_added_usd"] + (waste_saved * food["price_per_kg_fresh"]), 2),
                 "shelf_life_extension_factor": round(food["shelf_life_dried_days"] / food["shelf_life_fresh_days"], 1),
-                "storage_efficiency_improvement": "Requires 80% less storage space",
-                "transportation_efficiency": "60% lighter - reduced transport emissions"
+                "storage_efficiency_improvement": STORAGE_EFFICIENCY_NOTE,
+                "transportation_efficiency": TRANSPORT_EFFICIENCY_NOTE
             }
             impact_records.append(impact)
     
     return impact_records
 
+def tables(ids: Optional[RecordIds] = None, profiler: Optional[GeneratorProfiler] = None,
+           scheduler: Optional[DehydratorScheduler] = None) -> Iterator[Chunk]:
+    """Zero@DryFood tables as (table, rows) chunks, batches oldest first
+
+    Batches stream out as they are placed; logs and impact records follow
+    once every batch is known. Pass a scheduler to read its utilization
+    afterwards. A profiler stage stays open while its chunks are yielded,
+    so it includes the consumer's time.
+    """
+    profiler = profiler or GeneratorProfiler("dryfood")
+    if scheduler is None:
+        scheduler = DehydratorScheduler(DEHYDRATORS, datetime.now() - timedelta(days=SCHEDULE_DAYS))
+    batches = []
+    with profiler.stage("iter_dehydration_batches"):
+        for table, chunk in chunked("dryfood_dehydration_batches",
+                                    iter_dehydration_batches(NUM_BATCHES, scheduler, ids=ids)):
+            batches.extend(chunk)
+            yield table, chunk
+    with profiler.stage("generate_temperature_humidity_logs"):
+        yield from chunked("dryfood_temperature_humidity_logs", generate_temperature_humidity_logs(batches))
+    with profiler.stage("generate_waste_impact_records"):
+        yield from chunked("dryfood_waste_impact_analysis", generate_waste_impact_records(batches))
+
+def arg_parser() -> argparse.ArgumentParser:
+    """Command line options"""
+    parser = argparse.ArgumentParser(description="Generate Zero@DryFood demo data")
+    add_profiling_args(parser)
+    add_timestamp_args(parser)
+    add_partition_args(parser)
+    add_id_args(parser)
+    add_seed_args(parser)
+    return parser
+
 def main():
     """Generate all dry food data"""
-    print("🍎 Generating Zero@DryFood Demo Data...")
-    
-    # Generate dehydration batches
-    print("\n🌡️  Generating dehydration batches...")
-    batches = generate_dehydration_batches(100)
-    print(f"   ✅ Generated {len(batches)} batches")
+    args = arg_parser().parse_args()
+    apply_seed(args)
+    profiler = GeneratorProfiler.from_args("dryfood", args)
+    formatter = TimestampFormatter(args.timestamp_format)
     
-    # Generate temperature/humidity logs
-    print("\n📊 Generating temperature & humidity logs...")
-    logs = generate_temperature_humidity_logs(batches)
-    print(f"   ✅ Generated {len(logs)} log entries")
+    print("🍎 Generating Zero@DryFood Demo Data...")
     
-    # Generate waste impact records
-    print("\n♻️  Generating waste prevention impact analysis...")
-    impact_records = generate_waste_impact_records(batches)
-    print(f"   ✅ Generated {len(impact_records)} impact records")
+    # Dehydration batches, temperature/humidity logs and waste prevention impact
+    scheduler = DehydratorScheduler(DEHYDRATORS, datetime.now() - timedelta(days=SCHEDULE_DAYS))
+    data = collect(tables(ids_from_args(args), profiler, scheduler))
+    batches = data.get("dryfood_dehydration_batches", [])[::-1]  # The file lists batches newest first
+    print(f"\n🌡️  Generated {len(batches)} dehydration batches")
+    utilization = scheduler.utilization_report(datetime.now())
+    for machine in utilization:
+        print(f"   - {machine['dehydrator_name']}: {machine['batches']} batches, "
+              f"{machine['time_utilization_percentage']}% utilized")
+    logs = data.get("dryfood_temperature_humidity_logs", [])
+    print(f"📊 Generated {len(logs)} log entries")
+    impact_records = data.get("dryfood_waste_impact_analysis", [])
+    print(f"♻️  Generated {len(impact_records)} impact records")
     
     # Save to JSON files
     print("\n💾 Saving to JSON files...")
     
-    with open('dryfood_batches.json', 'w') as f:
-        json.dump(batches, f, indent=2)
+    with profiler.stage("json.dump dryfood_batches.json"), open('dryfood_batches.json', 'w') as f:
+        json.dump(formatter.format_records(batches, ["start_time", "end_time"]), f, indent=2)
     print("   ✅ dryfood_batches.json")
     
-    with open('dryfood_logs.json', 'w') as f:
-        json.dump(logs, f, indent=2)
+    with profiler.stage("json.dump dryfood_logs.json"), open('dryfood_logs.json', 'w') as f:
+        json.dump(formatter.format_records(logs, ["timestamp"]), f, indent=2)
     print("   ✅ dryfood_logs.json")
     
-    with open('dryfood_waste_impact.json', 'w') as f:
-        json.dump(impact_records, f, indent=2)
+    with profiler.stage("json.dump dryfood_waste_impact.json"), open('dryfood_waste_impact.json', 'w') as f:
+        json.dump(formatter.format_records(impact_records, ["analysis_date"]), f, indent=2)
     print("   ✅ dryfood_waste_impact.json")
     
+    if args.partitioned:
+        with profiler.stage("write partitions"):
+            for table, records in [
+                ("dryfood_dehydration_batches", batches),
+                ("dryfood_temperature_humidity_logs", logs),
+                ("dryfood_waste_impact_analysis", impact_records),
+            ]:
+                write_partitions(".", table, records)
+        print("   ✅ partitioned layout + manifest.json")
+    
     # Generate summary
-    completed = [b for b in batches if b["status"] == "completed"]
+    with profiler.stage("summary"):
+        completed = [b for b in batches if b["status"] == "completed"]
     
-    total_fresh = sum(b["fresh_weight_kg"] for b in completed)
-    total_dried = sum(b["dried_weight_kg"] for b in completed)
-    total_waste_prevented = sum(b["waste_prevented_kg"] for b in completed)
-    total_value_added = sum(b["value_added_usd"] for b in completed)
-    total_co2 = sum(b["co2_emissions_kg"] for b in completed)
-    total_co2_prevented = sum(i["landfill_co2_prevented_kg"] for i in impact_records)
+        total_fresh = sum(b["fresh_weight_kg"] for b in completed)
+        total_dried = sum(b["dried_weight_kg"] for b in completed)
+        total_waste_prevented = sum(b["waste_prevented_kg"] for b in completed)
+        total_value_added = sum(b["value_added_usd"] for b in completed)
+        total_co2 = sum(b["co2_emissions_kg"] for b in completed)
+        total_co2_prevented = sum(i["landfill_co2_prevented_kg"] for i in impact_records)
     
-    summary = {
-        "total_batches": len(batches),
-        "completed_batches": len(completed),
-        "total_fresh_weight_kg": round(total_fresh, 2),
-        "total_dried_weight_kg": round(total_dried, 2),
-        "avg_weight_loss_percent": round(((total_fresh - total_dried) / total_fresh) * 100, 1),
-        "total_waste_prevented_kg": round(total_waste_prevented, 2),
-        "total_value_added_usd": round(total_value_added, 2),
-        "dehydration_co2_emissions_kg": round(total_co2, 2),
-        "landfill_co2_prevented_kg": round(total_co2_prevented, 2),
-        "net_co2_impact_kg": round(total_co2 - total_co2_prevented, 2),
-        "carbon_positive": (total_co2 - total_co2_prevented) < 0,
-        "avg_shelf_life_extension_days": round(sum(b["shelf_life_extension_days"] for b in completed) / len(completed), 0),
-        "food_categories_processed": len(set(b["food_category"] for b in batches)),
-    }
+        summary = {
+            "total_batches": len(batches),
+            "completed_batches": len(completed),
+            "total_fresh_weight_kg": round(total_fresh, 2),
+            "total_dried_weight_kg": round(total_dried, 2),
+            "avg_weight_loss_percent": round(((total_fresh - total_dried) / total_fresh) * 100, 1),
+            "total_waste_prevented_kg": round(total_waste_prevented, 2),
+            "total_value_added_usd": round(total_value_added, 2),
+            "dehydration_co2_emissions_kg": round(total_co2, 2),
+            "landfill_co2_prevented_kg": round(total_co2_prevented, 2),
+            "net_co2_impact_kg": round(total_co2 - total_co2_prevented, 2),
+            "carbon_positive": (total_co2 - total_co2_prevented) < 0,
+            "avg_shelf_life_extension_days": round(sum(b["shelf_life_extension_days"] for b in completed) / len(completed), 0),
+            "food_categories_processed": len(set(b["food_category"] for b in batches)),
+            "dehydrator_utilization": {
+                m["dehydrator_id"]: m["time_utilization_percentage"] for m in utilization
+            },
+        }
     
-    with open('dryfood_summary.json', 'w') as f:
-        json.dump(summary, f, indent=2)
+        with open('dryfood_summary.json', 'w') as f:
+            json.dump(summary, f, indent=2)
     print("   ✅ dryfood_summary.json")
     
     print("\n" + "="*60)
@@ -351,6 +453,7 @@ def main():
     for key, value in summary.items():
         print(f"{key:.<40} {value}")
     print("="*60)
+    profiler.finish()
     print("\n✅ All Zero@DryFood demo data generated successfully!")
     print("📁 Files ready for Supabase import\n")
 
@@ -3,21 +3,35 @@ Zero@Production (Textile DPP) Dummy Data Generator
 Generates end-to-end textile production data
 """
 
+import argparse
 import random
 import json
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional
 
-# Production stages
+from build_cache import add_seed_args, apply_seed
+from dpp_uncertainty import DRAWS, interval_summary, simulate_orders
+from grid_intensity import GridIntensity
+from partitioned_output import add_partition_args, write_partitions
+from profiling import GeneratorProfiler, add_profiling_args
+from record_ids import LegacyIds, RecordIds, add_id_args, ids_from_args
+from table_chunks import Chunk, chunked, collect
+from time_order import sorted_uniforms
+from timestamps import TimestampFormatter, add_timestamp_args, hours, to_epoch
+
+# Production stages. "co2_per_kg" is a stage's all-in CO2, the electricity
+# it draws included, so an order's total_co2_kg is their sum alone.
+# "scope" is the GHG Protocol scope of a stage's CO2 for the manufacturer;
+# fibre and fabric are made at the supplier.
 STAGES = [
-    {"id": 1, "name": "Fibre", "duration_hours": (12, 24), "co2_per_kg": 0.8},
-    {"id": 2, "name": "Fabric", "duration_hours": (24, 48), "co2_per_kg": 1.2},
-    {"id": 3, "name": "Chemicals & Dyes", "duration_hours": (4, 8), "co2_per_kg": 2.5},
-    {"id": 4, "name": "Finishing", "duration_hours": (8, 16), "co2_per_kg": 1.5},
-    {"id": 5, "name": "Garment", "duration_hours": (16, 32), "co2_per_kg": 0.5},
-    {"id": 6, "name": "Packaging", "duration_hours": (2, 4), "co2_per_kg": 0.3},
-    {"id": 7, "name": "Order Delivery", "duration_hours": (48, 120), "co2_per_kg": 0.4},
-    {"id": 8, "name": "Employee Transport", "duration_hours": (1, 2), "co2_per_kg": 0.2},
+    {"id": 1, "name": "Fibre", "duration_hours": (12, 24), "co2_per_kg": 0.8, "scope": 3, "at_supplier": True},
+    {"id": 2, "name": "Fabric", "duration_hours": (24, 48), "co2_per_kg": 1.2, "scope": 3, "at_supplier": True},
+    {"id": 3, "name": "Chemicals & Dyes", "duration_hours": (4, 8), "co2_per_kg": 2.5, "scope": 1},
+    {"id": 4, "name": "Finishing", "duration_hours": (8, 16), "co2_per_kg": 1.5, "scope": 1},
+    {"id": 5, "name": "Garment", "duration_hours": (16, 32), "co2_per_kg": 0.5, "scope": 1},
+    {"id": 6, "name": "Packaging", "duration_hours": (2, 4), "co2_per_kg": 0.3, "scope": 1},
+    {"id": 7, "name": "Order Delivery", "duration_hours": (48, 120), "co2_per_kg": 0.4, "scope": 3},
+    {"id": 8, "name": "Employee Transport", "duration_hours": (1, 2), "co2_per_kg": 0.2, "scope": 3},
 ]
 
 # Fabric types
@@ -40,11 +54,11 @@ GARMENT_TYPES = [
 
 # Suppliers
 SUPPLIERS = [
-    {"id": "SUP-001", "name": "Anadolu Tekstil", "country": "Turkey", "sustainability_score": 8.5},
-    {"id": "SUP-002", "name": "Global Fibers Ltd", "country": "India", "sustainability_score": 7.2},
-    {"id": "SUP-003", "name": "EcoThread Co", "country": "Bangladesh", "sustainability_score": 9.1},
-    {"id": "SUP-004", "name": "Premium Fabrics", "country": "Italy", "sustainability_score": 8.9},
-    {"id": "SUP-005", "name": "Green Textiles", "country": "Portugal", "sustainability_score": 9.3},
+    {"id": "SUP-001", "name": "Anadolu Tekstil", "country": "Turkey", "sustainability_score": 8.5, "grid_region": "TR"},
+    {"id": "SUP-002", "name": "Global Fibers Ltd", "country": "India", "sustainability_score": 7.2, "grid_region": "IN"},
+    {"id": "SUP-003", "name": "EcoThread Co", "country": "Bangladesh", "sustainability_score": 9.1, "grid_region": "BD"},
+    {"id": "SUP-004", "name": "Premium Fabrics", "country": "Italy", "sustainability_score": 8.9, "grid_region": "IT"},
+    {"id": "SUP-005", "name": "Green Textiles", "country": "Portugal", "sustainability_score": 9.3, "grid_region": "PT"},
 ]
 
 # Customers
@@ -57,14 +71,37 @@ CUSTOMERS = [
     {"id": "CUST-006", "name": "LC Waikiki", "country": "Turkey", "tier": "B"},
 ]
 
-def generate_orders(num_orders: int = 150) -> List[Dict]:
-    """Generate production orders"""
-    orders = []
+# Orders in a default run
+NUM_ORDERS = 150
+
+# Passport text every garment carries
+DPP_RECYCLING_INFO = "100% recyclable. Return to authorized collection points."
+DPP_CARE_INSTRUCTIONS = "Machine wash cold. Tumble dry low. Do not bleach."
+
+def generate_orders(num_orders: int = NUM_ORDERS, grid: Optional[GridIntensity] = None,
+                    ids: Optional[RecordIds] = None) -> List[Dict]:
+    """Generate production orders, newest first"""
+    orders = list(iter_orders(num_orders, grid, ids))
+    orders.reverse()
+    return orders
+
+def iter_orders(num_orders: int = NUM_ORDERS, grid: Optional[GridIntensity] = None,
+                ids: Optional[RecordIds] = None) -> Iterator[Dict]:
+    """Yield production orders oldest first, from order dates drawn already sorted
+
+    ``energy_co2_kg`` prices the order's energy at the supplier region's mean
+    grid intensity between order date and estimated completion. It is for
+    reporting only: ``total_co2_kg`` is the stages' all-in CO2 and is not
+    increased by it.
+    """
+    ids = ids or LegacyIds()
     end_date = datetime.now()
+    if grid is None:
+        grid = GridIntensity.load()
     
-    for i in range(num_orders):
-        # Order date (last 90 days)
-        order_date = end_date - timedelta(days=random.randint(0, 90))
+    for i, offset in enumerate(sorted_uniforms(num_orders)):
+        # Order date (whole days, last 90 days)
+        order_date = end_date - timedelta(days=90 - int(offset * 91))
         
         fabric = random.choice(FABRIC_TYPES)
         garment_type = random.choice(GARMENT_TYPES)
@@ -96,9 +133,15 @@ def generate_orders(num_orders: int = 150) -> List[Dict]:
         # Calculate water usage
         water_usage = fabric["water_liters_per_kg"] * total_kg
         
+        # Energy and its grid CO2 over the production window
+        energy_kwh = total_kg * random.uniform(15, 25)
+        order_epoch = to_epoch(order_date)
+        completion_epoch = order_epoch + hours(total_duration_hours)
+        energy_co2 = energy_kwh * grid.mean(supplier["grid_region"], order_epoch, completion_epoch)
+        
         order = {
-            "order_id": f"ORD-{order_date.strftime('%Y%m')}-{i:04d}",
-            "order_date": order_date.isoformat(),
+            "order_id": ids.new("ORD", order_epoch, i),
+            "order_date": order_epoch,
             "customer_id": customer["id"],
             "customer_name": customer["name"],
             "garment_type": garment_type,
@@ -111,25 +154,23 @@ def generate_orders(num_orders: int = 150) -> List[Dict]:
             "current_stage": current_stage,
             "current_stage_name": STAGES[current_stage - 1]["name"],
             "progress_percentage": round((current_stage / len(STAGES)) * 100, 1),
-            "estimated_completion": (order_date + timedelta(hours=total_duration_hours)).isoformat(),
+            "estimated_completion": completion_epoch,
             "total_co2_kg": round(total_co2, 2),
             "water_usage_liters": round(water_usage, 2),
-            "energy_usage_kwh": round(total_kg * random.uniform(15, 25), 2),
+            "energy_usage_kwh": round(energy_kwh, 2),
+            "energy_co2_kg": round(energy_co2, 2),
             "total_cost_usd": round(total_kg * fabric["price_per_kg"] * random.uniform(1.5, 2.5), 2),
             "quality_score": round(random.uniform(85, 99), 1),
             "sustainability_score": round(random.uniform(70, 95), 1),
         }
-        orders.append(order)
-    
-    return sorted(orders, key=lambda x: x["order_date"], reverse=True)
+        yield order
 
 def generate_stage_tracking(orders: List[Dict]) -> List[Dict]:
     """Generate detailed stage tracking for each order"""
     tracking_records = []
     
     for order in orders:
-        order_start = datetime.fromisoformat(order["order_date"])
-        current_time = order_start
+        current_time = order["order_date"]
         
         # Generate records for each completed stage
         for stage_num in range(1, order["current_stage"] + 1):
@@ -137,7 +178,7 @@ def generate_stage_tracking(orders: List[Dict]) -> List[Dict]:
             
             duration_hours = random.uniform(*stage["duration_hours"])
             stage_start = current_time
-            stage_end = stage_start + timedelta(hours=duration_hours)
+            stage_end = stage_start + hours(duration_hours)
             
             stage_co2 = stage["co2_per_kg"] * order["weight_kg"]
             
@@ -155,8 +196,8 @@ def generate_stage_tracking(orders: List[Dict]) -> List[Dict]:
                 "stage_id": stage["id"],
                 "stage_name": stage["name"],
                 "stage_status": stage_status,
-                "start_time": stage_start.isoformat(),
-                "end_time": stage_end.isoformat() if stage_status == "completed" else None,
+                "start_time": stage_start,
+                "end_time": stage_end if stage_status == "completed" else None,
                 "duration_hours": round(duration_hours, 1),
                 "co2_emissions_kg": round(stage_co2, 2),
                 "energy_kwh": round(order["weight_kg"] * random.uniform(2, 4), 2),
@@ -177,12 +218,24 @@ def generate_stage_tracking(orders: List[Dict]) -> List[Dict]:
     
     return tracking_records
 
-def generate_dpp_records(orders: List[Dict]) -> List[Dict]:
+def attach_uncertainty(orders: List[Dict], workers: Optional[int] = None) -> Dict[str, Dict]:
+    """Add a Monte Carlo p5/p50/p95 "uncertainty" column to every order
+
+    Returns the raw percentiles by order_id for generate_dpp_records.
+    """
+    simulated = simulate_orders(orders, STAGES, FABRIC_TYPES, workers=workers)
+    for order in orders:
+        order["uncertainty"] = json.dumps(interval_summary(simulated[order["order_id"]]))
+    return simulated
+
+def generate_dpp_records(orders: List[Dict], uncertainty: Optional[Dict[str, Dict]] = None) -> List[Dict]:
     """Generate Digital Product Passport records"""
     dpp_records = []
     
     for order in orders:
         if order["status"] == "completed":
+            percentiles = (uncertainty or {}).get(order["order_id"])
+            per_garment = json.dumps(interval_summary(percentiles, order["quantity"], 3)) if percentiles else None
             # Create DPP for completed orders
             for unit_num in range(min(5, order["quantity"])):  # Sample 5 units per order
                 dpp = {
@@ -195,6 +248,7 @@ def generate_dpp_records(orders: List[Dict]) -> List[Dict]:
                     "total_co2_kg": round(order["total_co2_kg"] / order["quantity"], 3),
                     "water_liters": round(order["water_usage_liters"] / order["quantity"], 2),
                     "energy_kwh": round(order["energy_usage_kwh"] / order["quantity"], 2),
+                    "uncertainty": per_garment,
                     "materials": json.dumps([
                         {"type": order["fabric_type"], "weight_kg": round(order["weight_kg"] / order["quantity"], 3)},
                         {"type": "Thread", "weight_kg": 0.05},
@@ -208,8 +262,8 @@ def generate_dpp_records(orders: List[Dict]) -> List[Dict]:
                         "supplier_name": order["supplier_name"],
                         "origin": random.choice(["Turkey", "India", "Bangladesh", "Portugal"])
                     }),
-                    "recycling_info": "100% recyclable. Return to authorized collection points.",
-                    "care_instructions": "Machine wash cold. Tumble dry low. Do not bleach.",
+                    "recycling_info": DPP_RECYCLING_INFO,
+                    "care_instructions": DPP_CARE_INSTRUCTIONS,
                     "qr_code": f"QR-{order['order_id']}-{unit_num:04d}",
                     "blockchain_hash": f"0x{random.randbytes(32).hex()}",
                 }
@@ -230,8 +284,8 @@ def generate_quality_checks(orders: List[Dict]) -> List[Dict]:
                 stage = STAGES[stage_id - 1]
                 
                 # Inspection date
-                check_date = datetime.fromisoformat(order["order_date"]) + timedelta(
-                    hours=sum(random.uniform(*STAGES[i]["duration_hours"]) for i in range(stage_id))
+                check_date = order["order_date"] + hours(
+                    sum(random.uniform(*STAGES[i]["duration_hours"]) for i in range(stage_id))
                 )
                 
                 passed = random.random() < 0.92  # 92% pass rate
@@ -241,7 +295,7 @@ def generate_quality_checks(orders: List[Dict]) -> List[Dict]:
                     "order_id": order["order_id"],
                     "stage_id": stage_id,
                     "stage_name": stage["name"],
-                    "check_date": check_date.isoformat(),
+                    "check_date": check_date,
                     "inspector": random.choice(["Inspector-1", "Inspector-2", "Inspector-3"]),
                     "result": "pass" if passed else "fail",
                     "defects_found": 0 if passed else random.randint(1, 5),
@@ -261,72 +315,114 @@ def generate_quality_checks(orders: List[Dict]) -> List[Dict]:
     
     return quality_records
 
+def tables(ids: Optional[RecordIds] = None, profiler: Optional[GeneratorProfiler] = None,
+           uncertainty_workers: Optional[int] = None) -> Iterator[Chunk]:
+    """Zero@Production tables as (table, rows) chunks, orders oldest first
+
+    Orders go out once their uncertainty column is attached, which needs
+    them all. A profiler stage stays open while its chunks are yielded, so
+    it includes the consumer's time.
+    """
+    profiler = profiler or GeneratorProfiler("production")
+    with profiler.stage("iter_orders"):
+        orders = list(iter_orders(NUM_ORDERS, ids=ids))
+    # Monte Carlo confidence intervals for the CO2, water and energy figures
+    with profiler.stage("simulate_uncertainty"):
+        uncertainty = attach_uncertainty(orders, uncertainty_workers)
+    yield from chunked("production_orders", orders)
+    with profiler.stage("generate_stage_tracking"):
+        yield from chunked("production_stage_tracking", generate_stage_tracking(orders))
+    with profiler.stage("generate_dpp_records"):
+        yield from chunked("production_dpp", generate_dpp_records(orders, uncertainty))
+    with profiler.stage("generate_quality_checks"):
+        yield from chunked("production_quality_checks", generate_quality_checks(orders))
+
+def arg_parser() -> argparse.ArgumentParser:
+    """Command line options"""
+    parser = argparse.ArgumentParser(description="Generate Zero@Production (Textile DPP) demo data")
+    add_profiling_args(parser)
+    add_timestamp_args(parser)
+    add_partition_args(parser)
+    add_id_args(parser)
+    add_seed_args(parser)
+    parser.add_argument("--uncertainty-workers", type=int,
+                        help="Processes for the Monte Carlo DPP intervals (default: all CPUs for large runs)")
+    return parser
+
 def main():
     """Generate all textile production data"""
-    print("👕 Generating Zero@Production (Textile DPP) Demo Data...")
-    
-    # Generate orders
-    print("\n📦 Generating production orders...")
-    orders = generate_orders(150)
-    print(f"   ✅ Generated {len(orders)} orders")
+    args = arg_parser().parse_args()
+    apply_seed(args)
+    profiler = GeneratorProfiler.from_args("production", args)
+    formatter = TimestampFormatter(args.timestamp_format)
     
-    # Generate stage tracking
-    print("\n🔄 Generating stage tracking records...")
-    tracking = generate_stage_tracking(orders)
-    print(f"   ✅ Generated {len(tracking)} tracking records")
-    
-    # Generate DPP records
-    print("\n📋 Generating Digital Product Passports...")
-    dpp_records = generate_dpp_records(orders)
-    print(f"   ✅ Generated {len(dpp_records)} DPP records")
+    print("👕 Generating Zero@Production (Textile DPP) Demo Data...")
     
-    # Generate quality checks
-    print("\n✓ Generating quality inspection records...")
-    quality_checks = generate_quality_checks(orders)
-    print(f"   ✅ Generated {len(quality_checks)} quality checks")
+    # Orders with their p5/p50/p95 intervals, stage tracking, passports and inspections
+    data = collect(tables(ids_from_args(args), profiler, args.uncertainty_workers))
+    orders = data["production_orders"][::-1]  # The file lists orders newest first
+    print(f"\n📦 Generated {len(orders)} orders, p5/p50/p95 from {DRAWS:,} draws per order")
+    tracking = data.get("production_stage_tracking", [])
+    print(f"🔄 Generated {len(tracking)} tracking records")
+    dpp_records = data.get("production_dpp", [])
+    print(f"📋 Generated {len(dpp_records)} DPP records")
+    quality_checks = data.get("production_quality_checks", [])
+    print(f"✓ Generated {len(quality_checks)} quality checks")
     
     # Save to JSON files
     print("\n💾 Saving to JSON files...")
     
-    with open('production_orders.json', 'w') as f:
-        json.dump(orders, f, indent=2)
+    with profiler.stage("json.dump production_orders.json"), open('production_orders.json', 'w') as f:
+        json.dump(formatter.format_records(orders, ["order_date", "estimated_completion"]), f, indent=2)
     print("   ✅ production_orders.json")
     
-    with open('production_stage_tracking.json', 'w') as f:
-        json.dump(tracking, f, indent=2)
+    with profiler.stage("json.dump production_stage_tracking.json"), open('production_stage_tracking.json', 'w') as f:
+        json.dump(formatter.format_records(tracking, ["start_time", "end_time"]), f, indent=2)
     print("   ✅ production_stage_tracking.json")
     
-    with open('production_dpp.json', 'w') as f:
-        json.dump(dpp_records, f, indent=2)
+    with profiler.stage("json.dump production_dpp.json"), open('production_dpp.json', 'w') as f:
+        json.dump(formatter.format_records(dpp_records, ["manufacturing_date", "completion_date"]), f, indent=2)
     print("   ✅ production_dpp.json")
     
-    with open('production_quality.json', 'w') as f:
-        json.dump(quality_checks, f, indent=2)
+    with profiler.stage("json.dump production_quality.json"), open('production_quality.json', 'w') as f:
+        json.dump(formatter.format_records(quality_checks, ["check_date"]), f, indent=2)
     print("   ✅ production_quality.json")
     
+    if args.partitioned:
+        with profiler.stage("write partitions"):
+            for table, records in [
+                ("production_orders", orders),
+                ("production_stage_tracking", tracking),
+                ("production_dpp", dpp_records),
+                ("production_quality_checks", quality_checks),
+            ]:
+                write_partitions(".", table, records)
+        print("   ✅ partitioned layout + manifest.json")
+    
     # Generate summary
-    completed_orders = [o for o in orders if o["status"] == "completed"]
-    in_progress = [o for o in orders if o["status"] == "in_progress"]
+    with profiler.stage("summary"):
+        completed_orders = [o for o in orders if o["status"] == "completed"]
+        in_progress = [o for o in orders if o["status"] == "in_progress"]
     
-    total_co2 = sum(o["total_co2_kg"] for o in completed_orders)
-    total_water = sum(o["water_usage_liters"] for o in completed_orders)
-    total_quantity = sum(o["quantity"] for o in completed_orders)
+        total_co2 = sum(o["total_co2_kg"] for o in completed_orders)
+        total_water = sum(o["water_usage_liters"] for o in completed_orders)
+        total_quantity = sum(o["quantity"] for o in completed_orders)
     
-    summary = {
-        "total_orders": len(orders),
-        "completed_orders": len(completed_orders),
-        "in_progress_orders": len(in_progress),
-        "total_garments_produced": total_quantity,
-        "total_co2_emissions_kg": round(total_co2, 2),
-        "total_water_usage_liters": round(total_water, 2),
-        "avg_co2_per_garment": round(total_co2 / total_quantity, 3) if total_quantity > 0 else 0,
-        "avg_water_per_garment": round(total_water / total_quantity, 2) if total_quantity > 0 else 0,
-        "dpp_records_issued": len(dpp_records),
-        "quality_pass_rate": round(len([q for q in quality_checks if q["result"] == "pass"]) / len(quality_checks) * 100, 1)
-    }
+        summary = {
+            "total_orders": len(orders),
+            "completed_orders": len(completed_orders),
+            "in_progress_orders": len(in_progress),
+            "total_garments_produced": total_quantity,
+            "total_co2_emissions_kg": round(total_co2, 2),
+            "total_water_usage_liters": round(total_water, 2),
+            "avg_co2_per_garment": round(total_co2 / total_quantity, 3) if total_quantity > 0 else 0,
+            "avg_water_per_garment": round(total_water / total_quantity, 2) if total_quantity > 0 else 0,
+            "dpp_records_issued": len(dpp_records),
+            "quality_pass_rate": round(len([q for q in quality_checks if q["result"] == "pass"]) / len(quality_checks) * 100, 1)
+        }
     
-    with open('production_summary.json', 'w') as f:
-        json.dump(summary, f, indent=2)
+        with open('production_summary.json', 'w') as f:
+            json.dump(summary, f, indent=2)
     print("   ✅ production_summary.json")
     
     print("\n" + "="*60)
@@ -335,6 +431,7 @@ def main():
     for key, value in summary.items():
         print(f"{key:.<40} {value}")
     print("="*60)
+    profiler.finish()
     print("\n✅ All Zero@Production demo data generated successfully!")
     print("📁 Files ready for Supabase import\n")
 
@@ -3,10 +3,26 @@ Zero@Steel Dummy Data Generator
 Generates realistic steel production data for demo
 """
 
+import argparse
+import heapq
 import random
 import json
 from datetime import datetime, timedelta
-from typing import List, Dict
+from operator import itemgetter
+from typing import Iterator, List, Dict, Optional, Tuple
+
+import numpy as np
+
+from build_cache import add_seed_args, apply_seed
+from grid_intensity import REFERENCE_INTENSITY, GridIntensity
+from partitioned_output import add_partition_args, write_partitions
+from profiling import GeneratorProfiler, add_profiling_args
+from record_ids import LegacyIds, RecordIds, add_id_args, ids_from_args
+from steel_scheduler import FurnaceTimeline, MetricsIndex, schedule_batch
+from steel_status_timeline import StatusTimeline, build_fleet_timelines
+from table_chunks import Chunk, chunked, collect
+from time_order import release_sorted, sorted_uniforms
+from timestamps import TimestampFormatter, add_timestamp_args, from_epoch, now_epoch, to_epoch
 
 # Furnace configurations
 FURNACES = [
@@ -15,6 +31,31 @@ FURNACES = [
     {"id": "FNC-003", "name": "Electric Arc Gamma", "capacity": 150, "type": "electric"},
     {"id": "FNC-004", "name": "Electric Arc Delta", "capacity": 150, "type": "electric"},
 ]
+FURNACES_BY_ID = {f["id"]: f for f in FURNACES}
+
+# Per-ton CO2 (tonnes CO2 per tonne of steel) and energy ranges by furnace route
+ROUTE_FACTORS = {
+    "blast": {"co2_per_ton": (1.8, 2.2), "energy_mwh_per_ton": (0.5, 0.7)},  # Blast furnace higher emissions
+    "electric": {"co2_per_ton": (0.4, 0.6), "energy_mwh_per_ton": (0.35, 0.45)},  # Electric arc lower emissions
+}
+
+# Share of arc-furnace CO2 that is not grid electricity (electrodes, lime, gas burners);
+# the rest scales with grid intensity at the hour of the reading
+EAF_DIRECT_SHARE = 0.2
+
+KG_PER_TONNE = 1000
+
+# Grid profile (grid_profiles/<region>.csv) the furnaces draw power from
+SITE_REGION = "TR"
+
+# Share of the daily load a furnace runs at in each status
+STATUS_LOAD_FACTORS = {"operational": 1.0, "idle": 0.1, "maintenance": 0.0}
+
+# Default run: 30 days of 15-minute furnace readings, plus batches and alerts
+METRICS_DAYS = 30
+METRICS_INTERVAL_MINUTES = 15
+NUM_BATCHES = 100
+NUM_ALERTS = 50
 
 # Steel grades
 STEEL_GRADES = [
@@ -22,84 +63,130 @@ STEEL_GRADES = [
     "4140 Alloy", "1045 Carbon", "A514 High Strength"
 ]
 
-def generate_timestamp_series(days_back: int = 30, interval_minutes: int = 15) -> List[datetime]:
-    """Generate timestamp series for the last N days"""
-    end = datetime.now()
-    start = end - timedelta(days=days_back)
-    timestamps = []
-    current = start
-    while current <= end:
-        timestamps.append(current)
-        current += timedelta(minutes=interval_minutes)
-    return timestamps
-
-def generate_furnace_metrics(furnace: Dict, timestamp: datetime) -> Dict:
-    """Generate realistic furnace metrics"""
+def generate_timestamp_series(days_back: int = METRICS_DAYS,
+                              interval_minutes: int = METRICS_INTERVAL_MINUTES) -> List[int]:
+    """Generate epoch-second timestamp series for the last N days"""
+    end = now_epoch()
+    return list(range(end - days_back * 86400, end + 1, interval_minutes * 60))
+
+def daily_load_factor(hour):
+    """Load relative to capacity by hour of day, peaking at noon; also works on NumPy arrays"""
+    return 0.7 + 0.3 * (1 - abs(hour - 12) / 12)
+
+def generate_furnace_metrics(furnace: Dict, timestamp: int, status: str = "operational",
+                             grid_intensity: float = REFERENCE_INTENSITY) -> Dict:
+    """Generate realistic furnace metrics for the furnace's status at that time
+
+    ``grid_intensity`` (kg CO2/kWh at that hour) scales the electricity share
+    of arc-furnace CO2; blast furnaces ignore it.
+    """
     base_temp = 1600 if furnace["type"] == "blast" else 1800
     temp_variance = random.uniform(-50, 50)
     
     # Simulate daily patterns
-    hour = timestamp.hour
-    load_factor = 0.7 + 0.3 * (1 - abs(hour - 12) / 12)  # Peak at noon
+    hour = timestamp % 86400 // 3600
+    load_factor = daily_load_factor(hour)
     
     capacity = furnace["capacity"]
-    current_load = capacity * load_factor * random.uniform(0.85, 0.98)
-    
-    # CO2 emissions (kg/hour)
-    if furnace["type"] == "blast":
-        co2_per_ton = random.uniform(1.8, 2.2)  # Blast furnace higher emissions
-    else:
-        co2_per_ton = random.uniform(0.4, 0.6)  # Electric arc lower emissions
+    current_load = capacity * load_factor * random.uniform(0.85, 0.98) * STATUS_LOAD_FACTORS[status]
+    route = ROUTE_FACTORS[furnace["type"]]
     
+    # CO2 emissions, on the scale the dashboards show as kg/h: load times the
+    # per-ton factor, without the tonne-to-kg step batch totals take
+    co2_per_ton = random.uniform(*route["co2_per_ton"])
+    if furnace["type"] == "electric":
+        co2_per_ton *= EAF_DIRECT_SHARE + (1 - EAF_DIRECT_SHARE) * grid_intensity / REFERENCE_INTENSITY
     co2_emissions = current_load * co2_per_ton
     
     # Energy consumption (MWh)
-    if furnace["type"] == "blast":
-        energy_per_ton = random.uniform(0.5, 0.7)
-    else:
-        energy_per_ton = random.uniform(0.35, 0.45)
-    
+    energy_per_ton = random.uniform(*route["energy_mwh_per_ton"])
     energy = current_load * energy_per_ton
     
     return {
         "furnace_id": furnace["id"],
-        "timestamp": timestamp.isoformat(),
+        "timestamp": timestamp,
         "temperature": round(base_temp + temp_variance, 1),
         "current_load_tons": round(current_load, 2),
         "capacity_utilization": round((current_load / capacity) * 100, 1),
         "co2_emissions_kg": round(co2_emissions, 2),
         "energy_consumption_mwh": round(energy, 3),
         "power_mw": round(energy * random.uniform(0.9, 1.1), 2),
-        "status": random.choices(
-            ["operational", "maintenance", "idle"],
-            weights=[0.85, 0.10, 0.05]
-        )[0]
+        "status": status
     }
 
-def generate_production_batches(num_batches: int = 100) -> List[Dict]:
-    """Generate steel production batch records"""
-    batches = []
+def generate_production_batches(num_batches: int = NUM_BATCHES, metrics: Optional[List[Dict]] = None,
+                                status_timelines: Optional[Dict[str, StatusTimeline]] = None,
+                                ids: Optional[RecordIds] = None) -> List[Dict]:
+    """Generate steel production batch records on non-overlapping furnace slots, newest first"""
+    batches = list(iter_production_batches(num_batches, metrics, status_timelines, ids))
+    batches.reverse()
+    return batches
+
+def iter_production_batches(num_batches: int = NUM_BATCHES, metrics: Optional[List[Dict]] = None,
+                            status_timelines: Optional[Dict[str, StatusTimeline]] = None,
+                            ids: Optional[RecordIds] = None) -> Iterator[Dict]:
+    """Yield steel production batch records oldest first
+
+    When the furnace metric series is given, tonnage is the furnace's mean
+    load over the batch window and energy and CO2 are that tonnage times the
+    window's load-weighted per-ton factors; otherwise the factors are drawn
+    from the furnace's route, on the same per-ton scale. Maintenance
+    and idle runs from the status timelines are blocked out on each furnace.
+    Requested starts are drawn already in order and a batch never starts
+    before its request, so only batches pushed back by a busy furnace wait.
+    """
+    return release_sorted(_scheduled_batches(num_batches, metrics, status_timelines, ids or LegacyIds()),
+                          itemgetter("start_time"))
+
+def _scheduled_batches(num_batches: int, metrics: Optional[List[Dict]],
+                       status_timelines: Optional[Dict[str, StatusTimeline]],
+                       ids: RecordIds) -> Iterator[Tuple[int, Dict]]:
+    """(requested start, batch) in order of requested start"""
     end_date = datetime.now()
+    window_start = end_date - timedelta(days=30)
+    timelines = {f["id"]: FurnaceTimeline(f["id"]) for f in FURNACES}
+    for furnace_id, status_timeline in (status_timelines or {}).items():
+        for run_start, run_end, state in status_timeline.runs():
+            if state != "operational":
+                timelines[furnace_id].book(run_start, run_end)
+    metrics_index = MetricsIndex(metrics) if metrics else None
+    
+    # Lay batches onto furnace timelines in order of requested start
+    requested_starts = (window_start + timedelta(seconds=offset * 30 * 86400)
+                        for offset in sorted_uniforms(num_batches))
     
-    for i in range(num_batches):
-        start_time = end_date - timedelta(days=random.randint(0, 30))
+    for i, requested_start in enumerate(requested_starts):
         duration_hours = random.uniform(4, 12)
+        slot = schedule_batch(timelines, random.choice(FURNACES)["id"], requested_start,
+                              timedelta(hours=duration_hours), end_date)
+        if slot is None:
+            continue
+        furnace_id, start_time = slot
         end_time = start_time + timedelta(hours=duration_hours)
+        furnace = FURNACES_BY_ID[furnace_id]
         
-        furnace = random.choice(FURNACES)
-        tonnage = random.uniform(50, furnace["capacity"] * 0.4)
+        window = metrics_index.window(furnace_id, start_time, end_time) if metrics_index else None
+        if window and window["avg_load_tons"]:
+            tonnage = window["avg_load_tons"]
+            energy_used = tonnage * window["energy_mwh_per_ton"]
+            co2_emitted = tonnage * window["co2_per_ton"] * KG_PER_TONNE
+        else:
+            route = ROUTE_FACTORS[furnace["type"]]
+            tonnage = random.uniform(50, furnace["capacity"] * 0.4)
+            energy_used = tonnage * random.uniform(*route["energy_mwh_per_ton"])
+            co2_emitted = tonnage * random.uniform(*route["co2_per_ton"]) * KG_PER_TONNE
         
         batch = {
-            "batch_id": f"BATCH-{start_time.strftime('%Y%m%d')}-{i:03d}",
-            "furnace_id": furnace["id"],
+            "batch_id": ids.new("BATCH", to_epoch(start_time), i),
+            "furnace_id": furnace_id,
             "steel_grade": random.choice(STEEL_GRADES),
-            "start_time": start_time.isoformat(),
-            "end_time": end_time.isoformat(),
+            "start_time": to_epoch(start_time),
+            "end_time": to_epoch(end_time),
             "tonnage": round(tonnage, 2),
             "target_tonnage": round(tonnage * random.uniform(0.95, 1.05), 2),
             "yield_percentage": round(random.uniform(94, 98), 2),
-            "energy_used_mwh": round(tonnage * random.uniform(0.4, 0.7), 2),
-            "co2_emitted_kg": round(tonnage * random.uniform(400, 2200), 2),
+            "energy_used_mwh": round(energy_used, 2),
+            "co2_emitted_kg": round(co2_emitted, 2),
             "quality_grade": random.choices(
                 ["A", "B", "C"],
                 weights=[0.7, 0.25, 0.05]
@@ -112,12 +199,25 @@ def generate_production_batches(num_batches: int = 100) -> List[Dict]:
                 ""
             ])
         }
-        batches.append(batch)
-    
-    return sorted(batches, key=lambda x: x["start_time"], reverse=True)
+        yield to_epoch(requested_start), batch
+
+def generate_alerts(num_alerts: int = NUM_ALERTS,
+                    status_timelines: Optional[Dict[str, StatusTimeline]] = None,
+                    ids: Optional[RecordIds] = None) -> List[Dict]:
+    """Generate alert/alarm history, newest first"""
+    alerts = list(iter_alerts(num_alerts, status_timelines, ids))
+    alerts.reverse()
+    return alerts
+
+def iter_alerts(num_alerts: int = NUM_ALERTS,
+                status_timelines: Optional[Dict[str, StatusTimeline]] = None,
+                ids: Optional[RecordIds] = None) -> Iterator[Dict]:
+    """Yield alert/alarm history oldest first
 
-def generate_alerts(num_alerts: int = 50) -> List[Dict]:
-    """Generate alert/alarm history"""
+    ``maintenance_due`` alerts are raised ahead of the maintenance runs in the
+    status timelines; the other alert types are drawn at random. Both come
+    out in time order and are merged rather than sorted.
+    """
     alert_types = [
         {"type": "temperature_high", "severity": "warning", "message": "Temperature exceeded threshold"},
         {"type": "temperature_critical", "severity": "critical", "message": "Critical temperature - immediate action required"},
@@ -126,35 +226,64 @@ def generate_alerts(num_alerts: int = 50) -> List[Dict]:
         {"type": "maintenance_due", "severity": "info", "message": "Scheduled maintenance approaching"},
         {"type": "capacity_low", "severity": "warning", "message": "Operating below optimal capacity"},
     ]
+    maintenance_due = next(a for a in alert_types if a["type"] == "maintenance_due")
+    if status_timelines:
+        alert_types = [a for a in alert_types if a is not maintenance_due]
     
-    alerts = []
+    ids = ids or LegacyIds()
     end_date = datetime.now()
+    window_start = end_date - timedelta(hours=720)  # Last 30 days
     
-    for i in range(num_alerts):
-        alert_time = end_date - timedelta(hours=random.randint(0, 720))  # Last 30 days
-        alert_info = random.choice(alert_types)
-        furnace = random.choice(FURNACES)
-        
+    def make_alert(i: int, alert_time: datetime, alert_info: Dict, furnace: Dict) -> Dict:
         # Some alerts get resolved
         is_resolved = random.random() < 0.7
         
-        alert = {
-            "alert_id": f"ALERT-{alert_time.strftime('%Y%m%d%H%M')}-{i:03d}",
+        return {
+            "alert_id": ids.new("ALERT", to_epoch(alert_time), i),
             "furnace_id": furnace["id"],
             "alert_type": alert_info["type"],
             "severity": alert_info["severity"],
             "message": f"{furnace['name']}: {alert_info['message']}",
-            "timestamp": alert_time.isoformat(),
+            "timestamp": to_epoch(alert_time),
             "resolved": is_resolved,
-            "resolved_at": (alert_time + timedelta(hours=random.uniform(0.5, 4))).isoformat() if is_resolved else None,
+            "resolved_at": to_epoch(alert_time + timedelta(hours=random.uniform(0.5, 4))) if is_resolved else None,
             "resolved_by": random.choice(["operator_1", "operator_2", "system_auto"]) if is_resolved else None
         }
-        alerts.append(alert)
     
-    return sorted(alerts, key=lambda x: x["timestamp"], reverse=True)
+    def random_alerts() -> Iterator[Tuple[datetime, Dict, Dict]]:
+        for offset in sorted_uniforms(num_alerts):
+            alert_time = window_start + timedelta(hours=int(offset * 721))  # Whole hours, 0-720 back
+            yield alert_time, random.choice(alert_types), random.choice(FURNACES)
+    
+    def maintenance_warnings(furnace_id: str, timeline: StatusTimeline) -> Iterator[Tuple[datetime, Tuple]]:
+        # Warn 12-48h ahead of every maintenance run that starts in the alert window.
+        # Later runs start after this one, so no later warning comes before its start - 48h
+        run = timeline.next_run(window_start, "maintenance")
+        while run:
+            alert_time = run[0] - timedelta(hours=random.uniform(12, 48))
+            if alert_time > end_date:
+                break
+            if alert_time >= window_start:
+                yield run[0] - timedelta(hours=48), (alert_time, maintenance_due, FURNACES_BY_ID[furnace_id])
+            run = timeline.next_run(run[0], "maintenance")
+    
+    sources = [random_alerts()]
+    if status_timelines:
+        sources.extend(release_sorted(maintenance_warnings(furnace_id, timeline), itemgetter(0))
+                       for furnace_id, timeline in status_timelines.items())
+    for i, (alert_time, alert_info, furnace) in enumerate(heapq.merge(*sources, key=itemgetter(0))):
+        yield make_alert(i, alert_time, alert_info, furnace)
 
-def generate_maintenance_records(num_records: int = 30) -> List[Dict]:
-    """Generate maintenance history"""
+def generate_maintenance_records(status_timelines: Dict[str, StatusTimeline], days_back: int = 180,
+                                 ids: Optional[RecordIds] = None) -> List[Dict]:
+    """Generate maintenance history from the maintenance runs in the status timelines, newest first"""
+    records = list(iter_maintenance_records(status_timelines, days_back, ids))
+    records.reverse()
+    return records
+
+def iter_maintenance_records(status_timelines: Dict[str, StatusTimeline], days_back: int = 180,
+                             ids: Optional[RecordIds] = None) -> Iterator[Dict]:
+    """Yield maintenance history oldest first, merging the furnaces' runs"""
     maintenance_types = [
         "Routine Inspection",
         "Refractory Repair",
@@ -164,19 +293,29 @@ def generate_maintenance_records(num_records: int = 30) -> List[Dict]:
         "Safety System Test"
     ]
     
-    records = []
+    ids = ids or LegacyIds()
     end_date = datetime.now()
+    window_start = end_date - timedelta(days=days_back)
+    
+    def completed_runs(furnace_id: str, timeline: StatusTimeline) -> Iterator[Tuple]:
+        for maint_date, completed_date, _ in timeline.runs("maintenance"):
+            # Only completed maintenance belongs in the history
+            if maint_date < window_start or completed_date > end_date:
+                continue
+            yield maint_date, completed_date, furnace_id, timeline
     
-    for i in range(num_records):
-        maint_date = end_date - timedelta(days=random.randint(0, 180))
-        duration_hours = random.uniform(2, 24)
+    runs = heapq.merge(*(completed_runs(furnace_id, timeline) for furnace_id, timeline in status_timelines.items()),
+                       key=itemgetter(0))
+    for i, (maint_date, completed_date, furnace_id, timeline) in enumerate(runs):
+        duration_hours = (completed_date - maint_date).total_seconds() / 3600
+        next_run = timeline.next_run(maint_date, "maintenance")
         
-        record = {
-            "maintenance_id": f"MAINT-{maint_date.strftime('%Y%m%d')}-{i:03d}",
-            "furnace_id": random.choice(FURNACES)["id"],
+        yield {
+            "maintenance_id": ids.new("MAINT", to_epoch(maint_date), i),
+            "furnace_id": furnace_id,
             "maintenance_type": random.choice(maintenance_types),
-            "scheduled_date": maint_date.isoformat(),
-            "completed_date": (maint_date + timedelta(hours=duration_hours)).isoformat(),
+            "scheduled_date": to_epoch(maint_date),
+            "completed_date": to_epoch(completed_date),
             "duration_hours": round(duration_hours, 1),
             "cost_usd": round(random.uniform(5000, 50000), 2),
             "technician": random.choice(["Tech-A", "Tech-B", "Tech-C", "External Contractor"]),
@@ -187,81 +326,127 @@ def generate_maintenance_records(num_records: int = 30) -> List[Dict]:
                 "Preventive maintenance completed",
                 "Emergency repair successful"
             ]),
-            "next_maintenance_due": (maint_date + timedelta(days=random.randint(30, 90))).isoformat()
+            "next_maintenance_due": to_epoch(next_run[0]) if next_run else None
         }
-        records.append(record)
-    
-    return sorted(records, key=lambda x: x["scheduled_date"], reverse=True)
+
+def tables(ids: Optional[RecordIds] = None, profiler: Optional[GeneratorProfiler] = None) -> Iterator[Chunk]:
+    """Zero@Steel tables as (table, rows) chunks, each table oldest first
+
+    Metrics go out one furnace at a time, the other tables in CHUNK_ROWS
+    chunks as they are generated. A profiler stage stays open while its
+    chunks are yielded, so it includes the consumer's time.
+    """
+    ids = ids or LegacyIds()
+    profiler = profiler or GeneratorProfiler("steel")
+
+    # One status timeline per furnace drives metrics, batches, alerts and maintenance
+    with profiler.stage("build_fleet_timelines"):
+        status_timelines = build_fleet_timelines(FURNACES)
+    with profiler.stage("generate_timestamp_series"):
+        timestamps = generate_timestamp_series()
+    with profiler.stage("grid intensity lookup"):
+        intensities = GridIntensity.load().at(SITE_REGION, np.array(timestamps)).tolist()
+
+    all_metrics = []
+    with profiler.stage("generate_furnace_metrics loop"):
+        for furnace in FURNACES:
+            status_timeline = status_timelines[furnace["id"]]
+            metrics = [generate_furnace_metrics(furnace, ts, status_timeline.state_at_epoch(ts), intensity)
+                       for ts, intensity in zip(timestamps, intensities)]
+            all_metrics.extend(metrics)
+            yield "steel_furnace_metrics", metrics
+
+    with profiler.stage("iter_production_batches"):
+        yield from chunked("steel_production_batches",
+                           iter_production_batches(NUM_BATCHES, all_metrics, status_timelines, ids))
+    with profiler.stage("iter_alerts"):
+        yield from chunked("steel_alerts", iter_alerts(NUM_ALERTS, status_timelines, ids))
+    with profiler.stage("iter_maintenance_records"):
+        yield from chunked("steel_maintenance_records", iter_maintenance_records(status_timelines, ids=ids))
+
+def arg_parser() -> argparse.ArgumentParser:
+    """Command line options"""
+    parser = argparse.ArgumentParser(description="Generate Zero@Steel demo data")
+    add_profiling_args(parser)
+    add_timestamp_args(parser)
+    add_partition_args(parser)
+    add_id_args(parser)
+    add_seed_args(parser)
+    return parser
 
 def main():
     """Generate all steel data"""
-    print("🏭 Generating Zero@Steel Demo Data...")
-    
-    # Generate time series data (last 30 days, 15-minute intervals)
-    print("\n📊 Generating furnace metrics time series...")
-    timestamps = generate_timestamp_series(days_back=30, interval_minutes=15)
+    args = arg_parser().parse_args()
+    apply_seed(args)
+    profiler = GeneratorProfiler.from_args("steel", args)
+    formatter = TimestampFormatter(args.timestamp_format)
+    ids = ids_from_args(args)
     
-    all_metrics = []
-    for furnace in FURNACES:
-        print(f"   - {furnace['name']}")
-        for ts in timestamps:
-            metrics = generate_furnace_metrics(furnace, ts)
-            all_metrics.append(metrics)
-    
-    print(f"   ✅ Generated {len(all_metrics):,} metric records")
-    
-    # Generate production batches
-    print("\n🔥 Generating production batches...")
-    batches = generate_production_batches(100)
-    print(f"   ✅ Generated {len(batches)} batches")
+    print("🏭 Generating Zero@Steel Demo Data...")
     
-    # Generate alerts
-    print("\n⚠️  Generating alerts...")
-    alerts = generate_alerts(50)
-    print(f"   ✅ Generated {len(alerts)} alerts")
+    # Furnace metrics (last 30 days, 15-minute intervals), batches, alerts and maintenance
+    data = collect(tables(ids, profiler))
+    all_metrics = data["steel_furnace_metrics"]
+    first_reading, last_reading = all_metrics[0]["timestamp"], all_metrics[-1]["timestamp"]
+    print(f"\n📊 Generated {len(all_metrics):,} furnace metric records")
     
-    # Generate maintenance records
-    print("\n🔧 Generating maintenance records...")
-    maintenance = generate_maintenance_records(30)
-    print(f"   ✅ Generated {len(maintenance)} maintenance records")
+    # The files list batches, alerts and maintenance newest first
+    batches = data.get("steel_production_batches", [])[::-1]
+    print(f"🔥 Generated {len(batches)} production batches")
+    alerts = data.get("steel_alerts", [])[::-1]
+    print(f"⚠️  Generated {len(alerts)} alerts")
+    maintenance = data.get("steel_maintenance_records", [])[::-1]
+    print(f"🔧 Generated {len(maintenance)} maintenance records")
     
     # Save to JSON files
     print("\n💾 Saving to JSON files...")
     
-    with open('steel_furnace_metrics.json', 'w') as f:
-        json.dump(all_metrics, f, indent=2)
+    with profiler.stage("json.dump steel_furnace_metrics.json"), open('steel_furnace_metrics.json', 'w') as f:
+        json.dump(formatter.format_records(all_metrics, ["timestamp"]), f, indent=2)
     print("   ✅ steel_furnace_metrics.json")
     
-    with open('steel_production_batches.json', 'w') as f:
-        json.dump(batches, f, indent=2)
+    with profiler.stage("json.dump steel_production_batches.json"), open('steel_production_batches.json', 'w') as f:
+        json.dump(formatter.format_records(batches, ["start_time", "end_time"]), f, indent=2)
     print("   ✅ steel_production_batches.json")
     
-    with open('steel_alerts.json', 'w') as f:
-        json.dump(alerts, f, indent=2)
+    with profiler.stage("json.dump steel_alerts.json"), open('steel_alerts.json', 'w') as f:
+        json.dump(formatter.format_records(alerts, ["timestamp", "resolved_at"]), f, indent=2)
     print("   ✅ steel_alerts.json")
     
-    with open('steel_maintenance.json', 'w') as f:
-        json.dump(maintenance, f, indent=2)
+    with profiler.stage("json.dump steel_maintenance.json"), open('steel_maintenance.json', 'w') as f:
+        json.dump(formatter.format_records(maintenance, ["scheduled_date", "completed_date", "next_maintenance_due"]), f, indent=2)
     print("   ✅ steel_maintenance.json")
     
-    # Generate summary statistics
-    total_production = sum(b["tonnage"] for b in batches)
-    total_co2 = sum(b["co2_emitted_kg"] for b in batches)
-    total_energy = sum(b["energy_used_mwh"] for b in batches)
+    if args.partitioned:
+        with profiler.stage("write partitions"):
+            for table, records in [
+                ("steel_furnace_metrics", all_metrics),
+                ("steel_production_batches", batches),
+                ("steel_alerts", alerts),
+                ("steel_maintenance_records", maintenance),
+            ]:
+                write_partitions(".", table, records)
+        print("   ✅ partitioned layout + manifest.json")
     
-    summary = {
-        "total_batches": len(batches),
-        "total_production_tons": round(total_production, 2),
-        "total_co2_emissions_kg": round(total_co2, 2),
-        "total_energy_consumption_mwh": round(total_energy, 2),
-        "avg_co2_per_ton": round(total_co2 / total_production, 2),
-        "avg_energy_per_ton": round(total_energy / total_production, 3),
-        "active_furnaces": len(FURNACES),
-        "date_range": f"{timestamps[0].date()} to {timestamps[-1].date()}"
-    }
-    
-    with open('steel_summary.json', 'w') as f:
-        json.dump(summary, f, indent=2)
+    # Generate summary statistics
+    with profiler.stage("summary"):
+        total_production = sum(b["tonnage"] for b in batches)
+        total_co2 = sum(b["co2_emitted_kg"] for b in batches)
+        total_energy = sum(b["energy_used_mwh"] for b in batches)
+        
+        summary = {
+            "total_batches": len(batches),
+            "total_production_tons": round(total_production, 2),
+            "total_co2_emissions_kg": round(total_co2, 2),
+            "total_energy_consumption_mwh": round(total_energy, 2),
+            "avg_co2_per_ton": round(total_co2 / total_production, 2),
+            "avg_energy_per_ton": round(total_energy / total_production, 3),
+            "active_furnaces": len(FURNACES),
+            "date_range": f"{from_epoch(first_reading).date()} to {from_epoch(last_reading).date()}"
+        }
+        
+        with open('steel_summary.json', 'w') as f:
+            json.dump(summary, f, indent=2)
     print("   ✅ steel_summary.json")
     
     print("\n" + "="*60)
@@ -270,6 +455,7 @@ def main():
     for key, value in summary.items():
         print(f"{key:.<40} {value}")
     print("="*60)
+    profiler.finish()
     print("\n✅ All Zero@Steel demo data generated successfully!")
     print("📁 Files ready for Supabase import\n")
 
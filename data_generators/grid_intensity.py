@@ -0,0 +1,94 @@
+"""
+Grid Carbon Intensity
+Hourly kg CO2/kWh per region from typical-week CSV profiles, indexed directly by epoch hour
+"""
+
+import csv
+import os
+from typing import List, Dict, Union
+
+import numpy as np
+
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "grid_profiles")
+HOURS_PER_WEEK = 168
+
+# Profiles start on Monday 00:00; epoch hour 0 (1970-01-01) was a Thursday
+EPOCH_WEEKDAY = 3
+
+# Flat kg CO2/kWh the generators used before profiles existed; EAF per-ton
+# factors in generate_steel_data were calibrated against it
+REFERENCE_INTENSITY = 0.5
+
+Seconds = Union[int, np.ndarray]
+
+
+def read_profile(path: str) -> List[float]:
+    """One region's weekday,hour,kg_co2_per_kwh rows as 168 values from Monday 00:00"""
+    week: List[float] = [None] * HOURS_PER_WEEK
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            week[int(row["weekday"]) * 24 + int(row["hour"])] = float(row["kg_co2_per_kwh"])
+    if None in week:
+        raise ValueError(f"{path}: expected one row for every weekday and hour")
+    return week
+
+
+class GridIntensity:
+    """Hourly grid intensity per region, looked up by epoch-second timestamps
+
+    Each typical week is rotated so that ``epoch_hour % 168`` indexes it
+    directly, and a prefix sum over the week gives the mean intensity of any
+    window in constant time. Both lookups accept an int or a NumPy array of
+    timestamps; the scalar path stays on plain lists for per-row loops.
+    """
+
+    def __init__(self, profiles: Dict[str, List[float]]):
+        self._values: Dict[str, np.ndarray] = {}
+        self._cumulative: Dict[str, np.ndarray] = {}
+        self._value_lists: Dict[str, List[float]] = {}
+        self._cumulative_lists: Dict[str, List[float]] = {}
+        for region, week in profiles.items():
+            by_epoch_hour = np.roll(np.asarray(week, dtype=float), -EPOCH_WEEKDAY * 24)
+            cumulative = np.concatenate([[0.0], np.cumsum(by_epoch_hour)])
+            self._values[region] = by_epoch_hour
+            self._cumulative[region] = cumulative
+            self._value_lists[region] = by_epoch_hour.tolist()
+            self._cumulative_lists[region] = cumulative.tolist()
+
+    @classmethod
+    def load(cls, directory: str = PROFILE_DIR) -> "GridIntensity":
+        """Every <REGION>.csv in the profile directory"""
+        return cls({
+            os.path.splitext(name)[0]: read_profile(os.path.join(directory, name))
+            for name in sorted(os.listdir(directory)) if name.endswith(".csv")
+        })
+
+    @property
+    def regions(self) -> List[str]:
+        return sorted(self._values)
+
+    def at(self, region: str, seconds: Seconds) -> Union[float, np.ndarray]:
+        """kg CO2/kWh during the hour containing each timestamp"""
+        if isinstance(seconds, np.ndarray):
+            return self._values[region][seconds // 3600 % HOURS_PER_WEEK]
+        return self._value_lists[region][seconds // 3600 % HOURS_PER_WEEK]
+
+    def mean(self, region: str, start: Seconds, end: Seconds) -> Union[float, np.ndarray]:
+        """Mean kg CO2/kWh over [start, end), for energy drawn evenly across the window"""
+        if isinstance(start, np.ndarray) or isinstance(end, np.ndarray):
+            start, end = np.asarray(start, dtype=np.int64), np.asarray(end, dtype=np.int64)
+            span = end - start
+            values, cumulative = self._values[region], self._cumulative[region]
+            total = self._integral(values, cumulative, end) - self._integral(values, cumulative, start)
+            return np.where(span > 0, total * 3600 / np.maximum(span, 1), self.at(region, start))
+        if end <= start:
+            return self.at(region, start)
+        values, cumulative = self._value_lists[region], self._cumulative_lists[region]
+        return (self._integral(values, cumulative, end) - self._integral(values, cumulative, start)) * 3600 / (end - start)
+
+    @staticmethod
+    def _integral(values, cumulative, seconds):
+        """Intensity-hours from epoch 0 to ``seconds``; integer division keeps large timestamps exact"""
+        hour, remainder = divmod(seconds, 3600)
+        weeks, index = divmod(hour, HOURS_PER_WEEK)
+        return weeks * cumulative[-1] + cumulative[index] + remainder / 3600 * values[index]
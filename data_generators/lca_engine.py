@@ -0,0 +1,137 @@
+"""
+Zero@Design LCA Engine
+Lifecycle CO2 breakdowns with cached emission factors and content-addressed memoization
+"""
+
+import hashlib
+import json
+from typing import List, Dict, Tuple
+
+LIFECYCLE_STAGES = [
+    ("raw_material_extraction", "material_co2_kg"),
+    ("manufacturing", "process_co2_kg"),
+    ("transportation", "transport_co2_kg"),
+    ("use_phase", None),  # Assuming no emissions during use
+    ("end_of_life", "eol_co2_kg"),
+]
+
+
+class LCAEngine:
+    """Computes material/process/end-of-life breakdowns for a design scenario.
+
+    Emission factors are looked up once per material and process name, and
+    each (materials, weights, processes, units) scenario is memoized under a
+    hash of its canonical JSON, so re-running or tweaking a scenario back to
+    a previous state is a dictionary hit.
+    """
+
+    def __init__(self, materials: List[Dict], processes: List[Dict]):
+        self._material_source = {m["name"]: m for m in materials}
+        self._process_source = {p["name"]: p for p in processes}
+        self._material_factors: Dict[str, Tuple[float, float, bool, bool]] = {}
+        self._process_factors: Dict[str, Tuple[float, float]] = {}
+        self._breakdowns: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def material_factor(self, name: str) -> Tuple[float, float, bool, bool]:
+        """(co2_kg_per_kg, price_per_kg, recyclable, renewable) for a material"""
+        factor = self._material_factors.get(name)
+        if factor is None:
+            m = self._material_source[name]
+            factor = (m["co2_kg_per_kg"], m["price_per_kg"], m["recyclable"], m["renewable"])
+            self._material_factors[name] = factor
+        return factor
+
+    def process_factor(self, name: str) -> Tuple[float, float]:
+        """(co2_kg_per_unit, duration_hours) for a process"""
+        factor = self._process_factors.get(name)
+        if factor is None:
+            p = self._process_source[name]
+            factor = (p["co2_kg_per_unit"], p["duration_hours"])
+            self._process_factors[name] = factor
+        return factor
+
+    @staticmethod
+    def scenario_key(materials: List[Tuple[str, float]], processes: List[str], units: int) -> str:
+        """Content address of a scenario"""
+        payload = json.dumps(
+            {"materials": sorted(materials), "processes": sorted(processes), "units": units},
+            separators=(",", ":")
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def breakdown(self, materials: List[Tuple[str, float]], processes: List[str], units: int) -> Dict:
+        """Material, process and end-of-life CO2 plus cost for a scenario
+
+        ``materials`` is a list of ``(name, weight_kg)`` pairs. Transport is not
+        included; it depends on logistics rather than on the design itself.
+        """
+        key = self.scenario_key(materials, processes, units)
+        cached = self._breakdowns.get(key)
+        if cached is not None:
+            self.hits += 1
+            return dict(cached)
+        self.misses += 1
+
+        material_co2 = 0.0
+        material_cost = 0.0
+        recyclable_weight = 0.0
+        renewable_count = 0
+        total_weight = 0.0
+        for name, weight in materials:
+            co2_per_kg, price_per_kg, recyclable, renewable = self.material_factor(name)
+            material_co2 += co2_per_kg * weight
+            material_cost += price_per_kg * weight
+            total_weight += weight
+            if recyclable:
+                recyclable_weight += weight
+            if renewable:
+                renewable_count += 1
+
+        process_co2 = 0.0
+        labor_cost = 0.0
+        for name in processes:
+            co2_per_unit, duration_hours = self.process_factor(name)
+            process_co2 += co2_per_unit * units
+            labor_cost += duration_hours * 50 * units  # $50/hour
+
+        # Recycling reduces end-of-life impact
+        recyclability_factor = recyclable_weight / total_weight if total_weight > 0 else 0
+        eol_co2 = total_weight * (0.5 * (1 - recyclability_factor))
+
+        result = {
+            "material_co2_kg": material_co2,
+            "process_co2_kg": process_co2,
+            "eol_co2_kg": eol_co2,
+            "recyclability_factor": recyclability_factor,
+            "renewable_fraction": renewable_count / len(materials) if materials else 0,
+            "total_weight_kg": total_weight,
+            "material_cost_usd": material_cost,
+            "labor_cost_usd": labor_cost,
+        }
+        self._breakdowns[key] = result
+        return dict(result)
+
+    @staticmethod
+    def lifecycle_stages(stage_co2: Dict) -> Dict:
+        """Per-stage CO2 and share of the total, from a dict with the ``*_co2_kg`` fields"""
+        total = sum(stage_co2[field] for _, field in LIFECYCLE_STAGES if field)
+        stages = {}
+        for stage, field in LIFECYCLE_STAGES:
+            co2 = stage_co2[field] if field else 0
+            stages[stage] = {
+                "co2_kg": round(co2, 2),
+                "percentage": round(co2 / total * 100, 1) if total else 0,
+            }
+        return stages
+
+    def stats(self) -> Dict:
+        """Cache hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate_percentage": round(self.hits / lookups * 100, 1) if lookups else 0,
+            "cached_scenarios": len(self._breakdowns),
+        }
@@ -0,0 +1,105 @@
+"""
+Partitioned Output Layout
+Writes tables as <table>/<entity>=<value>/date=YYYY-MM-DD.ndjson files plus a manifest readers can prune on
+"""
+
+import argparse
+import json
+import os
+import shutil
+from typing import List, Dict
+
+from timestamps import iso
+
+MANIFEST_FILE = "manifest.json"
+
+# (entity column, time column) each table is partitioned by. Entities are
+# only used where they are few (furnaces, dehydrators, industries); every
+# other table is split by date alone.
+PARTITION_KEYS = {
+    "steel_furnace_metrics": ("furnace_id", "timestamp"),
+    "steel_production_batches": ("furnace_id", "start_time"),
+    "steel_alerts": ("furnace_id", "timestamp"),
+    "steel_maintenance_records": ("furnace_id", "scheduled_date"),
+    "production_orders": (None, "order_date"),
+    "production_stage_tracking": (None, "start_time"),
+    "production_dpp": (None, "manufacturing_date"),
+    "production_quality_checks": (None, "check_date"),
+    "dryfood_dehydration_batches": ("dehydrator_id", "start_time"),
+    "dryfood_temperature_humidity_logs": (None, "timestamp"),
+    "dryfood_waste_impact_analysis": (None, "analysis_date"),
+    "design_projects": ("industry", "start_date"),
+    "design_material_alternatives": (None, None),
+    "design_lifecycle_assessments": (None, "assessment_date"),
+}
+
+
+def add_partition_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--partitioned", action="store_true",
+                        help="Also write <table>/<entity>=<value>/date=<day>.ndjson partitions and manifest.json")
+
+
+def partition_date(value) -> str:
+    """Day of an ISO or epoch-second timestamp"""
+    return value[:10] if isinstance(value, str) else iso(value)[:10]
+
+
+def write_partitions(out_dir: str, table: str, records: List[Dict]) -> Dict:
+    """Write one table's records as NDJSON partitions and record them in the manifest
+
+    Records are written as they are, so call this after timestamps have been
+    formatted. The table's previous partitions are replaced.
+    """
+    entity_field, time_field = PARTITION_KEYS[table]
+    groups: Dict[tuple, List[Dict]] = {}
+    for record in records:
+        entity = record.get(entity_field) if entity_field else None
+        value = record.get(time_field) if time_field else None
+        date = partition_date(value) if value is not None else None
+        groups.setdefault((entity, date), []).append(record)
+
+    table_dir = os.path.join(out_dir, table)
+    shutil.rmtree(table_dir, ignore_errors=True)
+    partitions = []
+    for (entity, date), rows in sorted(groups.items(), key=lambda g: (str(g[0][0]), str(g[0][1]))):
+        parts = [table]
+        if entity_field:
+            parts.append(f"{entity_field}={entity}")
+        parts.append(f"date={date}.ndjson" if date else "all.ndjson")
+        path = "/".join(parts)
+        os.makedirs(os.path.join(out_dir, *parts[:-1]), exist_ok=True)
+        with open(os.path.join(out_dir, *parts), "w") as f:
+            for row in rows:
+                f.write(json.dumps(row, separators=(",", ":")))
+                f.write("\n")
+
+        times = [row[time_field] for row in rows if time_field and row.get(time_field) is not None]
+        partitions.append({
+            "path": path,
+            "entity": entity,
+            "date": date,
+            "rows": len(rows),
+            "min_timestamp": min(times) if times else None,
+            "max_timestamp": max(times) if times else None,
+        })
+
+    entry = {
+        "entity_field": entity_field,
+        "time_field": time_field,
+        "rows": len(records),
+        "partitions": partitions,
+    }
+    update_manifest(out_dir, table, entry)
+    return entry
+
+
+def update_manifest(out_dir: str, table: str, entry: Dict):
+    """Replace one table's entry; generators run separately, so merge into what is there"""
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    manifest = {"tables": {}}
+    if os.path.exists(path):
+        with open(path) as f:
+            manifest = json.load(f)
+    manifest["tables"][table] = entry
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
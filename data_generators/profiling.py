@@ -0,0 +1,127 @@
+"""
+Generator Profiling
+Stage timings, peak RSS and optional cProfile output for the data generators
+"""
+
+import argparse
+import cProfile
+import glob
+import json
+import sys
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def add_profiling_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--profile", action="store_true",
+                        help="Time every stage and write <generator>_profile.json")
+    parser.add_argument("--cprofile", metavar="PATH",
+                        help="Also dump cProfile stats to PATH (view with python -m pstats or snakeviz)")
+
+
+class GeneratorProfiler:
+    """Times named stages of one generator run.
+
+    Disabled profilers cost one ``perf_counter`` pair per stage and write
+    nothing, so generators wrap their stages unconditionally.
+    """
+
+    def __init__(self, generator: str, enabled: bool = False, cprofile_path: Optional[str] = None):
+        self.generator = generator
+        self.enabled = enabled or bool(cprofile_path)
+        self.cprofile_path = cprofile_path
+        self.stages: List[Dict] = []
+        self._profile = cProfile.Profile() if cprofile_path else None
+        self._started = time.perf_counter()
+        if self._profile:
+            self._profile.enable()
+
+    @classmethod
+    def from_args(cls, generator: str, args: argparse.Namespace) -> "GeneratorProfiler":
+        return cls(generator, enabled=args.profile, cprofile_path=args.cprofile)
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.enabled:
+                self.stages.append({
+                    "stage": name,
+                    "seconds": round(time.perf_counter() - started, 4),
+                    "peak_rss_mb": peak_rss_mb(),
+                })
+
+    def finish(self) -> Optional[Dict]:
+        """Stop profiling, print the stage table and write the JSON report"""
+        if self._profile:
+            self._profile.disable()
+            self._profile.dump_stats(self.cprofile_path)
+        if not self.enabled:
+            return None
+
+        total = time.perf_counter() - self._started
+        report = {
+            "generator": self.generator,
+            "total_seconds": round(total, 4),
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": self.stages,
+        }
+        with open(f"{self.generator}_profile.json", "w") as f:
+            json.dump(report, f, indent=2)
+
+        print("\n⏱️  PROFILE")
+        print_stages(self.stages, total)
+        print(f"   Peak RSS: {report['peak_rss_mb']} MB")
+        print(f"   ✅ {self.generator}_profile.json")
+        if self.cprofile_path:
+            print(f"   ✅ cProfile stats in {self.cprofile_path}")
+        return report
+
+
+def print_stages(stages: List[Dict], total: float):
+    for stage in sorted(stages, key=lambda s: s["seconds"], reverse=True):
+        share = stage["seconds"] / total * 100 if total else 0
+        print(f"   {stage['stage']:.<45} {stage['seconds']:>8.3f}s {share:>5.1f}%")
+
+
+def main():
+    """Combine the per-generator profile reports in the current directory"""
+    reports = []
+    for path in sorted(glob.glob("*_profile.json")):
+        with open(path) as f:
+            reports.append(json.load(f))
+    if not reports:
+        print("No *_profile.json files found (run the generators with --profile)")
+        return
+
+    total = sum(r["total_seconds"] for r in reports)
+    stages = [
+        {"stage": f"{r['generator']}: {s['stage']}", "seconds": s["seconds"]}
+        for r in reports for s in r["stages"]
+    ]
+    print("⏱️  SLOWEST STAGES ACROSS ALL GENERATORS")
+    print_stages(stages, total)
+    for report in reports:
+        print(f"   {report['generator']:.<45} {report['total_seconds']:>8.3f}s  peak RSS {report['peak_rss_mb']} MB")
+    print(f"   Total: {total:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
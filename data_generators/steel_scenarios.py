@@ -0,0 +1,275 @@
+"""
+Zero@Steel Fleet Decarbonization Scenarios
+Projects fleet output, energy and CO2 over 1-10 years of hourly series under furnace conversions, scrap and grid changes
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from itertools import product
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+
+from generate_steel_data import (
+    EAF_DIRECT_SHARE, FURNACES, FURNACES_BY_ID, ROUTE_FACTORS, SITE_REGION, STATUS_LOAD_FACTORS, daily_load_factor,
+)
+from grid_intensity import REFERENCE_INTENSITY, GridIntensity
+from steel_status_timeline import STATE_TRANSITIONS
+from timestamps import to_epoch
+
+MAX_YEARS = 10
+
+# Above this many furnace-hours a batch of scenarios is split over a process pool
+PARALLEL_THRESHOLD = 20_000_000
+
+# Mean of the random utilization draw in generate_furnace_metrics
+MEAN_UTILIZATION = (0.85 + 0.98) / 2
+
+# Blast-furnace CO2 and energy avoided per unit of scrap share in the charge.
+# Arc furnaces already run on scrap, so scrap_share only changes blast furnaces.
+SCRAP_CO2_SAVING = 0.75
+SCRAP_ENERGY_SAVING = 0.5
+
+TRANSITION_FIELDS = ("convert_to", "scrap_share", "grid_intensity", "capacity")
+
+
+def midpoint(bounds: Tuple[float, float]) -> float:
+    return (bounds[0] + bounds[1]) / 2
+
+
+def expected_status_load() -> float:
+    """Long-run load multiplier of the status state machine
+
+    Stationary distribution of the run-to-run transitions, weighted by mean
+    run length, against the load each status runs at.
+    """
+    states = list(STATE_TRANSITIONS)
+    transitions = np.zeros((len(states), len(states)))
+    for i, state in enumerate(states):
+        for following in STATE_TRANSITIONS[state]["next"]:
+            transitions[i, states.index(following)] += 1 / len(STATE_TRANSITIONS[state]["next"])
+    eigenvalues, eigenvectors = np.linalg.eig(transitions.T)
+    stationary = np.real(eigenvectors[:, np.argmin(np.abs(eigenvalues - 1))])
+    durations = np.array([midpoint(STATE_TRANSITIONS[s]["duration_hours"]) for s in states])
+    time_share = stationary * durations / (stationary * durations).sum()
+    return float(sum(share * STATUS_LOAD_FACTORS[s] for share, s in zip(time_share, states)))
+
+
+@lru_cache(maxsize=None)
+def baseline_series(start_year: int, years: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(hourly load per ton of capacity, hourly grid factor, first hour of every year)
+
+    The grid factor is the site's hourly grid intensity relative to
+    REFERENCE_INTENSITY. Shared by every scenario with the same horizon; the
+    arrays are read-only.
+    """
+    start = to_epoch(datetime(start_year, 1, 1))
+    year_starts = np.array([(to_epoch(datetime(start_year + y, 1, 1)) - start) // 3600 for y in range(years + 1)])
+    epoch_hours = np.arange(year_starts[-1]) + start // 3600
+    load = (daily_load_factor(epoch_hours % 24) * (MEAN_UTILIZATION * expected_status_load())).astype(np.float32)
+    grid = (GridIntensity.load().at(SITE_REGION, epoch_hours * 3600) / REFERENCE_INTENSITY).astype(np.float32)
+    for array in (load, grid, year_starts):
+        array.flags.writeable = False
+    return load, grid, year_starts
+
+
+def transition_hour(transition: Dict, start_year: int, year_starts: np.ndarray) -> int:
+    """Hour offset a transition takes effect at (1 January, or the first of ``month``)"""
+    when = datetime(transition["year"], transition.get("month", 1), 1)
+    offset = (to_epoch(when) - to_epoch(datetime(start_year, 1, 1))) // 3600
+    return int(min(max(offset, 0), year_starts[-1]))
+
+
+def validate_scenario(scenario: Dict) -> Dict:
+    """Fill defaults and reject scenarios the engine cannot run"""
+    scenario = {"start_year": datetime.now().year, "years": MAX_YEARS, "transitions": [], **scenario}
+    if not 1 <= scenario["years"] <= MAX_YEARS:
+        raise ValueError(f"{scenario.get('name')}: years must be between 1 and {MAX_YEARS}")
+    for transition in scenario["transitions"]:
+        changes = [field for field in TRANSITION_FIELDS if field in transition]
+        if "year" not in transition or not changes:
+            raise ValueError(f"{scenario.get('name')}: a transition needs a year and one of {TRANSITION_FIELDS}")
+        furnace_id = transition.get("furnace_id")
+        if furnace_id is not None and furnace_id not in FURNACES_BY_ID:
+            raise ValueError(f"{scenario.get('name')}: unknown furnace {furnace_id}")
+        if transition.get("convert_to", "blast") not in ROUTE_FACTORS:
+            raise ValueError(f"{scenario.get('name')}: unknown furnace type {transition['convert_to']}")
+    return scenario
+
+
+def simulate_scenario(scenario: Dict) -> Dict:
+    """Yearly fleet totals for one scenario, with the change against the unchanged fleet
+
+    Every furnace gets hourly capacity, route and scrap-share series and the
+    fleet shares one hourly grid factor: the site's typical-week grid profile
+    times the scenario's ``grid_intensity`` (1.0 = today's grid). The
+    transitions switch them from their hour onwards, in year order.
+    """
+    scenario = validate_scenario(scenario)
+    start_year, years = scenario["start_year"], scenario["years"]
+    load, base_grid, year_starts = baseline_series(start_year, years)
+    hours = len(load)
+    count = len(FURNACES)
+
+    capacity = np.repeat(np.array([[f["capacity"]] for f in FURNACES], dtype=np.float32), hours, axis=1)
+    electric = np.repeat(np.array([[f["type"] == "electric"] for f in FURNACES]), hours, axis=1)
+    scrap = np.zeros((count, hours), dtype=np.float32)
+    grid = base_grid.copy()
+    rows = {f["id"]: i for i, f in enumerate(FURNACES)}
+
+    for transition in sorted(scenario["transitions"], key=lambda t: (t["year"], t.get("month", 1))):
+        hour = transition_hour(transition, start_year, year_starts)
+        target = slice(None) if transition.get("furnace_id") is None else rows[transition["furnace_id"]]
+        if "convert_to" in transition:
+            electric[target, hour:] = transition["convert_to"] == "electric"
+        if "scrap_share" in transition:
+            scrap[target, hour:] = min(max(transition["scrap_share"], 0.0), 1.0)
+        if "capacity" in transition:
+            capacity[target, hour:] = transition["capacity"]
+        if "grid_intensity" in transition:
+            grid[hour:] = base_grid[hour:] * transition["grid_intensity"]
+
+    blast, arc = ROUTE_FACTORS["blast"], ROUTE_FACTORS["electric"]
+    tons = capacity * load
+    energy_per_ton = np.where(electric, midpoint(arc["energy_mwh_per_ton"]),
+                              midpoint(blast["energy_mwh_per_ton"]) * (1 - SCRAP_ENERGY_SAVING * scrap))
+    co2_per_ton = np.where(electric, midpoint(arc["co2_per_ton"]) * (EAF_DIRECT_SHARE + (1 - EAF_DIRECT_SHARE) * grid),
+                           midpoint(blast["co2_per_ton"]) * (1 - SCRAP_CO2_SAVING * scrap))
+
+    # Fleet-wide hourly series, then one sum per year
+    bounds = year_starts[:-1]
+    output = np.add.reduceat(tons.sum(axis=0, dtype=np.float64), bounds)
+    energy = np.add.reduceat((tons * energy_per_ton).sum(axis=0, dtype=np.float64), bounds)
+    co2 = np.add.reduceat((tons * co2_per_ton).sum(axis=0, dtype=np.float64), bounds)
+
+    yearly = [
+        {
+            "year": start_year + y,
+            "output_tons": round(float(output[y]), 1),
+            "energy_mwh": round(float(energy[y]), 1),
+            "co2_kg": round(float(co2[y]), 1),
+            "co2_per_ton": round(float(co2[y] / output[y]), 4) if output[y] else None,
+        }
+        for y in range(years)
+    ]
+    result = {
+        "name": scenario.get("name", ""),
+        "start_year": start_year,
+        "years": years,
+        "yearly": yearly,
+        "total_output_tons": round(float(output.sum()), 1),
+        "total_energy_mwh": round(float(energy.sum()), 1),
+        "total_co2_kg": round(float(co2.sum()), 1),
+    }
+    if scenario["transitions"]:
+        baseline = baseline_totals(start_year, years)
+        result["co2_change_pct"] = round((result["total_co2_kg"] / baseline - 1) * 100, 2)
+    else:
+        result["co2_change_pct"] = 0.0
+    return result
+
+
+@lru_cache(maxsize=None)
+def baseline_totals(start_year: int, years: int) -> float:
+    """Total CO2 of today's fleet over the horizon, computed once per horizon"""
+    return simulate_scenario({"start_year": start_year, "years": years})["total_co2_kg"]
+
+
+def simulate_batch(scenarios: List[Dict]) -> List[Dict]:
+    return [simulate_scenario(scenario) for scenario in scenarios]
+
+
+def run_scenarios(scenarios: List[Dict], workers: Optional[int] = None) -> List[Dict]:
+    """Simulate scenarios in input order, over a process pool for large batches
+
+    Each worker gets a contiguous slice of scenarios sorted by horizon, so
+    the cached baseline series are built once per horizon per worker.
+    """
+    scenarios = [validate_scenario(s) for s in scenarios]
+    furnace_hours = sum(s["years"] for s in scenarios) * 8766 * len(FURNACES)
+    if workers == 1 or len(scenarios) < 2 or furnace_hours <= PARALLEL_THRESHOLD:
+        return simulate_batch(scenarios)
+
+    workers = workers or os.cpu_count()
+    order = sorted(range(len(scenarios)), key=lambda i: (scenarios[i]["start_year"], scenarios[i]["years"]))
+    size = -(-len(order) // workers)
+    slices = [order[i:i + size] for i in range(0, len(order), size)]
+    results: List[Optional[Dict]] = [None] * len(scenarios)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for indexes, batch in zip(slices, pool.map(simulate_batch, [[scenarios[i] for i in s] for s in slices])):
+            for index, result in zip(indexes, batch):
+                results[index] = result
+    return results
+
+
+EXAMPLE_SCENARIOS = [
+    {"name": "Current fleet"},
+    {"name": "FNC-001 to EAF in 2027", "transitions": [
+        {"year": 2027, "furnace_id": "FNC-001", "convert_to": "electric"},
+    ]},
+    {"name": "30% scrap in blast furnaces", "transitions": [{"year": 2027, "scrap_share": 0.3}]},
+    {"name": "Grid 40% cleaner by 2030", "transitions": [
+        {"year": 2028, "grid_intensity": 0.8}, {"year": 2030, "grid_intensity": 0.6},
+    ]},
+]
+
+
+def sweep_scenarios(start_year: Optional[int] = None) -> List[Dict]:
+    """Every combination of blast-furnace conversion years, scrap share and grid trajectory"""
+    start_year = start_year or datetime.now().year
+    conversion_years = [None] + list(range(start_year + 1, start_year + 6))
+    blast_ids = [f["id"] for f in FURNACES if f["type"] == "blast"]
+    scenarios = []
+    for years, scrap, grid in product(product(conversion_years, repeat=len(blast_ids)), (0.0, 0.15, 0.3), (1.0, 0.7, 0.4)):
+        transitions = [
+            {"year": year, "furnace_id": furnace_id, "convert_to": "electric"}
+            for furnace_id, year in zip(blast_ids, years) if year
+        ]
+        if scrap:
+            transitions.append({"year": start_year + 1, "scrap_share": scrap})
+        if grid != 1.0:
+            transitions.append({"year": start_year + 5, "grid_intensity": grid})
+        name = ", ".join(
+            [f"{furnace_id}->EAF {year}" for furnace_id, year in zip(blast_ids, years) if year]
+            + ([f"scrap {scrap:.0%}"] if scrap else []) + ([f"grid x{grid}"] if grid != 1.0 else [])
+        ) or "Current fleet"
+        scenarios.append({"name": name, "start_year": start_year, "transitions": transitions})
+    return scenarios
+
+
+def main():
+    """Run scenarios from a JSON file, the built-in examples, or a full sweep"""
+    parser = argparse.ArgumentParser(description="Project Zero@Steel fleet CO2 under decarbonization scenarios")
+    parser.add_argument("scenarios", nargs="?", help="JSON list of scenarios (default: built-in examples)")
+    parser.add_argument("--sweep", action="store_true",
+                        help="Run every combination of conversion year, scrap share and grid trajectory")
+    parser.add_argument("--workers", type=int, help="Processes for large batches (default: all CPUs)")
+    parser.add_argument("--output", default="steel_scenarios.json")
+    args = parser.parse_args()
+
+    if args.scenarios:
+        with open(args.scenarios) as f:
+            scenarios = json.load(f)
+    else:
+        scenarios = sweep_scenarios() if args.sweep else EXAMPLE_SCENARIOS
+
+    print(f"🏭 Simulating {len(scenarios)} fleet scenarios...")
+    results = run_scenarios(scenarios, args.workers)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print("\n" + "=" * 60)
+    print("📉 LOWEST-CO2 SCENARIOS")
+    print("=" * 60)
+    for result in sorted(results, key=lambda r: r["total_co2_kg"])[:10]:
+        print(f"{result['name']:.<62} {result['total_co2_kg']:>16,.0f} kg {result['co2_change_pct']:>+7.1f}%")
+    print("=" * 60)
+    print(f"✅ {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Zero@Steel Furnace Scheduler
+Lays production batches onto furnace timelines and aggregates furnace metrics per batch
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Tuple
+
+from timestamps import to_epoch
+
+
+class FurnaceTimeline:
+    """Non-overlapping occupancy intervals for a single furnace.
+
+    Intervals are kept in two parallel sorted lists so conflict checks are a
+    bisect plus a walk over the (usually zero or one) intervals that collide.
+    Booking inserts into both lists, which is linear in the bookings; with a
+    few hundred per furnace that shift costs less than the searches.
+    """
+
+    def __init__(self, furnace_id: str):
+        self.furnace_id = furnace_id
+        self.starts: List[datetime] = []
+        self.ends: List[datetime] = []
+
+    def conflicts(self, start: datetime, end: datetime) -> bool:
+        """Check whether [start, end) overlaps a booked interval"""
+        idx = bisect_right(self.starts, start) - 1
+        if idx >= 0 and self.ends[idx] > start:
+            return True
+        return idx + 1 < len(self.starts) and self.starts[idx + 1] < end
+
+    def find_slot(self, earliest: datetime, duration: timedelta) -> datetime:
+        """Find the earliest start >= earliest where the furnace is free for duration"""
+        start = earliest
+        idx = bisect_right(self.starts, start) - 1
+        if idx >= 0 and self.ends[idx] > start:
+            start = self.ends[idx]
+        idx += 1
+        while idx < len(self.starts) and self.starts[idx] < start + duration:
+            start = max(start, self.ends[idx])
+            idx += 1
+        return start
+
+    def book(self, start: datetime, end: datetime):
+        """Reserve [start, end) on the furnace"""
+        if self.conflicts(start, end):
+            raise ValueError(f"{self.furnace_id}: {start.isoformat()} - {end.isoformat()} overlaps a booked interval")
+        idx = bisect_left(self.starts, start)
+        self.starts.insert(idx, start)
+        self.ends.insert(idx, end)
+
+
+class MetricsIndex:
+    """Prefix sums over each furnace's metric series.
+
+    Each sample's CO2 and energy are its load times that reading's per-ton
+    factors, so the load-weighted per-ton factors over a window are the
+    window's CO2 and energy sums over its load sum. With prefix sums that is
+    two bisects and a few subtractions per batch. Sample timestamps are epoch
+    seconds, as the generators keep them. The readings' CO2 is load times
+    tonnes CO2 per tonne, so ``co2_per_ton`` is in tonnes; callers convert.
+    """
+
+    SUM_FIELDS = ("co2_emissions_kg", "energy_consumption_mwh", "current_load_tons")
+
+    def __init__(self, metrics: List[Dict]):
+        series: Dict[str, List[Dict]] = {}
+        for m in metrics:
+            series.setdefault(m["furnace_id"], []).append(m)
+
+        self.times: Dict[str, List[int]] = {}
+        self.prefix: Dict[str, Dict[str, List[float]]] = {}
+        for furnace_id, rows in series.items():
+            rows.sort(key=lambda m: m["timestamp"])
+            self.times[furnace_id] = [m["timestamp"] for m in rows]
+            self.prefix[furnace_id] = {}
+            for field in self.SUM_FIELDS:
+                sums = [0.0]
+                for m in rows:
+                    sums.append(sums[-1] + m[field])
+                self.prefix[furnace_id][field] = sums
+
+    def window(self, furnace_id: str, start: datetime, end: datetime) -> Dict:
+        """Aggregate a furnace's metrics over [start, end)"""
+        times = self.times.get(furnace_id, [])
+        lo = bisect_left(times, to_epoch(start))
+        hi = bisect_left(times, to_epoch(end))
+        samples = hi - lo
+        prefix = self.prefix.get(furnace_id, {})
+
+        def total(field: str) -> float:
+            return prefix[field][hi] - prefix[field][lo] if samples else 0.0
+
+        load = total("current_load_tons")
+        return {
+            "samples": samples,
+            "avg_load_tons": load / samples if samples else 0.0,
+            "co2_per_ton": total("co2_emissions_kg") / load if load else 0.0,
+            "energy_mwh_per_ton": total("energy_consumption_mwh") / load if load else 0.0,
+        }
+
+
+def schedule_batch(timelines: Dict[str, FurnaceTimeline], preferred: str, earliest: datetime,
+                   duration: timedelta, horizon_end: datetime) -> Optional[Tuple[str, datetime]]:
+    """Place a batch on the preferred furnace, or whichever furnace frees up first
+
+    Returns ``(furnace_id, start_time)`` or ``None`` if no furnace can finish
+    the batch before ``horizon_end``.
+    """
+    start = timelines[preferred].find_slot(earliest, duration)
+    if start + duration <= horizon_end:
+        furnace_id = preferred
+    else:
+        furnace_id, start = min(
+            ((fid, timeline.find_slot(earliest, duration)) for fid, timeline in timelines.items()),
+            key=lambda slot: slot[1]
+        )
+        if start + duration > horizon_end:
+            return None
+    timelines[furnace_id].book(start, start + duration)
+    return furnace_id, start
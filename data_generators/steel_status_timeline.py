@@ -0,0 +1,83 @@
+"""
+Zero@Steel Furnace Status Timeline
+Run-length encoded operational/maintenance/idle history shared by metrics, alerts and maintenance
+"""
+
+import random
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import List, Dict, Iterator, Optional, Tuple
+
+from timestamps import to_epoch
+
+# State machine: run length (hours) per state and the states that can follow it.
+# Operational runs average ~57h and hand over to maintenance or idle with equal
+# odds, which keeps the long-run mix close to 85% / 10% / 5%.
+STATE_TRANSITIONS = {
+    "operational": {"duration_hours": (24, 90), "next": ["maintenance", "idle"]},
+    "maintenance": {"duration_hours": (2, 24), "next": ["operational"]},
+    "idle": {"duration_hours": (2, 12), "next": ["operational"]},
+}
+
+
+class StatusTimeline:
+    """Furnace states as contiguous run-length encoded intervals.
+
+    ``starts[i]`` to ``starts[i + 1]`` is in ``states[i]``; the last run ends at
+    ``end``. Looking up the state at any instant is a single bisect.
+    """
+
+    def __init__(self, furnace_id: str, starts: List[datetime], states: List[str], end: datetime):
+        self.furnace_id = furnace_id
+        self.starts = starts
+        self.states = states
+        self.end = end
+        self.epoch_starts = [to_epoch(start) for start in starts]
+
+    def state_at(self, timestamp: datetime) -> str:
+        """State of the furnace at a given instant"""
+        idx = bisect_right(self.starts, timestamp) - 1
+        return self.states[max(idx, 0)]
+
+    def state_at_epoch(self, seconds: int) -> str:
+        """``state_at`` for an epoch-second timestamp"""
+        idx = bisect_right(self.epoch_starts, seconds) - 1
+        return self.states[max(idx, 0)]
+
+    def runs(self, state: Optional[str] = None) -> Iterator[Tuple[datetime, datetime, str]]:
+        """Iterate (start, end, state) runs, optionally only those in one state"""
+        for i, run_state in enumerate(self.states):
+            if state is None or run_state == state:
+                run_end = self.starts[i + 1] if i + 1 < len(self.starts) else self.end
+                yield self.starts[i], run_end, run_state
+
+    def next_run(self, after: datetime, state: str) -> Optional[Tuple[datetime, datetime]]:
+        """First run in ``state`` starting strictly after ``after``, or None"""
+        idx = bisect_right(self.starts, after)
+        for i in range(idx, len(self.states)):
+            if self.states[i] == state:
+                run_end = self.starts[i + 1] if i + 1 < len(self.starts) else self.end
+                return self.starts[i], run_end
+        return None
+
+
+def build_status_timeline(furnace_id: str, start: datetime, end: datetime) -> StatusTimeline:
+    """Walk the state machine once from start to end for one furnace"""
+    starts = []
+    states = []
+    current = start
+    state = "operational"
+    while current < end:
+        starts.append(current)
+        states.append(state)
+        current += timedelta(hours=random.uniform(*STATE_TRANSITIONS[state]["duration_hours"]))
+        state = random.choice(STATE_TRANSITIONS[state]["next"])
+    return StatusTimeline(furnace_id, starts, states, end)
+
+
+def build_fleet_timelines(furnaces: List[Dict], days_back: int = 180, days_ahead: int = 90) -> Dict[str, StatusTimeline]:
+    """Build one status timeline per furnace covering history and upcoming schedule"""
+    now = datetime.now()
+    start = now - timedelta(days=days_back)
+    end = now + timedelta(days=days_ahead)
+    return {f["id"]: build_status_timeline(f["id"], start, end) for f in furnaces}
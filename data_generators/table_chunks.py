@@ -0,0 +1,29 @@
+"""
+Table Chunks
+The (table, rows) chunks each generator's tables() yields, for its own main() and for supabase_setup/pipeline.py
+"""
+
+from itertools import islice
+from typing import Iterable, Iterator, List, Dict, Tuple
+
+CHUNK_ROWS = 1000
+
+Chunk = Tuple[str, List[Dict]]
+
+
+def chunked(table: str, records: Iterable[Dict], rows: int = CHUNK_ROWS) -> Iterator[Chunk]:
+    """A stream of records as (table, up to rows records) chunks"""
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, rows))
+        if not chunk:
+            return
+        yield table, chunk
+
+
+def collect(chunks: Iterable[Chunk]) -> Dict[str, List[Dict]]:
+    """Each table's rows, tables in the order they first came"""
+    tables: Dict[str, List[Dict]] = {}
+    for table, rows in chunks:
+        tables.setdefault(table, []).extend(rows)
+    return tables
@@ -0,0 +1,133 @@
+"""
+Time-Ordered Generation
+Random offsets drawn already sorted, and k-way merges of time-sorted streams, shards and spilled runs
+"""
+
+import argparse
+import heapq
+import json
+import os
+import random
+import sys
+import tempfile
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Iterator, List, Dict, Tuple
+
+from partitioned_output import MANIFEST_FILE
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated_data")
+
+# Rows external_sort holds in memory before spilling a sorted run to disk
+RUN_ROWS = 100_000
+
+
+def sorted_uniforms(n: int) -> Iterator[float]:
+    """n uniform [0, 1) draws in ascending order, one at a time, without sorting
+
+    The largest of k uniforms is distributed as U ** (1/k), and the rest are
+    k - 1 uniforms below it, so the order statistics can be drawn from the
+    top down in O(1) memory. Reflecting them gives ascending order.
+    """
+    top = 1.0
+    for k in range(n, 0, -1):
+        top *= random.random() ** (1 / k)
+        yield 1 - top
+
+
+def release_sorted(items: Iterable[Tuple[Any, Dict]], key: Callable[[Dict], Any]) -> Iterator[Dict]:
+    """Records in ascending key order from a nearly ordered stream
+
+    Each item is ``(watermark, record)``, where no later record's key is
+    below the watermark; scheduling requested starts in order gives that,
+    since a batch never starts before it was requested. Records wait in a
+    heap until the watermark passes them, so memory is bounded by how far a
+    record can land after its watermark, not by the stream's length.
+    """
+    pending = []
+    for counter, (watermark, record) in enumerate(items):
+        heapq.heappush(pending, (key(record), counter, record))
+        while pending and pending[0][0] <= watermark:
+            yield heapq.heappop(pending)[2]
+    while pending:
+        yield heapq.heappop(pending)[2]
+
+
+def read_ndjson(path: str) -> Iterator[Dict]:
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def merge_shards(paths: List[str], key: Callable[[Dict], Any], reverse: bool = False) -> Iterator[Dict]:
+    """k-way merge of NDJSON shards that are each sorted the same way; one row per shard in memory"""
+    return heapq.merge(*(read_ndjson(path) for path in paths), key=key, reverse=reverse)
+
+
+def external_sort(records: Iterable[Dict], key: Callable[[Dict], Any], reverse: bool = False,
+                  run_rows: int = RUN_ROWS) -> Iterator[Dict]:
+    """Sort a stream larger than memory: sorted runs of run_rows spill to temporary NDJSON files, then merge"""
+    records = iter(records)
+    run = list(islice(records, run_rows))
+    if len(run) < run_rows:
+        yield from sorted(run, key=key, reverse=reverse)  # Fits in one run: the disk is not touched
+        return
+    with tempfile.TemporaryDirectory(prefix="time_order_") as directory:
+        paths = []
+        while run:
+            run.sort(key=key, reverse=reverse)
+            path = os.path.join(directory, f"run-{len(paths):05d}.ndjson")
+            with open(path, "w") as f:
+                for row in run:
+                    f.write(json.dumps(row, separators=(",", ":")))
+                    f.write("\n")
+            paths.append(path)
+            run = list(islice(records, run_rows))
+        yield from merge_shards(paths, key, reverse)
+
+
+def merge_partitions(data_dir: str, table: str) -> Iterator[Dict]:
+    """One table's partitioned layout as a single newest-first stream
+
+    Partitions of different days cannot interleave, so only one day's
+    partitions (one per entity) are read at a time; each is sorted in
+    memory, since not every table is written in time order.
+    """
+    with open(os.path.join(data_dir, MANIFEST_FILE)) as f:
+        entry = json.load(f)["tables"][table]
+    time_field = entry["time_field"]
+    if time_field is None:
+        raise ValueError(f"{table} has no time column to merge on")
+    key = itemgetter(time_field)
+    partitions = sorted(entry["partitions"], key=lambda p: p["date"] or "", reverse=True)
+    for date, day in groupby(partitions, key=lambda p: p["date"]):
+        if date is None:  # Rows without a timestamp go last, as they are
+            for partition in day:
+                yield from read_ndjson(os.path.join(data_dir, partition["path"]))
+            continue
+        shards = [sorted(read_ndjson(os.path.join(data_dir, partition["path"])), key=key, reverse=True)
+                  for partition in day]
+        yield from heapq.merge(*shards, key=key, reverse=True)
+
+
+def main():
+    """Write one partitioned table as a single newest-first NDJSON stream"""
+    parser = argparse.ArgumentParser(description="Merge a table's partitions into one newest-first stream")
+    parser.add_argument("table")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--output", help="NDJSON file to write (default: stdout)")
+    args = parser.parse_args()
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for row in merge_partitions(args.data_dir, args.table):
+            out.write(json.dumps(row, separators=(",", ":")))
+            out.write("\n")
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Generator Timestamps
+Integer epoch-second timestamps used inside the generators, formatted once at serialization
+"""
+
+import argparse
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Union
+
+# Generated times are naive wall-clock times; epoch seconds count from this
+# naive origin, i.e. they read the wall clock as if it were UTC.
+EPOCH = datetime(1970, 1, 1)
+ONE_SECOND = timedelta(seconds=1)
+TIMESTAMP_FORMATS = ("iso", "epoch")
+
+
+def to_epoch(dt: datetime) -> int:
+    return (dt - EPOCH) // ONE_SECOND
+
+
+def from_epoch(seconds: int) -> datetime:
+    return EPOCH + timedelta(seconds=seconds)
+
+
+def now_epoch() -> int:
+    return to_epoch(datetime.now())
+
+
+def hours(value: float) -> int:
+    """Whole seconds in a (fractional) number of hours"""
+    return round(value * 3600)
+
+
+@lru_cache(maxsize=8192)
+def _day_prefix(day: int) -> str:
+    return (EPOCH + timedelta(days=day)).strftime("%Y-%m-%dT")
+
+
+def iso(seconds: int) -> str:
+    """Same text as ``from_epoch(seconds).isoformat()`` without building a datetime"""
+    day, rem = divmod(seconds, 86400)
+    hour, rem = divmod(rem, 3600)
+    minute, second = divmod(rem, 60)
+    return f"{_day_prefix(day)}{hour:02d}:{minute:02d}:{second:02d}"
+
+
+def add_timestamp_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--timestamp-format", choices=TIMESTAMP_FORMATS, default="iso",
+                        help="Write timestamps as ISO 8601 text (default) or integer epoch seconds")
+
+
+class TimestampFormatter:
+    """Converts the epoch-second fields of finished records to the output format"""
+
+    def __init__(self, timestamp_format: str = "iso"):
+        if timestamp_format not in TIMESTAMP_FORMATS:
+            raise ValueError(f"Unknown timestamp format: {timestamp_format}")
+        self.timestamp_format = timestamp_format
+
+    def __call__(self, seconds: Optional[int]) -> Union[str, int, None]:
+        if seconds is None or self.timestamp_format == "epoch":
+            return seconds
+        return iso(seconds)
+
+    def format_records(self, records: List[Dict], fields: Iterable[str]) -> List[Dict]:
+        """Format ``fields`` in place, right before the records are written"""
+        if self.timestamp_format == "epoch":
+            return records
+        fields = list(fields)
+        for record in records:
+            for field in fields:
+                value = record.get(field)
+                if value is not None:
+                    record[field] = iso(value)
+        return records
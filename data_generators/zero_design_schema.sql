@@ -0,0 +1,94 @@
+-- Zero@Design schema, written by supabase_setup/schema_ddl.py; do not edit by hand.
+-- Monthly partitions run 3 months past 2026-10; rerun to add more.
+
+CREATE TABLE IF NOT EXISTS design_projects (
+    project_id TEXT NOT NULL,
+    project_name TEXT,
+    client TEXT,
+    industry TEXT,
+    start_date TIMESTAMP,
+    target_completion TIMESTAMP,
+    phase TEXT,
+    progress_percentage DOUBLE PRECISION,
+    materials_used TEXT,
+    processes_used TEXT,
+    units_planned BIGINT,
+    material_co2_kg DOUBLE PRECISION,
+    process_co2_kg DOUBLE PRECISION,
+    transport_co2_kg DOUBLE PRECISION,
+    eol_co2_kg DOUBLE PRECISION,
+    total_co2_kg DOUBLE PRECISION,
+    co2_per_unit DOUBLE PRECISION,
+    sustainability_score DOUBLE PRECISION,
+    recyclability_percentage DOUBLE PRECISION,
+    renewable_content_percentage DOUBLE PRECISION,
+    total_cost_usd DOUBLE PRECISION,
+    cost_per_unit DOUBLE PRECISION,
+    designer TEXT,
+    sustainability_target BIGINT,
+    target_met BOOLEAN,
+    notes TEXT,
+    PRIMARY KEY (project_id)
+);
+CREATE INDEX IF NOT EXISTS design_projects_industry_start_date_idx ON design_projects (industry, start_date);
+
+CREATE TABLE IF NOT EXISTS design_material_alternatives (
+    alternative_id TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    scenario_name TEXT,
+    materials TEXT,
+    estimated_co2_kg DOUBLE PRECISION,
+    co2_difference_kg DOUBLE PRECISION,
+    co2_reduction_percentage DOUBLE PRECISION,
+    estimated_cost_usd DOUBLE PRECISION,
+    cost_difference_usd DOUBLE PRECISION,
+    recyclability_percentage DOUBLE PRECISION,
+    recommendation TEXT,
+    notes TEXT,
+    PRIMARY KEY (alternative_id),
+    FOREIGN KEY (project_id) REFERENCES design_projects (project_id)
+);
+CREATE INDEX IF NOT EXISTS design_material_alternatives_project_id_idx ON design_material_alternatives (project_id);
+
+CREATE TABLE IF NOT EXISTS design_lifecycle_assessments (
+    lca_id TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    assessment_date TIMESTAMP,
+    lifecycle_stages TEXT,
+    total_co2_kg DOUBLE PRECISION,
+    co2_per_unit DOUBLE PRECISION,
+    water_usage_liters DOUBLE PRECISION,
+    energy_consumption_kwh DOUBLE PRECISION,
+    recyclability_score DOUBLE PRECISION,
+    circularity_score DOUBLE PRECISION,
+    improvement_recommendations TEXT,
+    PRIMARY KEY (lca_id),
+    FOREIGN KEY (project_id) REFERENCES design_projects (project_id)
+);
+CREATE INDEX IF NOT EXISTS design_lifecycle_assessments_project_id_idx ON design_lifecycle_assessments (project_id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS design_kpi_summary AS
+SELECT count(*) AS total_projects,
+       count(*) FILTER (WHERE phase = 'completed') AS completed_projects,
+       count(*) FILTER (WHERE phase <> 'completed') AS in_progress_projects,
+       round(sum(total_co2_kg)::numeric, 2) AS total_co2_emissions_kg,
+       round(avg(sustainability_score)::numeric, 1) AS avg_sustainability_score,
+       count(*) FILTER (WHERE target_met) AS sustainability_targets_met,
+       round(100.0 * count(*) FILTER (WHERE target_met) / nullif(count(*), 0), 1) AS target_achievement_rate,
+       round(avg(recyclability_percentage)::numeric, 1) AS avg_recyclability,
+       (SELECT count(*) FROM design_material_alternatives) AS material_alternatives_analyzed,
+       (SELECT count(*) FROM design_lifecycle_assessments) AS lca_reports_completed
+FROM design_projects;
+CREATE MATERIALIZED VIEW IF NOT EXISTS design_industry_summary AS
+SELECT industry,
+       count(*) AS projects,
+       round(avg(co2_per_unit)::numeric, 3) AS avg_co2_per_unit,
+       round(avg(sustainability_score)::numeric, 1) AS avg_sustainability_score,
+       count(*) FILTER (WHERE target_met) AS targets_met
+FROM design_projects
+GROUP BY industry;
+CREATE UNIQUE INDEX IF NOT EXISTS design_industry_summary_key ON design_industry_summary (industry);
+CREATE OR REPLACE FUNCTION refresh_zero_design_kpis() RETURNS void LANGUAGE sql AS $$
+    REFRESH MATERIALIZED VIEW design_kpi_summary;
+    REFRESH MATERIALIZED VIEW CONCURRENTLY design_industry_summary;
+$$;
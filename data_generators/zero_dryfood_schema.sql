@@ -0,0 +1,118 @@
+-- Zero@Dryfood schema, written by supabase_setup/schema_ddl.py; do not edit by hand.
+-- Monthly partitions run 3 months past 2026-10; rerun to add more.
+
+CREATE TABLE IF NOT EXISTS dryfood_dehydration_batches (
+    batch_id TEXT NOT NULL,
+    dehydrator_id TEXT,
+    dehydrator_name TEXT,
+    food_type TEXT,
+    food_category TEXT,
+    start_time TIMESTAMP,
+    end_time TIMESTAMP,
+    duration_hours DOUBLE PRECISION,
+    fresh_weight_kg DOUBLE PRECISION,
+    dried_weight_kg DOUBLE PRECISION,
+    weight_loss_percentage DOUBLE PRECISION,
+    initial_moisture_percent BIGINT,
+    final_moisture_percent DOUBLE PRECISION,
+    target_temperature_c DOUBLE PRECISION,
+    actual_temperature_c DOUBLE PRECISION,
+    humidity_percent DOUBLE PRECISION,
+    energy_consumption_kwh DOUBLE PRECISION,
+    co2_emissions_kg DOUBLE PRECISION,
+    energy_type TEXT,
+    quality_score DOUBLE PRECISION,
+    fresh_value_usd DOUBLE PRECISION,
+    dried_value_usd DOUBLE PRECISION,
+    value_added_usd DOUBLE PRECISION,
+    waste_prevented_kg DOUBLE PRECISION,
+    shelf_life_extension_days BIGINT,
+    status TEXT,
+    operator TEXT,
+    notes TEXT,
+    PRIMARY KEY (batch_id)
+);
+CREATE INDEX IF NOT EXISTS dryfood_dehydration_batches_start_time_idx ON dryfood_dehydration_batches (start_time);
+
+CREATE TABLE IF NOT EXISTS dryfood_temperature_humidity_logs (
+    log_id TEXT NOT NULL,
+    batch_id TEXT NOT NULL,
+    "timestamp" TIMESTAMP NOT NULL,
+    temperature_c DOUBLE PRECISION,
+    humidity_percent DOUBLE PRECISION,
+    fan_speed_percent DOUBLE PRECISION,
+    power_kw DOUBLE PRECISION,
+    PRIMARY KEY (log_id, "timestamp"),
+    FOREIGN KEY (batch_id) REFERENCES dryfood_dehydration_batches (batch_id)
+) PARTITION BY RANGE ("timestamp");
+CREATE TABLE IF NOT EXISTS dryfood_temperature_humidity_logs_2026_08 PARTITION OF dryfood_temperature_humidity_logs FOR VALUES FROM ('2026-08-01') TO ('2026-09-01');
+CREATE TABLE IF NOT EXISTS dryfood_temperature_humidity_logs_2026_09 PARTITION OF dryfood_temperature_humidity_logs FOR VALUES FROM ('2026-09-01') TO ('2026-10-01');
+CREATE TABLE IF NOT EXISTS dryfood_temperature_humidity_logs_2026_10 PARTITION OF dryfood_temperature_humidity_logs FOR VALUES FROM ('2026-10-01') TO ('2026-11-01');
+CREATE TABLE IF NOT EXISTS dryfood_temperature_humidity_logs_2026_11 PARTITION OF dryfood_temperature_humidity_logs FOR VALUES FROM ('2026-11-01') TO ('2026-12-01');
+CREATE TABLE IF NOT EXISTS dryfood_temperature_humidity_logs_2026_12 PARTITION OF dryfood_temperature_humidity_logs FOR VALUES FROM ('2026-12-01') TO ('2027-01-01');
+CREATE TABLE IF NOT EXISTS dryfood_temperature_humidity_logs_2027_01 PARTITION OF dryfood_temperature_humidity_logs FOR VALUES FROM ('2027-01-01') TO ('2027-02-01');
+CREATE TABLE IF NOT EXISTS dryfood_temperature_humidity_logs_default PARTITION OF dryfood_temperature_humidity_logs DEFAULT;
+CREATE TABLE IF NOT EXISTS dryfood_temperature_humidity_logs_keys (
+    log_id TEXT PRIMARY KEY
+);
+CREATE OR REPLACE FUNCTION dryfood_temperature_humidity_logs_keys_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        DELETE FROM dryfood_temperature_humidity_logs_keys k USING old_rows o WHERE k.log_id = o.log_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO dryfood_temperature_humidity_logs_keys (log_id) SELECT log_id FROM new_rows;
+    ELSIF TG_OP = 'TRUNCATE' THEN
+        TRUNCATE dryfood_temperature_humidity_logs_keys;
+    END IF;
+    RETURN NULL;
+END $$;
+CREATE OR REPLACE TRIGGER dryfood_temperature_humidity_logs_keys_insert AFTER INSERT ON dryfood_temperature_humidity_logs REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION dryfood_temperature_humidity_logs_keys_sync();
+CREATE OR REPLACE TRIGGER dryfood_temperature_humidity_logs_keys_update AFTER UPDATE ON dryfood_temperature_humidity_logs REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION dryfood_temperature_humidity_logs_keys_sync();
+CREATE OR REPLACE TRIGGER dryfood_temperature_humidity_logs_keys_delete AFTER DELETE ON dryfood_temperature_humidity_logs REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION dryfood_temperature_humidity_logs_keys_sync();
+CREATE OR REPLACE TRIGGER dryfood_temperature_humidity_logs_keys_truncate AFTER TRUNCATE ON dryfood_temperature_humidity_logs FOR EACH STATEMENT EXECUTE FUNCTION dryfood_temperature_humidity_logs_keys_sync();
+CREATE INDEX IF NOT EXISTS dryfood_temperature_humidity_logs_batch_id_timestamp_idx ON dryfood_temperature_humidity_logs (batch_id, "timestamp");
+CREATE INDEX IF NOT EXISTS dryfood_temperature_humidity_logs_timestamp_brin ON dryfood_temperature_humidity_logs USING brin ("timestamp") WITH (pages_per_range = 32);
+
+CREATE TABLE IF NOT EXISTS dryfood_waste_impact_analysis (
+    impact_id TEXT NOT NULL,
+    batch_id TEXT NOT NULL,
+    analysis_date TIMESTAMP,
+    fresh_weight_kg DOUBLE PRECISION,
+    potential_food_waste_kg DOUBLE PRECISION,
+    waste_prevented_kg DOUBLE PRECISION,
+    waste_reduction_percentage DOUBLE PRECISION,
+    landfill_co2_prevented_kg DOUBLE PRECISION,
+    dehydration_co2_kg DOUBLE PRECISION,
+    net_co2_impact_kg DOUBLE PRECISION,
+    carbon_positive BOOLEAN,
+    economic_value_saved_usd DOUBLE PRECISION,
+    value_added_through_processing_usd DOUBLE PRECISION,
+    total_value_created_usd DOUBLE PRECISION,
+    shelf_life_extension_factor DOUBLE PRECISION,
+    storage_efficiency_improvement TEXT DEFAULT 'Requires 80% less storage space',
+    transportation_efficiency TEXT DEFAULT '60% lighter - reduced transport emissions',
+    PRIMARY KEY (impact_id),
+    FOREIGN KEY (batch_id) REFERENCES dryfood_dehydration_batches (batch_id)
+);
+CREATE INDEX IF NOT EXISTS dryfood_waste_impact_analysis_batch_id_idx ON dryfood_waste_impact_analysis (batch_id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS dryfood_kpi_summary AS
+SELECT (SELECT count(*) FROM dryfood_dehydration_batches) AS total_batches,
+       count(*) AS completed_batches,
+       round(sum(fresh_weight_kg)::numeric, 2) AS total_fresh_weight_kg,
+       round(sum(dried_weight_kg)::numeric, 2) AS total_dried_weight_kg,
+       round((100 * (sum(fresh_weight_kg) - sum(dried_weight_kg)) / nullif(sum(fresh_weight_kg), 0))::numeric, 1)
+           AS avg_weight_loss_percent,
+       round(sum(waste_prevented_kg)::numeric, 2) AS total_waste_prevented_kg,
+       round(sum(value_added_usd)::numeric, 2) AS total_value_added_usd,
+       round(sum(co2_emissions_kg)::numeric, 2) AS dehydration_co2_emissions_kg,
+       (SELECT round(sum(landfill_co2_prevented_kg)::numeric, 2) FROM dryfood_waste_impact_analysis)
+           AS landfill_co2_prevented_kg,
+       round(avg(shelf_life_extension_days)) AS avg_shelf_life_extension_days,
+       (SELECT count(DISTINCT food_category) FROM dryfood_dehydration_batches) AS food_categories_processed
+FROM dryfood_dehydration_batches
+WHERE status = 'completed';
+CREATE OR REPLACE FUNCTION refresh_zero_dryfood_kpis() RETURNS void LANGUAGE sql AS $$
+    REFRESH MATERIALIZED VIEW dryfood_kpi_summary;
+$$;
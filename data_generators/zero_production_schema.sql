@@ -0,0 +1,136 @@
+-- Zero@Production schema, written by supabase_setup/schema_ddl.py; do not edit by hand.
+-- Monthly partitions run 3 months past 2026-10; rerun to add more.
+
+CREATE TABLE IF NOT EXISTS production_orders (
+    order_id TEXT NOT NULL,
+    order_date TIMESTAMP,
+    customer_id TEXT,
+    customer_name TEXT,
+    garment_type TEXT,
+    fabric_type TEXT,
+    quantity BIGINT,
+    weight_kg DOUBLE PRECISION,
+    supplier_id TEXT,
+    supplier_name TEXT,
+    status TEXT,
+    current_stage BIGINT,
+    current_stage_name TEXT,
+    progress_percentage DOUBLE PRECISION,
+    estimated_completion TIMESTAMP,
+    total_co2_kg DOUBLE PRECISION,
+    water_usage_liters DOUBLE PRECISION,
+    energy_usage_kwh DOUBLE PRECISION,
+    energy_co2_kg DOUBLE PRECISION,
+    total_cost_usd DOUBLE PRECISION,
+    quality_score DOUBLE PRECISION,
+    sustainability_score DOUBLE PRECISION,
+    uncertainty TEXT,
+    PRIMARY KEY (order_id)
+);
+CREATE INDEX IF NOT EXISTS production_orders_order_date_idx ON production_orders (order_date);
+CREATE INDEX IF NOT EXISTS production_orders_status_order_date_idx ON production_orders (status, order_date);
+
+CREATE TABLE IF NOT EXISTS production_stage_tracking (
+    tracking_id TEXT NOT NULL,
+    order_id TEXT NOT NULL,
+    stage_id BIGINT,
+    stage_name TEXT,
+    stage_status TEXT,
+    start_time TIMESTAMP NOT NULL,
+    end_time TIMESTAMP,
+    duration_hours DOUBLE PRECISION,
+    co2_emissions_kg DOUBLE PRECISION,
+    energy_kwh DOUBLE PRECISION,
+    water_liters DOUBLE PRECISION,
+    defect_rate DOUBLE PRECISION,
+    operator TEXT,
+    notes TEXT,
+    PRIMARY KEY (tracking_id, start_time),
+    FOREIGN KEY (order_id) REFERENCES production_orders (order_id)
+) PARTITION BY RANGE (start_time);
+CREATE TABLE IF NOT EXISTS production_stage_tracking_2026_07 PARTITION OF production_stage_tracking FOR VALUES FROM ('2026-07-01') TO ('2026-08-01');
+CREATE TABLE IF NOT EXISTS production_stage_tracking_2026_08 PARTITION OF production_stage_tracking FOR VALUES FROM ('2026-08-01') TO ('2026-09-01');
+CREATE TABLE IF NOT EXISTS production_stage_tracking_2026_09 PARTITION OF production_stage_tracking FOR VALUES FROM ('2026-09-01') TO ('2026-10-01');
+CREATE TABLE IF NOT EXISTS production_stage_tracking_2026_10 PARTITION OF production_stage_tracking FOR VALUES FROM ('2026-10-01') TO ('2026-11-01');
+CREATE TABLE IF NOT EXISTS production_stage_tracking_2026_11 PARTITION OF production_stage_tracking FOR VALUES FROM ('2026-11-01') TO ('2026-12-01');
+CREATE TABLE IF NOT EXISTS production_stage_tracking_2026_12 PARTITION OF production_stage_tracking FOR VALUES FROM ('2026-12-01') TO ('2027-01-01');
+CREATE TABLE IF NOT EXISTS production_stage_tracking_2027_01 PARTITION OF production_stage_tracking FOR VALUES FROM ('2027-01-01') TO ('2027-02-01');
+CREATE TABLE IF NOT EXISTS production_stage_tracking_default PARTITION OF production_stage_tracking DEFAULT;
+CREATE TABLE IF NOT EXISTS production_stage_tracking_keys (
+    tracking_id TEXT PRIMARY KEY
+);
+CREATE OR REPLACE FUNCTION production_stage_tracking_keys_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        DELETE FROM production_stage_tracking_keys k USING old_rows o WHERE k.tracking_id = o.tracking_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO production_stage_tracking_keys (tracking_id) SELECT tracking_id FROM new_rows;
+    ELSIF TG_OP = 'TRUNCATE' THEN
+        TRUNCATE production_stage_tracking_keys;
+    END IF;
+    RETURN NULL;
+END $$;
+CREATE OR REPLACE TRIGGER production_stage_tracking_keys_insert AFTER INSERT ON production_stage_tracking REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION production_stage_tracking_keys_sync();
+CREATE OR REPLACE TRIGGER production_stage_tracking_keys_update AFTER UPDATE ON production_stage_tracking REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION production_stage_tracking_keys_sync();
+CREATE OR REPLACE TRIGGER production_stage_tracking_keys_delete AFTER DELETE ON production_stage_tracking REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION production_stage_tracking_keys_sync();
+CREATE OR REPLACE TRIGGER production_stage_tracking_keys_truncate AFTER TRUNCATE ON production_stage_tracking FOR EACH STATEMENT EXECUTE FUNCTION production_stage_tracking_keys_sync();
+CREATE INDEX IF NOT EXISTS production_stage_tracking_order_id_idx ON production_stage_tracking (order_id);
+
+CREATE TABLE IF NOT EXISTS production_dpp (
+    dpp_id TEXT NOT NULL,
+    order_id TEXT NOT NULL,
+    product_type TEXT,
+    fabric_type TEXT,
+    manufacturing_date TIMESTAMP,
+    completion_date TIMESTAMP,
+    total_co2_kg DOUBLE PRECISION,
+    water_liters DOUBLE PRECISION,
+    energy_kwh DOUBLE PRECISION,
+    uncertainty TEXT,
+    materials TEXT,
+    certifications TEXT,
+    supplier_info TEXT,
+    recycling_info TEXT DEFAULT '100% recyclable. Return to authorized collection points.',
+    care_instructions TEXT DEFAULT 'Machine wash cold. Tumble dry low. Do not bleach.',
+    qr_code TEXT,
+    blockchain_hash TEXT,
+    PRIMARY KEY (dpp_id),
+    FOREIGN KEY (order_id) REFERENCES production_orders (order_id)
+);
+CREATE INDEX IF NOT EXISTS production_dpp_order_id_idx ON production_dpp (order_id);
+
+CREATE TABLE IF NOT EXISTS production_quality_checks (
+    check_id TEXT NOT NULL,
+    order_id TEXT NOT NULL,
+    stage_id BIGINT,
+    stage_name TEXT,
+    check_date TIMESTAMP,
+    inspector TEXT,
+    result TEXT,
+    defects_found BIGINT,
+    defect_types TEXT,
+    corrective_action TEXT,
+    notes TEXT,
+    PRIMARY KEY (check_id),
+    FOREIGN KEY (order_id) REFERENCES production_orders (order_id)
+);
+CREATE INDEX IF NOT EXISTS production_quality_checks_order_id_idx ON production_quality_checks (order_id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS production_kpi_summary AS
+SELECT (SELECT count(*) FROM production_orders) AS total_orders,
+       count(*) AS completed_orders,
+       (SELECT count(*) FROM production_orders WHERE status = 'in_progress') AS in_progress_orders,
+       coalesce(sum(quantity), 0) AS total_garments_produced,
+       round(coalesce(sum(total_co2_kg), 0)::numeric, 2) AS total_co2_emissions_kg,
+       round(coalesce(sum(water_usage_liters), 0)::numeric, 2) AS total_water_usage_liters,
+       round(coalesce(sum(total_co2_kg) / nullif(sum(quantity), 0), 0)::numeric, 3) AS avg_co2_per_garment,
+       round(coalesce(sum(water_usage_liters) / nullif(sum(quantity), 0), 0)::numeric, 2) AS avg_water_per_garment,
+       (SELECT count(*) FROM production_dpp) AS dpp_records_issued,
+       (SELECT round(100.0 * count(*) FILTER (WHERE result = 'pass') / nullif(count(*), 0), 1)
+        FROM production_quality_checks) AS quality_pass_rate
+FROM production_orders
+WHERE status = 'completed';
+CREATE OR REPLACE FUNCTION refresh_zero_production_kpis() RETURNS void LANGUAGE sql AS $$
+    REFRESH MATERIALIZED VIEW production_kpi_summary;
+$$;
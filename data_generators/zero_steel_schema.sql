@@ -0,0 +1,164 @@
+-- Zero@Steel schema, written by supabase_setup/schema_ddl.py; do not edit by hand.
+-- Monthly partitions run 3 months past 2026-10; rerun to add more.
+
+CREATE TABLE IF NOT EXISTS steel_furnaces (
+    furnace_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    furnace_type TEXT NOT NULL,
+    capacity_tons DOUBLE PRECISION NOT NULL
+);
+INSERT INTO steel_furnaces (furnace_id, name, furnace_type, capacity_tons) VALUES
+    ('FNC-001', 'Blast Furnace Alpha', 'blast', 2500),
+    ('FNC-002', 'Blast Furnace Beta', 'blast', 2500),
+    ('FNC-003', 'Electric Arc Gamma', 'electric', 150),
+    ('FNC-004', 'Electric Arc Delta', 'electric', 150)
+ON CONFLICT (furnace_id) DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS steel_furnace_metrics (
+    furnace_id TEXT NOT NULL,
+    "timestamp" TIMESTAMP NOT NULL,
+    temperature DOUBLE PRECISION,
+    current_load_tons DOUBLE PRECISION,
+    capacity_utilization DOUBLE PRECISION,
+    co2_emissions_kg DOUBLE PRECISION,
+    energy_consumption_mwh DOUBLE PRECISION,
+    power_mw DOUBLE PRECISION,
+    status TEXT,
+    FOREIGN KEY (furnace_id) REFERENCES steel_furnaces (furnace_id)
+) PARTITION BY RANGE ("timestamp");
+CREATE TABLE IF NOT EXISTS steel_furnace_metrics_2026_09 PARTITION OF steel_furnace_metrics FOR VALUES FROM ('2026-09-01') TO ('2026-10-01');
+CREATE TABLE IF NOT EXISTS steel_furnace_metrics_2026_10 PARTITION OF steel_furnace_metrics FOR VALUES FROM ('2026-10-01') TO ('2026-11-01');
+CREATE TABLE IF NOT EXISTS steel_furnace_metrics_2026_11 PARTITION OF steel_furnace_metrics FOR VALUES FROM ('2026-11-01') TO ('2026-12-01');
+CREATE TABLE IF NOT EXISTS steel_furnace_metrics_2026_12 PARTITION OF steel_furnace_metrics FOR VALUES FROM ('2026-12-01') TO ('2027-01-01');
+CREATE TABLE IF NOT EXISTS steel_furnace_metrics_2027_01 PARTITION OF steel_furnace_metrics FOR VALUES FROM ('2027-01-01') TO ('2027-02-01');
+CREATE TABLE IF NOT EXISTS steel_furnace_metrics_default PARTITION OF steel_furnace_metrics DEFAULT;
+CREATE INDEX IF NOT EXISTS steel_furnace_metrics_furnace_id_timestamp_idx ON steel_furnace_metrics (furnace_id, "timestamp");
+CREATE INDEX IF NOT EXISTS steel_furnace_metrics_timestamp_idx ON steel_furnace_metrics ("timestamp");
+
+CREATE TABLE IF NOT EXISTS steel_production_batches (
+    batch_id TEXT NOT NULL,
+    furnace_id TEXT NOT NULL,
+    steel_grade TEXT,
+    start_time TIMESTAMP NOT NULL,
+    end_time TIMESTAMP,
+    tonnage DOUBLE PRECISION,
+    target_tonnage DOUBLE PRECISION,
+    yield_percentage DOUBLE PRECISION,
+    energy_used_mwh DOUBLE PRECISION,
+    co2_emitted_kg DOUBLE PRECISION,
+    quality_grade TEXT,
+    notes TEXT,
+    PRIMARY KEY (batch_id, start_time),
+    FOREIGN KEY (furnace_id) REFERENCES steel_furnaces (furnace_id)
+) PARTITION BY RANGE (start_time);
+CREATE TABLE IF NOT EXISTS steel_production_batches_2026_09 PARTITION OF steel_production_batches FOR VALUES FROM ('2026-09-01') TO ('2026-10-01');
+CREATE TABLE IF NOT EXISTS steel_production_batches_2026_10 PARTITION OF steel_production_batches FOR VALUES FROM ('2026-10-01') TO ('2026-11-01');
+CREATE TABLE IF NOT EXISTS steel_production_batches_2026_11 PARTITION OF steel_production_batches FOR VALUES FROM ('2026-11-01') TO ('2026-12-01');
+CREATE TABLE IF NOT EXISTS steel_production_batches_2026_12 PARTITION OF steel_production_batches FOR VALUES FROM ('2026-12-01') TO ('2027-01-01');
+CREATE TABLE IF NOT EXISTS steel_production_batches_2027_01 PARTITION OF steel_production_batches FOR VALUES FROM ('2027-01-01') TO ('2027-02-01');
+CREATE TABLE IF NOT EXISTS steel_production_batches_default PARTITION OF steel_production_batches DEFAULT;
+CREATE TABLE IF NOT EXISTS steel_production_batches_keys (
+    batch_id TEXT PRIMARY KEY
+);
+CREATE OR REPLACE FUNCTION steel_production_batches_keys_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        DELETE FROM steel_production_batches_keys k USING old_rows o WHERE k.batch_id = o.batch_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO steel_production_batches_keys (batch_id) SELECT batch_id FROM new_rows;
+    ELSIF TG_OP = 'TRUNCATE' THEN
+        TRUNCATE steel_production_batches_keys;
+    END IF;
+    RETURN NULL;
+END $$;
+CREATE OR REPLACE TRIGGER steel_production_batches_keys_insert AFTER INSERT ON steel_production_batches REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION steel_production_batches_keys_sync();
+CREATE OR REPLACE TRIGGER steel_production_batches_keys_update AFTER UPDATE ON steel_production_batches REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION steel_production_batches_keys_sync();
+CREATE OR REPLACE TRIGGER steel_production_batches_keys_delete AFTER DELETE ON steel_production_batches REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION steel_production_batches_keys_sync();
+CREATE OR REPLACE TRIGGER steel_production_batches_keys_truncate AFTER TRUNCATE ON steel_production_batches FOR EACH STATEMENT EXECUTE FUNCTION steel_production_batches_keys_sync();
+CREATE INDEX IF NOT EXISTS steel_production_batches_furnace_id_start_time_idx ON steel_production_batches (furnace_id, start_time);
+
+CREATE TABLE IF NOT EXISTS steel_alerts (
+    alert_id TEXT NOT NULL,
+    furnace_id TEXT NOT NULL,
+    alert_type TEXT,
+    severity TEXT,
+    message TEXT,
+    "timestamp" TIMESTAMP NOT NULL,
+    resolved BOOLEAN,
+    resolved_at TIMESTAMP,
+    resolved_by TEXT,
+    PRIMARY KEY (alert_id, "timestamp"),
+    FOREIGN KEY (furnace_id) REFERENCES steel_furnaces (furnace_id)
+) PARTITION BY RANGE ("timestamp");
+CREATE TABLE IF NOT EXISTS steel_alerts_2026_09 PARTITION OF steel_alerts FOR VALUES FROM ('2026-09-01') TO ('2026-10-01');
+CREATE TABLE IF NOT EXISTS steel_alerts_2026_10 PARTITION OF steel_alerts FOR VALUES FROM ('2026-10-01') TO ('2026-11-01');
+CREATE TABLE IF NOT EXISTS steel_alerts_2026_11 PARTITION OF steel_alerts FOR VALUES FROM ('2026-11-01') TO ('2026-12-01');
+CREATE TABLE IF NOT EXISTS steel_alerts_2026_12 PARTITION OF steel_alerts FOR VALUES FROM ('2026-12-01') TO ('2027-01-01');
+CREATE TABLE IF NOT EXISTS steel_alerts_2027_01 PARTITION OF steel_alerts FOR VALUES FROM ('2027-01-01') TO ('2027-02-01');
+CREATE TABLE IF NOT EXISTS steel_alerts_default PARTITION OF steel_alerts DEFAULT;
+CREATE TABLE IF NOT EXISTS steel_alerts_keys (
+    alert_id TEXT PRIMARY KEY
+);
+CREATE OR REPLACE FUNCTION steel_alerts_keys_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        DELETE FROM steel_alerts_keys k USING old_rows o WHERE k.alert_id = o.alert_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO steel_alerts_keys (alert_id) SELECT alert_id FROM new_rows;
+    ELSIF TG_OP = 'TRUNCATE' THEN
+        TRUNCATE steel_alerts_keys;
+    END IF;
+    RETURN NULL;
+END $$;
+CREATE OR REPLACE TRIGGER steel_alerts_keys_insert AFTER INSERT ON steel_alerts REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION steel_alerts_keys_sync();
+CREATE OR REPLACE TRIGGER steel_alerts_keys_update AFTER UPDATE ON steel_alerts REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION steel_alerts_keys_sync();
+CREATE OR REPLACE TRIGGER steel_alerts_keys_delete AFTER DELETE ON steel_alerts REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION steel_alerts_keys_sync();
+CREATE OR REPLACE TRIGGER steel_alerts_keys_truncate AFTER TRUNCATE ON steel_alerts FOR EACH STATEMENT EXECUTE FUNCTION steel_alerts_keys_sync();
+CREATE INDEX IF NOT EXISTS steel_alerts_furnace_id_timestamp_idx ON steel_alerts (furnace_id, "timestamp");
+CREATE INDEX IF NOT EXISTS steel_alerts_timestamp_partial_idx ON steel_alerts ("timestamp") WHERE NOT resolved;
+
+CREATE TABLE IF NOT EXISTS steel_maintenance_records (
+    maintenance_id TEXT NOT NULL,
+    furnace_id TEXT NOT NULL,
+    maintenance_type TEXT,
+    scheduled_date TIMESTAMP,
+    completed_date TIMESTAMP,
+    duration_hours DOUBLE PRECISION,
+    cost_usd DOUBLE PRECISION,
+    technician TEXT,
+    notes TEXT,
+    next_maintenance_due TIMESTAMP,
+    PRIMARY KEY (maintenance_id),
+    FOREIGN KEY (furnace_id) REFERENCES steel_furnaces (furnace_id)
+);
+CREATE INDEX IF NOT EXISTS steel_maintenance_records_furnace_id_scheduled_date_idx ON steel_maintenance_records (furnace_id, scheduled_date);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS steel_kpi_summary AS
+SELECT count(*) AS total_batches,
+       round(sum(tonnage)::numeric, 2) AS total_production_tons,
+       round(sum(co2_emitted_kg)::numeric, 2) AS total_co2_emissions_kg,
+       round(sum(energy_used_mwh)::numeric, 2) AS total_energy_consumption_mwh,
+       round((sum(co2_emitted_kg) / nullif(sum(tonnage), 0))::numeric, 2) AS avg_co2_per_ton,
+       round((sum(energy_used_mwh) / nullif(sum(tonnage), 0))::numeric, 3) AS avg_energy_per_ton,
+       count(DISTINCT furnace_id) AS active_furnaces,
+       min(start_time) AS first_batch,
+       max(start_time) AS last_batch
+FROM steel_production_batches;
+CREATE MATERIALIZED VIEW IF NOT EXISTS steel_furnace_daily AS
+SELECT furnace_id,
+       date_trunc('day', "timestamp") AS day,
+       count(*) AS readings,
+       count(*) FILTER (WHERE status = 'operational') AS operational_readings,
+       round(avg(temperature)::numeric, 1) AS avg_temperature,
+       round(avg(capacity_utilization)::numeric, 1) AS avg_capacity_utilization,
+       round(sum(co2_emissions_kg)::numeric, 2) AS co2_emissions_kg,
+       round(sum(energy_consumption_mwh)::numeric, 3) AS energy_consumption_mwh
+FROM steel_furnace_metrics
+GROUP BY furnace_id, date_trunc('day', "timestamp");
+CREATE UNIQUE INDEX IF NOT EXISTS steel_furnace_daily_key ON steel_furnace_daily (furnace_id, day);
+CREATE OR REPLACE FUNCTION refresh_zero_steel_kpis() RETURNS void LANGUAGE sql AS $$
+    REFRESH MATERIALIZED VIEW steel_kpi_summary;
+    REFRESH MATERIALIZED VIEW CONCURRENTLY steel_furnace_daily;
+$$;
@@ -0,0 +1,65 @@
+"""
+Adaptive Batch Sizing
+AIMD controller that tunes importer batch sizes per table from round-trip time, payload size and errors
+"""
+
+from typing import List
+
+
+class AdaptiveBatchSizer:
+    """Additive-increase / multiplicative-decrease batch size for one table.
+
+    After every request the size grows by ``additive_step`` rows while the
+    request stayed under both the latency and payload targets, and is cut by
+    ``decrease_factor`` when either target was overshot or the request
+    failed. Growth is additionally capped by the payload target divided by
+    the observed bytes per row, so wide rows (DPP records with embedded
+    JSON) settle far lower than narrow metric rows.
+    """
+
+    def __init__(self, table: str, initial_size: int = 100, min_size: int = 10, max_size: int = 5000,
+                 target_latency_seconds: float = 1.0, target_payload_bytes: int = 1_000_000,
+                 additive_step: int = 50, decrease_factor: float = 0.5):
+        self.table = table
+        self.size = max(min_size, min(initial_size, max_size))
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_latency_seconds = target_latency_seconds
+        self.target_payload_bytes = target_payload_bytes
+        self.additive_step = additive_step
+        self.decrease_factor = decrease_factor
+        self.bytes_per_row = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.history: List[int] = []
+
+    def next_size(self) -> int:
+        """Rows to put in the next request"""
+        return self.size
+
+    def record(self, rows: int, payload_bytes: int, seconds: float, ok: bool = True):
+        """Feed back one request's outcome and adjust the size"""
+        self.requests += 1
+        self.history.append(self.size)
+        self.error_rate = 0.8 * self.error_rate + 0.2 * (0.0 if ok else 1.0)
+        if rows and payload_bytes:  # A request that failed before its body was built has no size
+            observed = payload_bytes / rows
+            self.bytes_per_row = observed if self.bytes_per_row is None else 0.8 * self.bytes_per_row + 0.2 * observed
+
+        if not ok:
+            self.errors += 1
+            self.size = int(self.size * self.decrease_factor)
+        elif seconds > self.target_latency_seconds or payload_bytes > self.target_payload_bytes:
+            self.size = int(self.size * self.decrease_factor)
+        elif self.error_rate < 0.1:
+            self.size += self.additive_step
+        # Never plan a payload above target, whatever the latency allowed
+        if self.bytes_per_row:
+            self.size = min(self.size, int(self.target_payload_bytes / self.bytes_per_row))
+        self.size = max(self.min_size, min(self.size, self.max_size))
+
+    def converged_size(self, window: int = 5) -> int:
+        """Average planned size over the most recent requests"""
+        recent = self.history[-window:]
+        return round(sum(recent) / len(recent)) if recent else self.size
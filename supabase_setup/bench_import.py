@@ -0,0 +1,161 @@
+"""
+Importer Benchmark
+Runs batch_insert against a local fake PostgREST endpoint and compares throughput with a stored JSON baseline
+"""
+
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict
+
+import import_data
+from compact_upload import CompactUploader
+from datasets import DEFAULT_DATA_DIR, available_tables, load_table
+from import_metrics import ImportInstrumentation
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_benchmark_baseline.json")
+# Only whole-import keys whose baseline ran this long are gated; single tables
+# and short runs swing past the tolerance between identical runs
+MIN_GATED_SECONDS = 0.5
+
+
+class FakePostgREST(BaseHTTPRequestHandler):
+    """Accepts inserts like PostgREST with Prefer: return=minimal, parsing but discarding the rows"""
+
+    protocol_version = "HTTP/1.1"
+    latency_seconds = 0.0
+    rows_received = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        rows = json.loads(body)
+        with FakePostgREST.lock:
+            FakePostgREST.rows_received += len(rows)
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        self.send_response(201)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_endpoint(latency_ms: float) -> ThreadingHTTPServer:
+    FakePostgREST.latency_seconds = latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakePostgREST)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_import(url: str, data: Dict[str, List[Dict]], compress: bool) -> Dict:
+    """Import every table once through batch_insert; returns the instrumentation report"""
+    metrics = ImportInstrumentation()
+    uploader = CompactUploader(url, "bench", compress=compress)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for table, rows in data.items():
+            import_data.batch_insert(None, table, rows, uploader=uploader, metrics=metrics)
+    return metrics.report()
+
+
+def run(data_dir: str, scales: List[int], latency_ms: float) -> Dict[str, Dict]:
+    # The rate-limit pause would swamp everything being measured here
+    import_data.RATE_LIMIT_SECONDS = 0
+    server = start_fake_endpoint(latency_ms)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    tables = {table: load_table(data_dir, table) for table in available_tables(data_dir)}
+
+    results: Dict[str, Dict] = {}
+    try:
+        for scale in scales:
+            data = {table: rows * scale for table, rows in tables.items()}
+            for mode, compress in (("json", False), ("gzip", True)):
+                report = run_import(url, data, compress)
+                results[f"import.{mode}@{scale}x"] = {
+                    "seconds": report["total_seconds"],
+                    "records": report["rows_inserted"],
+                    "records_per_second": report["rows_per_second"],
+                }
+                for table, stats in report["tables"].items():
+                    results[f"import.{mode}.{table}@{scale}x"] = {
+                        "seconds": stats["wall_seconds"],
+                        "records": stats["rows_inserted"],
+                        "records_per_second": stats["rows_per_second"],
+                        "p50_ms": stats["latency"]["p50_ms"],
+                        "p99_ms": stats["latency"]["p99_ms"],
+                    }
+                print(f"   ✅ {mode} @ {scale}x: {report['rows_inserted']:,} rows, "
+                      f"{report['rows_per_second']:,.0f} rows/s")
+    finally:
+        server.shutdown()
+    return results
+
+
+def gated(key: str, base: Dict) -> bool:
+    """Whole-import keys (import.<mode>@<scale>x) long enough to time reliably"""
+    return key.count(".") == 1 and base["seconds"] >= MIN_GATED_SECONDS
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """Gated keys whose throughput dropped below the baseline by more than tolerance; the rest are shown only"""
+    regressions = []
+    for key, stats in results.items():
+        base = baseline.get(key)
+        if not base or not base.get("records_per_second") or base["seconds"] < 0.01:
+            continue  # Tables imported in a handful of milliseconds are all noise
+        ratio = (stats["records_per_second"] or 0) / base["records_per_second"]
+        regressed = gated(key, base) and ratio < 1 - tolerance
+        marker = "⚠️ " if regressed else "  " if gated(key, base) else " ·"
+        print(f" {marker} {key:.<60} {base['records_per_second']:>11,.0f} -> "
+              f"{stats['records_per_second'] or 0:>11,.0f} rows/s ({ratio:.2f}x)")
+        if regressed:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    """Benchmark the importer; exits non-zero on regressions against the baseline"""
+    parser = argparse.ArgumentParser(description="Benchmark batch_insert against a local fake endpoint")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10],
+                        help="Times each generated table is replicated")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Simulated server time per request")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3,
+                        help="Allowed throughput drop before a key counts as a regression (0.3 = 30%%)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("⏱️  IMPORTER BENCHMARK (fake PostgREST endpoint)")
+    print("=" * 60)
+    results = run(args.data_dir, args.scales, args.latency_ms)
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\n✅ Baseline written to {args.baseline}")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    print(f"\n📊 Against baseline (· = shown only; gated: whole imports of {MIN_GATED_SECONDS:g}s or more):")
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} key(s) regressed by more than {args.tolerance:.0%}")
+        sys.exit(1)
+    print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Local Query API Load Test
+Measures p50/p99 latency and requests per second of local_api_server
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import List, Dict, Optional
+from urllib.parse import urlsplit
+
+from datasets import DEFAULT_DATA_DIR
+from local_api_server import QueryService, ResponseCache, start_server
+
+# Queries the dashboards issue, plus filtered variants
+DASHBOARD_QUERIES = [
+    "/rest/v1/steel_furnace_metrics?select=*&order=timestamp.desc&limit=10",
+    "/rest/v1/steel_furnace_metrics?furnace_id=eq.{furnace}&order=timestamp.desc&limit=96",
+    "/rest/v1/steel_furnace_metrics?furnace_id=eq.{furnace}&status=eq.operational&order=co2_emissions_kg.desc&limit=20",
+    "/rest/v1/steel_production_batches?furnace_id=eq.{furnace}&order=start_time.desc&limit=25",
+    "/rest/v1/steel_alerts?resolved=eq.false&order=timestamp.desc&limit=20",
+    "/rest/v1/production_orders?select=*&order=order_date.desc&limit=150",
+    "/rest/v1/production_orders?status=eq.in_progress&order=order_date.desc&limit=50",
+    "/rest/v1/dryfood_dehydration_batches?order=start_time.desc&limit=50",
+    "/rest/v1/design_projects?industry=eq.{industry}&order=start_date.desc&limit=20",
+]
+FURNACE_IDS = ["FNC-001", "FNC-002", "FNC-003", "FNC-004"]
+INDUSTRIES = ["Textile", "Industrial", "Product", "Packaging"]
+
+
+def random_target() -> str:
+    return random.choice(DASHBOARD_QUERIES).format(
+        furnace=random.choice(FURNACE_IDS), industry=random.choice(INDUSTRIES)
+    )
+
+
+async def client(host: str, port: int, num_requests: int, latencies: List[float], cache_hits: List[int]):
+    """One keep-alive connection issuing requests back to back"""
+    reader, writer = await asyncio.open_connection(host, port)
+    for _ in range(num_requests):
+        started = time.perf_counter()
+        writer.write(f"GET {random_target()} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+        await writer.drain()
+        await reader.readline()  # Status line
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+            elif name.lower() == "x-cache" and value.strip() == "HIT":
+                cache_hits.append(1)
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - started)
+    writer.close()
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    idx = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+async def run_load(host: str, port: int, total_requests: int, concurrency: int) -> Dict:
+    latencies: List[float] = []
+    cache_hits: List[int] = []
+    per_client = max(1, total_requests // concurrency)
+    started = time.perf_counter()
+    await asyncio.gather(*(client(host, port, per_client, latencies, cache_hits) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "cache_hit_percentage": round(len(cache_hits) / len(latencies) * 100, 1),
+    }
+
+
+async def benchmark(url: Optional[str], data_dir: str, total_requests: int, concurrency: int) -> Dict[str, Dict]:
+    if url:
+        parts = urlsplit(url)
+        return {"remote": await run_load(parts.hostname, parts.port or 80, total_requests, concurrency)}
+
+    results = {}
+    for label, cache in (("uncached", ResponseCache(0)), ("cached", ResponseCache(1024, 30.0))):
+        server = await start_server(QueryService(data_dir, cache), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            results[label] = await run_load("127.0.0.1", port, total_requests, concurrency)
+    return results
+
+
+def main():
+    """Run the load test"""
+    parser = argparse.ArgumentParser(description="Load-test the local query API")
+    parser.add_argument("--url", help="Benchmark an already running server instead of an in-process one")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    print(f"⏱️  Load testing with {args.requests:,} requests over {args.concurrency} connections...")
+    results = asyncio.run(benchmark(args.url, args.data_dir, args.requests, args.concurrency))
+
+    print("\n" + "=" * 60)
+    print("📈 LOAD TEST RESULTS")
+    print("=" * 60)
+    for label, stats in results.items():
+        print(f"{label}:")
+        for key, value in stats.items():
+            print(f"   {key:.<37} {value}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Schema Layout Benchmark
+EXPLAIN ANALYZE of the dashboard queries on a local Postgres: plain tables against the partitioned, tuned schema
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import time
+from collections import Counter
+from datetime import date, timedelta
+from typing import Iterator, List, Dict, Tuple
+
+from datasets import DEFAULT_DATA_DIR, add_generator_path
+
+add_generator_path()
+
+from partitioned_output import partition_date
+from pg_copy_loader import DEFAULT_DSN, load_all, table_columns
+from schema_ddl import KPI_VIEWS, LAYOUTS, MODULES, add_months, ident, module_sql, sample_records
+
+SCHEMAS = {layout: f"zero_bench_{layout}" for layout in LAYOUTS}
+WINDOW_DAYS = 30  # The generators' metrics window
+HISTORY_WINDOWS = 12
+REPEATS = 5
+
+# bench_local_api's DASHBOARD_QUERIES as SQL, plus the time-range scan
+# partition pruning is for. {since} is the day before the newest metric.
+QUERIES = {
+    "metrics_latest": 'SELECT * FROM steel_furnace_metrics ORDER BY "timestamp" DESC LIMIT 10',
+    "metrics_furnace": "SELECT * FROM steel_furnace_metrics WHERE furnace_id = 'FNC-001' "
+                       'ORDER BY "timestamp" DESC LIMIT 96',
+    "metrics_last_day": "SELECT furnace_id, avg(temperature), sum(co2_emissions_kg) FROM steel_furnace_metrics "
+                        "WHERE \"timestamp\" >= '{since}' GROUP BY furnace_id",
+    "batches_furnace": "SELECT * FROM steel_production_batches WHERE furnace_id = 'FNC-001' "
+                       "ORDER BY start_time DESC LIMIT 25",
+    "alerts_open": 'SELECT * FROM steel_alerts WHERE NOT resolved ORDER BY "timestamp" DESC LIMIT 20',
+    "orders_latest": "SELECT * FROM production_orders ORDER BY order_date DESC LIMIT 150",
+    "orders_in_progress": "SELECT * FROM production_orders WHERE status = 'in_progress' "
+                          "ORDER BY order_date DESC LIMIT 50",
+    "dehydration_latest": "SELECT * FROM dryfood_dehydration_batches ORDER BY start_time DESC LIMIT 50",
+    "projects_industry": "SELECT * FROM design_projects WHERE industry = 'Textile' ORDER BY start_date DESC LIMIT 20",
+}
+
+
+def layout_queries(layout: str, since: str) -> Dict[str, str]:
+    """Summary cards read the materialized views in the tuned layout and aggregate the tables in the flat one"""
+    queries = {name: sql.format(since=since) for name, sql in QUERIES.items()}
+    for module in MODULES:
+        for view, _, query in KPI_VIEWS.get(module, []):
+            queries[f"kpi.{view}"] = f"SELECT * FROM {view}" if layout == "tuned" else query.strip()
+    return queries
+
+
+def extend_history(conn, windows: int):
+    """Copy the metrics window further and further back, oldest first, so the time column stays in row order"""
+    columns = table_columns(conn, "steel_furnace_metrics")
+    select = ", ".join(f'"timestamp" - make_interval(days => {WINDOW_DAYS} * k)' if c == "timestamp" else ident(c)
+                       for c in columns)
+    conn.execute(
+        f"INSERT INTO steel_furnace_metrics ({', '.join(ident(c) for c in columns)}) "
+        f"SELECT {select} FROM steel_furnace_metrics, generate_series({windows}, 1, -1) AS k "
+        f'ORDER BY k DESC, "timestamp"'
+    )
+
+
+def prepare(psycopg, dsn: str, layout: str, records: Dict[str, List[Dict]], data_dir: str, first_month: date,
+            history_windows: int, workers: int) -> Dict:
+    """Create the layout in its own schema, COPY the data in and grow the metrics history"""
+    schema = SCHEMAS[layout]
+    started = time.perf_counter()
+    with psycopg.connect(dsn, autocommit=True) as conn:
+        conn.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        conn.execute(f"CREATE SCHEMA {schema}")
+        conn.execute(f"SET search_path TO {schema}")
+        for module in MODULES:
+            conn.execute(module_sql(module, records, layout, first_month=first_month))
+
+    scoped = psycopg.conninfo.make_conninfo(dsn, options=f"-c search_path={schema}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        load_all(scoped, data_dir, workers, create=False, truncate=False)
+    loaded = time.perf_counter()
+
+    with psycopg.connect(scoped, autocommit=True) as conn:
+        if history_windows:
+            extend_history(conn, history_windows)
+        if layout == "tuned":
+            for module in MODULES:
+                if module in KPI_VIEWS:
+                    conn.execute(f"SELECT refresh_zero_{module}_kpis()")
+        conn.execute("ANALYZE steel_furnace_metrics")
+        metrics_rows = conn.execute("SELECT count(*) FROM steel_furnace_metrics").fetchone()[0]
+    return {
+        "load_seconds": round(loaded - started, 3),
+        "history_seconds": round(time.perf_counter() - loaded, 3),
+        "metrics_rows": metrics_rows,
+    }
+
+
+def plan_nodes(node: Dict) -> Iterator[Dict]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(conn, sql: str, repeats: int) -> Dict:
+    """Best of repeats EXPLAIN ANALYZE runs, with the scans and buffers of that run"""
+    best = None
+    for _ in range(repeats):
+        result = conn.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}").fetchone()[0]
+        plan = (json.loads(result) if isinstance(result, str) else result)[0]
+        if best is None or plan["Execution Time"] < best["Execution Time"]:
+            best = plan
+    scans = [node for node in plan_nodes(best["Plan"]) if "Relation Name" in node]
+    kinds = Counter(node["Node Type"] for node in scans)
+    return {
+        "execution_ms": round(best["Execution Time"], 3),
+        "planning_ms": round(best["Planning Time"], 3),
+        "shared_blocks": best["Plan"].get("Shared Hit Blocks", 0) + best["Plan"].get("Shared Read Blocks", 0),
+        "relations_scanned": len({node["Relation Name"] for node in scans}),
+        "scans": ", ".join(f"{count}× {kind}" for kind, count in sorted(kinds.items())),
+    }
+
+
+def query_window(records: Dict[str, List[Dict]], history_windows: int) -> Tuple[str, date]:
+    """The {since} day of the queries, and the first monthly partition the grown history needs"""
+    newest = date.fromisoformat(max(partition_date(row["timestamp"]) for row in records["steel_furnace_metrics"]))
+    return (newest - timedelta(days=1)).isoformat(), add_months(newest, -(history_windows * WINDOW_DAYS // 30 + 2))
+
+
+def run(dsn: str, data_dir: str, history_windows: int, repeats: int, workers: int) -> Dict:
+    try:
+        import psycopg
+        import psycopg.conninfo
+    except ImportError:
+        raise SystemExit("❌ The schema benchmark needs psycopg 3: pip install 'psycopg[binary,pool]'")
+
+    records = sample_records(data_dir)
+    since, first_month = query_window(records, history_windows)
+
+    results: Dict[str, Dict] = {"layouts": {}, "queries": {}}
+    for layout in LAYOUTS:
+        stats = prepare(psycopg, dsn, layout, records, data_dir, first_month, history_windows, workers)
+        results["layouts"][layout] = stats
+        print(f"   ✅ {layout}: loaded in {stats['load_seconds']:.2f}s, "
+              f"{stats['metrics_rows']:,} metric rows")
+
+        scoped = psycopg.conninfo.make_conninfo(dsn, options=f"-c search_path={SCHEMAS[layout]}")
+        with psycopg.connect(scoped, autocommit=True) as conn:
+            for name, sql in layout_queries(layout, since).items():
+                results["queries"].setdefault(name, {})[layout] = explain(conn, sql, repeats)
+    return results
+
+
+def main():
+    """Compare dashboard query plans and timings of the flat and tuned layouts"""
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE the dashboard queries on both schema layouts")
+    parser.add_argument("--dsn", default=DEFAULT_DSN, help="Connection string (default: $DATABASE_URL)")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="Generated data with ISO timestamps")
+    parser.add_argument("--history-windows", type=int, default=HISTORY_WINDOWS,
+                        help=f"Copies of the {WINDOW_DAYS}-day metrics window to add further back")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="EXPLAIN ANALYZE runs per query; best is kept")
+    parser.add_argument("--workers", type=int, default=4, help="Tables loaded in parallel")
+    parser.add_argument("--report", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🐘 SCHEMA LAYOUT BENCHMARK")
+    print("=" * 60)
+    results = run(args.dsn, args.data_dir, args.history_windows, args.repeats, args.workers)
+
+    print(f"\n{'query':<34} {'flat ms':>9} {'tuned ms':>9} {'speedup':>8}  tuned plan")
+    for name, layouts in results["queries"].items():
+        flat, tuned = layouts["flat"], layouts["tuned"]
+        speedup = flat["execution_ms"] / tuned["execution_ms"] if tuned["execution_ms"] > 0 else float("inf")
+        print(f"{name:.<34} {flat['execution_ms']:>9.3f} {tuned['execution_ms']:>9.3f} {speedup:>7.1f}x  "
+              f"{tuned['scans']} over {tuned['relations_scanned']} relation(s)")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ {args.report}")
+
+
+if __name__ == "__main__":
+    main()
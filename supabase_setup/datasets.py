@@ -0,0 +1,220 @@
+"""
+Generated Dataset Registry
+Maps every Zero@Ecosystem table to the JSON file the generators write for it
+"""
+
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Dict, Optional
+
+GENERATOR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data_generators")
+DEFAULT_DATA_DIR = os.path.join(GENERATOR_DIR, "generated_data")
+MANIFEST_FILE = "manifest.json"  # Written by the generators' --partitioned layout
+STREAM_CHUNK_CHARS = 1 << 16
+WHITESPACE = re.compile(r"\s*")
+BETWEEN_RECORDS = re.compile(r"[\s,]*")
+
+# Parent tables come before the tables that reference them. "indexes" are the
+# column sets dashboards filter and join on; "foreign_keys" are
+# (column, parent table, parent column). "timestamps" are the columns the
+# generators hold as epoch seconds and format on output.
+TABLES = [
+    {"table": "steel_furnace_metrics", "file": "steel_furnace_metrics.json", "module": "steel",
+     "timestamps": ["timestamp"],
+     "primary_key": None, "indexes": [("furnace_id", "timestamp"), ("timestamp",)],
+     "foreign_keys": [("furnace_id", "steel_furnaces", "furnace_id")]},
+    {"table": "steel_production_batches", "file": "steel_production_batches.json", "module": "steel",
+     "timestamps": ["start_time", "end_time"],
+     "primary_key": "batch_id", "indexes": [("furnace_id", "start_time")],
+     "foreign_keys": [("furnace_id", "steel_furnaces", "furnace_id")]},
+    {"table": "steel_alerts", "file": "steel_alerts.json", "module": "steel",
+     "timestamps": ["timestamp", "resolved_at"],
+     "primary_key": "alert_id", "indexes": [("furnace_id", "timestamp")],
+     "foreign_keys": [("furnace_id", "steel_furnaces", "furnace_id")]},
+    {"table": "steel_maintenance_records", "file": "steel_maintenance.json", "module": "steel",
+     "timestamps": ["scheduled_date", "completed_date", "next_maintenance_due"],
+     "primary_key": "maintenance_id", "indexes": [("furnace_id", "scheduled_date")],
+     "foreign_keys": [("furnace_id", "steel_furnaces", "furnace_id")]},
+    {"table": "production_orders", "file": "production_orders.json", "module": "production",
+     "timestamps": ["order_date", "estimated_completion"],
+     "primary_key": "order_id", "indexes": [("order_date",), ("status", "order_date")], "foreign_keys": []},
+    {"table": "production_stage_tracking", "file": "production_stage_tracking.json", "module": "production",
+     "timestamps": ["start_time", "end_time"],
+     "primary_key": "tracking_id", "indexes": [("order_id",)],
+     "foreign_keys": [("order_id", "production_orders", "order_id")]},
+    {"table": "production_dpp", "file": "production_dpp.json", "module": "production",
+     "timestamps": ["manufacturing_date", "completion_date"],
+     "primary_key": "dpp_id", "indexes": [("order_id",)],
+     "foreign_keys": [("order_id", "production_orders", "order_id")]},
+    {"table": "production_quality_checks", "file": "production_quality.json", "module": "production",
+     "timestamps": ["check_date"],
+     "primary_key": "check_id", "indexes": [("order_id",)],
+     "foreign_keys": [("order_id", "production_orders", "order_id")]},
+    {"table": "dryfood_dehydration_batches", "file": "dryfood_batches.json", "module": "dryfood",
+     "timestamps": ["start_time", "end_time"],
+     "primary_key": "batch_id", "indexes": [("start_time",)], "foreign_keys": []},
+    {"table": "dryfood_temperature_humidity_logs", "file": "dryfood_logs.json", "module": "dryfood",
+     "timestamps": ["timestamp"],
+     "primary_key": "log_id", "indexes": [("batch_id", "timestamp")],
+     "foreign_keys": [("batch_id", "dryfood_dehydration_batches", "batch_id")]},
+    {"table": "dryfood_waste_impact_analysis", "file": "dryfood_waste_impact.json", "module": "dryfood",
+     "timestamps": ["analysis_date"],
+     "primary_key": "impact_id", "indexes": [("batch_id",)],
+     "foreign_keys": [("batch_id", "dryfood_dehydration_batches", "batch_id")]},
+    {"table": "design_projects", "file": "design_projects.json", "module": "design",
+     "timestamps": ["start_date", "target_completion"],
+     "primary_key": "project_id", "indexes": [("industry", "start_date")], "foreign_keys": []},
+    {"table": "design_material_alternatives", "file": "design_material_alternatives.json", "module": "design",
+     "timestamps": [],
+     "primary_key": "alternative_id", "indexes": [("project_id",)],
+     "foreign_keys": [("project_id", "design_projects", "project_id")]},
+    {"table": "design_lifecycle_assessments", "file": "design_lca_reports.json", "module": "design",
+     "timestamps": ["assessment_date"],
+     "primary_key": "lca_id", "indexes": [("project_id",)],
+     "foreign_keys": [("project_id", "design_projects", "project_id")]},
+]
+TABLES_BY_NAME = {t["table"]: t for t in TABLES}
+
+# Rows the SQL schemas seed instead of the generators: parent keys that
+# foreign keys may point at without a generated table behind them.
+REFERENCE_KEYS = {
+    ("steel_furnaces", "furnace_id"): {"FNC-001", "FNC-002", "FNC-003", "FNC-004"},
+}
+
+
+def add_generator_path():
+    """Make the data_generators modules importable from the scripts here"""
+    if GENERATOR_DIR not in sys.path:
+        sys.path.append(GENERATOR_DIR)
+
+
+def iso_timestamps(table: str, rows: List[Dict]) -> List[Dict]:
+    """Turn the epoch seconds of --timestamp-format epoch output into ISO text, in place
+
+    The schemas type these columns TIMESTAMP, which takes ISO text from
+    PostgREST and COPY alike. ISO rows pass through untouched.
+    """
+    add_generator_path()
+    from timestamps import iso
+
+    fields = TABLES_BY_NAME[table]["timestamps"]
+    for row in rows:
+        for field in fields:
+            value = row.get(field)
+            if isinstance(value, int) and not isinstance(value, bool):
+                row[field] = iso(value)
+    return rows
+
+
+def load_waves(tables: List[str]) -> List[List[str]]:
+    """Group tables so every table's parents are in an earlier wave"""
+    remaining = [t for t in TABLES if t["table"] in tables]
+    loaded = set()
+    waves = []
+    while remaining:
+        wave = [t["table"] for t in remaining
+                if all(parent in loaded or parent not in tables for _, parent, _ in t["foreign_keys"])]
+        waves.append(wave)
+        loaded.update(wave)
+        remaining = [t for t in remaining if t["table"] not in loaded]
+    return waves
+
+
+def load_table(data_dir: str, table: str) -> List[Dict]:
+    """Load the generated records for one table"""
+    with open(os.path.join(data_dir, TABLES_BY_NAME[table]["file"])) as f:
+        return json.load(f)
+
+
+def iter_table(data_dir: str, table: str, chunk_chars: int = STREAM_CHUNK_CHARS) -> Iterator[Dict]:
+    """Stream one table's records from its JSON array file, a chunk of text at a time
+
+    Each record is decoded as soon as its closing brace is in the buffer. A
+    decode that fails before the end of the file only means the record runs
+    into the next chunk; records are objects, so none can decode early.
+    """
+    path = os.path.join(data_dir, TABLES_BY_NAME[table]["file"])
+    decoder = json.JSONDecoder()
+    with open(path) as f:
+        buffer, position, eof, opened = "", 0, False, False
+        while True:
+            position = (BETWEEN_RECORDS if opened else WHITESPACE).match(buffer, position).end()
+            if position < len(buffer):
+                if not opened:
+                    if buffer[position] != "[":
+                        raise ValueError(f"{path}: expected a JSON array")
+                    opened, position = True, position + 1
+                    continue
+                if buffer[position] == "]":
+                    return
+                try:
+                    record, position = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    yield record
+                    continue
+            elif eof:
+                raise ValueError(f"{path}: JSON array is not closed")
+            chunk = f.read(chunk_chars)
+            buffer, position, eof = buffer[position:] + chunk, 0, not chunk
+
+
+def available_tables(data_dir: str) -> List[str]:
+    """Tables whose generated file exists in data_dir"""
+    return [t["table"] for t in TABLES if os.path.exists(os.path.join(data_dir, t["file"]))]
+
+
+def load_manifest(data_dir: str) -> Optional[Dict]:
+    """Partition manifest of data_dir, or None if no partitioned layout was written"""
+    path = os.path.join(data_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def select_partitions(manifest: Dict, table: str, entities: Optional[Iterable[str]] = None,
+                      start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict]:
+    """Prune a table's partitions by entity and by an inclusive YYYY-MM-DD date range
+
+    The entity filter only applies to tables partitioned by an entity, and
+    undated partitions are always kept.
+    """
+    entry = manifest["tables"].get(table)
+    if entry is None:
+        return []
+    entities = set(entities) if entities else None
+    selected = []
+    for partition in entry["partitions"]:
+        if entities and entry["entity_field"] and partition["entity"] not in entities:
+            continue
+        date = partition["date"]
+        if date and ((start_date and date < start_date) or (end_date and date > end_date)):
+            continue
+        selected.append(partition)
+    return selected
+
+
+def iter_partition(data_dir: str, partition: Dict) -> Iterator[Dict]:
+    with open(os.path.join(data_dir, partition["path"])) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_partition(data_dir: str, partition: Dict) -> List[Dict]:
+    return list(iter_partition(data_dir, partition))
+
+
+def load_partitions(data_dir: str, partitions: List[Dict], workers: int = 4) -> List[Dict]:
+    """Read the given partitions concurrently, keeping manifest order"""
+    rows: List[Dict] = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for partition_rows in executor.map(lambda p: read_partition(data_dir, p), partitions):
+            rows.extend(partition_rows)
+    return rows
@@ -0,0 +1,202 @@
+"""
+Local Database Export
+Bulk-loads all generated tables into an embedded SQLite or DuckDB file as an offline alternative to Supabase
+"""
+
+import argparse
+import os
+import statistics
+import time
+from typing import Any, List, Dict, Optional, Tuple
+
+from datasets import DEFAULT_DATA_DIR, TABLES, available_tables, load_table
+
+SQL_TYPES = {
+    "sqlite": {bool: "INTEGER", int: "INTEGER", float: "REAL", str: "TEXT"},
+    "duckdb": {bool: "BOOLEAN", int: "BIGINT", float: "DOUBLE", str: "VARCHAR"},
+}
+
+# SQL equivalents of what the dashboards ask for
+DASHBOARD_QUERIES = {
+    "latest_metrics": "SELECT * FROM steel_furnace_metrics ORDER BY timestamp DESC LIMIT 10",
+    "furnace_day": "SELECT * FROM steel_furnace_metrics WHERE furnace_id = 'FNC-001' ORDER BY timestamp DESC LIMIT 96",
+    "furnace_co2_totals": "SELECT furnace_id, SUM(co2_emissions_kg) FROM steel_furnace_metrics GROUP BY furnace_id",
+    "recent_orders": "SELECT * FROM production_orders ORDER BY order_date DESC LIMIT 150",
+    "order_stage_co2": (
+        "SELECT o.order_id, SUM(t.co2_emissions_kg) FROM production_orders o "
+        "JOIN production_stage_tracking t ON t.order_id = o.order_id GROUP BY o.order_id"
+    ),
+    "batch_logs": (
+        "SELECT l.* FROM dryfood_temperature_humidity_logs l "
+        "WHERE l.batch_id = (SELECT batch_id FROM dryfood_temperature_humidity_logs LIMIT 1) ORDER BY l.timestamp"
+    ),
+}
+
+
+def infer_columns(rows: List[Dict], engine: str) -> List[Tuple[str, str]]:
+    """Column names and SQL types from the first non-null value of each column"""
+    types = SQL_TYPES[engine]
+    columns: Dict[str, str] = {}
+    for row in rows:
+        for name, value in row.items():
+            if name not in columns or (columns[name] is None and value is not None):
+                columns[name] = types[type(value)] if value is not None else None
+    return [(name, sql_type or types[str]) for name, sql_type in columns.items()]
+
+
+def to_param(value: Any, engine: str) -> Any:
+    if engine == "sqlite" and isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def connect(engine: str, path: str):
+    if os.path.exists(path):
+        os.remove(path)
+    if engine == "duckdb":
+        try:
+            import duckdb
+        except ImportError:
+            raise SystemExit("❌ DuckDB export needs the duckdb package: pip install duckdb")
+        return duckdb.connect(path)
+
+    import sqlite3
+    conn = sqlite3.connect(path)
+    # Bulk load settings: no journal or fsync while loading a throwaway file
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    return conn
+
+
+def create_table(conn, table: str, columns: List[Tuple[str, str]]):
+    conn.execute(f"DROP TABLE IF EXISTS {table}")
+    conn.execute(f"CREATE TABLE {table} ({', '.join(f'{n} {t}' for n, t in columns)})")
+
+
+def insert_rows(conn, engine: str, table: str, names: List[str], rows: List[Dict]) -> int:
+    """One executemany over the given columns"""
+    placeholders = ", ".join("?" for _ in names)
+    conn.executemany(
+        f"INSERT INTO {table} ({', '.join(names)}) VALUES ({placeholders})",
+        [tuple(to_param(row.get(n), engine) for n in names) for row in rows]
+    )
+    return len(rows)
+
+
+def load_table_rows(conn, engine: str, table: str, rows: List[Dict], source: Optional[str] = None) -> int:
+    """Create the table and bulk load every row
+
+    SQLite gets a single executemany; DuckDB reads the generated JSON file
+    directly with read_json, its COPY-style bulk path.
+    """
+    if not rows:
+        return 0
+    columns = infer_columns(rows, engine)
+    names = [name for name, _ in columns]
+    create_table(conn, table, columns)
+    if engine == "duckdb" and source:
+        spec = ", ".join(f"'{n}': '{t}'" for n, t in columns)
+        path = source.replace("'", "''")
+        conn.execute(
+            f"INSERT INTO {table} SELECT {', '.join(names)} "
+            f"FROM read_json('{path}', format = 'array', columns = {{{spec}}})"
+        )
+        return len(rows)
+    return insert_rows(conn, engine, table, names, rows)
+
+
+def create_indexes(conn, table_def: Dict):
+    """Build the table's indexes once the data is in"""
+    table = table_def["table"]
+    if table_def["primary_key"]:
+        conn.execute(f"CREATE UNIQUE INDEX {table}_pkey ON {table} ({table_def['primary_key']})")
+    for columns in table_def["indexes"]:
+        conn.execute(f"CREATE INDEX {table}_{'_'.join(columns)}_idx ON {table} ({', '.join(columns)})")
+
+
+def export(engine: str, output: str, data_dir: str) -> List[Dict]:
+    """Load every available table into the output database; returns per-table timings"""
+    present = set(available_tables(data_dir))
+    conn = connect(engine, output)
+    stats = []
+    for table_def in TABLES:
+        table = table_def["table"]
+        if table not in present:
+            continue
+        started = time.perf_counter()
+        rows = load_table(data_dir, table)
+        parsed = time.perf_counter()
+        if engine == "sqlite":
+            conn.execute("BEGIN")
+        count = load_table_rows(conn, engine, table, rows, os.path.join(data_dir, table_def["file"]))
+        loaded = time.perf_counter()
+        create_indexes(conn, table_def)
+        conn.commit()
+        indexed = time.perf_counter()
+        stats.append({
+            "table": table,
+            "rows": count,
+            "parse_seconds": round(parsed - started, 4),
+            "load_seconds": round(loaded - parsed, 4),
+            "index_seconds": round(indexed - loaded, 4),
+            "rows_per_second": round(count / (loaded - parsed), 1) if loaded > parsed else 0,
+        })
+        print(f"   ✅ {table}: {count:,} rows ({stats[-1]['rows_per_second']:,.0f} rows/s)")
+    conn.close()
+    return stats
+
+
+def benchmark_queries(engine: str, output: str, repeats: int = 20) -> Dict[str, float]:
+    """Median latency in milliseconds of the dashboard queries"""
+    if engine == "duckdb":
+        import duckdb
+        conn = duckdb.connect(output, read_only=True)
+    else:
+        import sqlite3
+        conn = sqlite3.connect(output)
+    results = {}
+    for name, sql in DASHBOARD_QUERIES.items():
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            try:
+                conn.execute(sql).fetchall()
+            except Exception as e:
+                print(f"   ⚠️  {name}: {e}")
+                break
+            timings.append(time.perf_counter() - started)
+        if timings:
+            results[name] = round(statistics.median(timings) * 1000, 3)
+    conn.close()
+    return results
+
+
+def main():
+    """Export generated data to a local database"""
+    parser = argparse.ArgumentParser(description="Export generated data to SQLite or DuckDB")
+    parser.add_argument("--engine", choices=["sqlite", "duckdb"], default="sqlite")
+    parser.add_argument("--output", help="Database file (default: generated_data/zero_ecosystem.<engine>)")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--benchmark", action="store_true", help="Time the dashboard queries after loading")
+    args = parser.parse_args()
+    output = args.output or os.path.join(args.data_dir, f"zero_ecosystem.{'db' if args.engine == 'sqlite' else 'duckdb'}")
+
+    print("=" * 60)
+    print(f"💾 LOCAL EXPORT ({args.engine.upper()})")
+    print("=" * 60)
+    started = time.perf_counter()
+    stats = export(args.engine, output, args.data_dir)
+    elapsed = time.perf_counter() - started
+    total_rows = sum(s["rows"] for s in stats)
+    print(f"\n✅ Loaded {total_rows:,} rows into {output} in {elapsed:.2f}s "
+          f"({total_rows / elapsed:,.0f} rows/s end to end)")
+
+    if args.benchmark:
+        print("\n⏱️  Dashboard query latency (median ms):")
+        for name, ms in benchmark_queries(args.engine, output).items():
+            print(f"   {name:.<37} {ms}")
+
+
+if __name__ == "__main__":
+    main()
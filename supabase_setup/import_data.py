@@ -3,165 +3,309 @@ Supabase Data Import Script
 Imports all generated JSON data to Supabase
 """
 
+import argparse
 import json
 import os
-from supabase import create_client, Client
-from typing import List, Dict
+from typing import List, Dict, Optional
 import time
 
+from adaptive_batching import AdaptiveBatchSizer
+from compact_upload import CompactUploader
+from datasets import iso_timestamps, load_manifest, load_partitions, select_partitions
+from import_metrics import ImportInstrumentation
+from validate_data import print_report, validate
+
+try:
+    from supabase import create_client, Client
+except ImportError:  # Compact upload mode and the benchmarks post without the client
+    create_client, Client = None, object
+
 # Supabase credentials (you need to provide these)
 SUPABASE_URL = os.getenv("SUPABASE_URL", "YOUR_SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY", "YOUR_SUPABASE_ANON_KEY")
+RATE_LIMIT_SECONDS = 0.1  # Pause after every batch
+# Starting batch sizes per table (DEFAULT_BATCH_SIZE for the rest)
+INITIAL_BATCH_SIZES = {"steel_furnace_metrics": 500, "production_stage_tracking": 200,
+                       "dryfood_temperature_humidity_logs": 200}
+DEFAULT_BATCH_SIZE = 100
 
-# Initialize Supabase client
-def init_supabase() -> Client:
-    """Initialize Supabase client"""
+
+def initial_batch_size(table_name: str) -> int:
+    return INITIAL_BATCH_SIZES.get(table_name, DEFAULT_BATCH_SIZE)
+
+
+class RequestSizes:
+    """Body size of the latest request the Supabase client sent, as its HTTP session's request hook sees it"""
+
+    def __init__(self):
+        self.last = 0
+
+    def __call__(self, request):
+        self.last = len(request.content)
+
+
+CLIENT_REQUESTS = RequestSizes()
+
+def credentials_set() -> bool:
+    """Whether SUPABASE_URL and SUPABASE_KEY are set, warning if not"""
     if SUPABASE_URL == "YOUR_SUPABASE_URL":
         print("⚠️  WARNING: Please set SUPABASE_URL and SUPABASE_KEY environment variables")
         print("   export SUPABASE_URL='your-project-url'")
         print("   export SUPABASE_KEY='your-anon-key'")
+        return False
+    return True
+
+# Initialize Supabase client
+def init_supabase() -> Client:
+    """Initialize Supabase client"""
+    if not credentials_set():
         return None
+    if create_client is None:
+        raise SystemExit("❌ The importer needs the Supabase client: pip install supabase")
     
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
+    client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    # The client serializes each batch itself; batch_insert reads the body size back from here
+    client.postgrest.session.event_hooks["request"].append(CLIENT_REQUESTS)
+    return client
+
+def read_json(data_dir: str, filename: str, table_name: str, metrics: Optional[ImportInstrumentation] = None,
+              selection: Optional[Dict] = None) -> List[Dict]:
+    """Load one generated table, timed as the table's parse phase
 
-def batch_insert(supabase: Client, table_name: str, data: List[Dict], batch_size: int = 100):
-    """Insert data in batches to avoid timeouts"""
+    With a ``selection`` (entities, start_date, end_date) only the matching
+    partitions of the partitioned layout are read.
+    """
+    metrics = metrics or ImportInstrumentation()
+    with metrics.phase(table_name, "parse"):
+        if selection:
+            manifest = selection["manifest"]
+            partitions = select_partitions(manifest, table_name, selection.get("entities"),
+                                           selection.get("start_date"), selection.get("end_date"))
+            data = load_partitions(data_dir, partitions)
+        else:
+            with open(f"{data_dir}/{filename}") as f:
+                data = json.load(f)
+        iso_timestamps(table_name, data)
+    metrics.record_rows(table_name, len(data))
+    return data
+
+def batch_insert(supabase: Client, table_name: str, data: List[Dict], batch_size: Optional[int] = None,
+                 uploader: Optional[CompactUploader] = None, metrics: Optional[ImportInstrumentation] = None,
+                 sizer: Optional[AdaptiveBatchSizer] = None):
+    """Insert data in batches to avoid timeouts
+
+    ``batch_size`` (default: the table's INITIAL_BATCH_SIZES entry) is only
+    the starting point; an AIMD controller resizes batches per table from
+    round-trip time, payload size and errors. A failed batch is retried at
+    the reduced size until it is at the minimum. With an ``uploader``
+    batches go out through compact upload mode instead of the Supabase
+    client. Each batch is serialized once, by whichever of the two sends
+    it, and the size of that body feeds the controller. Serialization (the
+    client's counts as network time), network and backoff time and every
+    request's latency are recorded in ``metrics``. Pass a ``sizer`` to
+    carry the learned batch size across calls for the same table.
+    """
+    metrics = metrics or ImportInstrumentation()
     total = len(data)
     inserted = 0
+    sizer = sizer or AdaptiveBatchSizer(table_name, initial_size=batch_size or initial_batch_size(table_name))
     
     print(f"   Inserting {total} records into {table_name}...")
     
-    for i in range(0, total, batch_size):
-        batch = data[i:i + batch_size]
+    i = 0
+    while i < total:
+        batch = data[i:i + sizer.next_size()]
+        body = None
+        if uploader:
+            with metrics.phase(table_name, "serialize"):
+                body = uploader.encode(table_name, batch)
+        CLIENT_REQUESTS.last = 0
+        started = time.perf_counter()
         try:
-            result = supabase.table(table_name).insert(batch).execute()
-            inserted += len(batch)
-            print(f"   Progress: {inserted}/{total} ({(inserted/total)*100:.1f}%)")
-            time.sleep(0.1)  # Rate limiting
+            with metrics.phase(table_name, "network"):
+                if uploader:
+                    uploader.insert(table_name, batch, body)
+                else:
+                    supabase.table(table_name).insert(batch).execute()
         except Exception as e:
-            print(f"   ❌ Error inserting batch {i//batch_size + 1}: {str(e)}")
+            elapsed = time.perf_counter() - started
+            payload_bytes = len(body) if body is not None else CLIENT_REQUESTS.last
+            sizer.record(len(batch), payload_bytes, elapsed, ok=False)
+            metrics.record_request(table_name, len(batch), elapsed, ok=False)
+            if len(batch) > sizer.min_size:
+                print(f"   ⚠️  Batch of {len(batch)} failed, retrying at {sizer.next_size()}: {str(e)}")
+                continue
+            print(f"   ❌ Error inserting rows {i + 1}-{i + len(batch)}: {str(e)}")
+            i += len(batch)
             continue
+        elapsed = time.perf_counter() - started
+        payload_bytes = len(body) if body is not None else CLIENT_REQUESTS.last
+        sizer.record(len(batch), payload_bytes, elapsed)
+        metrics.record_request(table_name, len(batch), elapsed, ok=True)
+        inserted += len(batch)
+        i += len(batch)
+        print(f"   Progress: {inserted}/{total} ({(inserted/total)*100:.1f}%)")
+        with metrics.phase(table_name, "backoff"):
+            time.sleep(RATE_LIMIT_SECONDS)  # Rate limiting
     
     print(f"   ✅ Inserted {inserted}/{total} records")
+    print(f"   📐 {table_name}: batch size converged on {sizer.converged_size()} rows "
+          f"(~{(sizer.bytes_per_row or 0) * sizer.converged_size() / 1024:.0f} KB per request)")
     return inserted
 
-def import_steel_data(supabase: Client, data_dir: str):
+def import_steel_data(supabase: Client, data_dir: str, uploader: Optional[CompactUploader] = None,
+                      metrics: Optional[ImportInstrumentation] = None, selection: Optional[Dict] = None):
     """Import Zero@Steel data"""
     print("\n🏭 Importing Zero@Steel Data...")
     
     # Furnace metrics
-    with open(f"{data_dir}/steel_furnace_metrics.json") as f:
-        metrics = json.load(f)
-    batch_insert(supabase, "steel_furnace_metrics", metrics, batch_size=500)
+    furnace_metrics = read_json(data_dir, "steel_furnace_metrics.json", "steel_furnace_metrics", metrics, selection)
+    batch_insert(supabase, "steel_furnace_metrics", furnace_metrics, uploader=uploader, metrics=metrics)
     
     # Production batches
-    with open(f"{data_dir}/steel_production_batches.json") as f:
-        batches = json.load(f)
-    batch_insert(supabase, "steel_production_batches", batches)
+    batches = read_json(data_dir, "steel_production_batches.json", "steel_production_batches", metrics, selection)
+    batch_insert(supabase, "steel_production_batches", batches, uploader=uploader, metrics=metrics)
     
     # Alerts
-    with open(f"{data_dir}/steel_alerts.json") as f:
-        alerts = json.load(f)
-    batch_insert(supabase, "steel_alerts", alerts)
+    alerts = read_json(data_dir, "steel_alerts.json", "steel_alerts", metrics, selection)
+    batch_insert(supabase, "steel_alerts", alerts, uploader=uploader, metrics=metrics)
     
     # Maintenance
-    with open(f"{data_dir}/steel_maintenance.json") as f:
-        maintenance = json.load(f)
-    batch_insert(supabase, "steel_maintenance_records", maintenance)
+    maintenance = read_json(data_dir, "steel_maintenance.json", "steel_maintenance_records", metrics, selection)
+    batch_insert(supabase, "steel_maintenance_records", maintenance, uploader=uploader, metrics=metrics)
     
     print("✅ Zero@Steel data imported!")
 
-def import_production_data(supabase: Client, data_dir: str):
+def import_production_data(supabase: Client, data_dir: str, uploader: Optional[CompactUploader] = None,
+                           metrics: Optional[ImportInstrumentation] = None, selection: Optional[Dict] = None):
     """Import Zero@Production data"""
     print("\n👕 Importing Zero@Production Data...")
     
     # Orders
-    with open(f"{data_dir}/production_orders.json") as f:
-        orders = json.load(f)
-    batch_insert(supabase, "production_orders", orders)
+    orders = read_json(data_dir, "production_orders.json", "production_orders", metrics, selection)
+    batch_insert(supabase, "production_orders", orders, uploader=uploader, metrics=metrics)
     
     # Stage tracking
-    with open(f"{data_dir}/production_stage_tracking.json") as f:
-        tracking = json.load(f)
-    batch_insert(supabase, "production_stage_tracking", tracking, batch_size=200)
+    tracking = read_json(data_dir, "production_stage_tracking.json", "production_stage_tracking", metrics, selection)
+    batch_insert(supabase, "production_stage_tracking", tracking, uploader=uploader, metrics=metrics)
     
     # DPP records
-    with open(f"{data_dir}/production_dpp.json") as f:
-        dpp = json.load(f)
-    batch_insert(supabase, "production_dpp", dpp, batch_size=100)
+    dpp = read_json(data_dir, "production_dpp.json", "production_dpp", metrics, selection)
+    batch_insert(supabase, "production_dpp", dpp, uploader=uploader, metrics=metrics)
     
     # Quality checks
-    with open(f"{data_dir}/production_quality.json") as f:
-        quality = json.load(f)
-    batch_insert(supabase, "production_quality_checks", quality, batch_size=100)
+    quality = read_json(data_dir, "production_quality.json", "production_quality_checks", metrics, selection)
+    batch_insert(supabase, "production_quality_checks", quality, uploader=uploader, metrics=metrics)
     
     print("✅ Zero@Production data imported!")
 
-def import_dryfood_data(supabase: Client, data_dir: str):
+def import_dryfood_data(supabase: Client, data_dir: str, uploader: Optional[CompactUploader] = None,
+                        metrics: Optional[ImportInstrumentation] = None, selection: Optional[Dict] = None):
     """Import Zero@DryFood data"""
     print("\n🍎 Importing Zero@DryFood Data...")
     
     # Batches
-    with open(f"{data_dir}/dryfood_batches.json") as f:
-        batches = json.load(f)
-    batch_insert(supabase, "dryfood_dehydration_batches", batches)
+    batches = read_json(data_dir, "dryfood_batches.json", "dryfood_dehydration_batches", metrics, selection)
+    batch_insert(supabase, "dryfood_dehydration_batches", batches, uploader=uploader, metrics=metrics)
     
     # Temperature logs
-    with open(f"{data_dir}/dryfood_logs.json") as f:
-        logs = json.load(f)
-    batch_insert(supabase, "dryfood_temperature_humidity_logs", logs, batch_size=200)
+    logs = read_json(data_dir, "dryfood_logs.json", "dryfood_temperature_humidity_logs", metrics, selection)
+    batch_insert(supabase, "dryfood_temperature_humidity_logs", logs, uploader=uploader, metrics=metrics)
     
     # Waste impact
-    with open(f"{data_dir}/dryfood_waste_impact.json") as f:
-        impact = json.load(f)
-    batch_insert(supabase, "dryfood_waste_impact_analysis", impact)
+    impact = read_json(data_dir, "dryfood_waste_impact.json", "dryfood_waste_impact_analysis", metrics, selection)
+    batch_insert(supabase, "dryfood_waste_impact_analysis", impact, uploader=uploader, metrics=metrics)
     
     print("✅ Zero@DryFood data imported!")
 
-def import_design_data(supabase: Client, data_dir: str):
+def import_design_data(supabase: Client, data_dir: str, uploader: Optional[CompactUploader] = None,
+                       metrics: Optional[ImportInstrumentation] = None, selection: Optional[Dict] = None):
     """Import Zero@Design data"""
     print("\n🎨 Importing Zero@Design Data...")
     
     # Projects
-    with open(f"{data_dir}/design_projects.json") as f:
-        projects = json.load(f)
-    batch_insert(supabase, "design_projects", projects)
+    projects = read_json(data_dir, "design_projects.json", "design_projects", metrics, selection)
+    batch_insert(supabase, "design_projects", projects, uploader=uploader, metrics=metrics)
     
     # Material alternatives
-    with open(f"{data_dir}/design_material_alternatives.json") as f:
-        alternatives = json.load(f)
-    batch_insert(supabase, "design_material_alternatives", alternatives)
+    alternatives = read_json(data_dir, "design_material_alternatives.json", "design_material_alternatives", metrics, selection)
+    batch_insert(supabase, "design_material_alternatives", alternatives, uploader=uploader, metrics=metrics)
     
     # LCA reports
-    with open(f"{data_dir}/design_lca_reports.json") as f:
-        lca = json.load(f)
-    batch_insert(supabase, "design_lifecycle_assessments", lca)
+    lca = read_json(data_dir, "design_lca_reports.json", "design_lifecycle_assessments", metrics, selection)
+    batch_insert(supabase, "design_lifecycle_assessments", lca, uploader=uploader, metrics=metrics)
     
     print("✅ Zero@Design data imported!")
 
 def main():
     """Main import function"""
+    parser = argparse.ArgumentParser(description="Import generated data into Supabase")
+    parser.add_argument("--compress", action="store_true", help="Gzip request bodies (compact upload mode)")
+    parser.add_argument("--strip-derivable", action="store_true",
+                        help="Omit columns the database can derive via defaults or joins")
+    parser.add_argument("--entity", action="append",
+                        help="Only import partitions of this furnace/dehydrator/industry (repeatable)")
+    parser.add_argument("--since", help="Only import partitions dated on or after YYYY-MM-DD")
+    parser.add_argument("--until", help="Only import partitions dated on or before YYYY-MM-DD")
+    parser.add_argument("--skip-validation", action="store_true",
+                        help="Do not check keys, types and nullability before importing")
+    parser.add_argument("--report", default="import_report.json",
+                        help="Where to write the JSON run report (per-table throughput, phases, latency)")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("🚀 SUPABASE DATA IMPORT")
     print("=" * 60)
     
-    # Initialize Supabase
-    supabase = init_supabase()
-    if not supabase:
+    data_dir = "../data_generators/generated_data"
+    
+    # Catch orphaned and malformed rows before anything goes over the network
+    if not args.skip_validation:
+        print("\n🔎 Validating generated data...")
+        validation = validate(data_dir)
+        if validation["errors"]:
+            print_report(validation)
+            print("\n❌ Fix the rows above (python validate_data.py --report ...) or pass --skip-validation")
+            return
+        print(f"   ✅ {validation['rows']:,} rows valid ({validation['seconds']:.2f}s)")
+    
+    # Initialize Supabase; compact mode posts to PostgREST itself and runs without the client
+    supabase = uploader = None
+    if args.compress or args.strip_derivable:
+        if credentials_set():
+            uploader = CompactUploader(SUPABASE_URL, SUPABASE_KEY, compress=args.compress,
+                                       strip_derivable=args.strip_derivable)
+    else:
+        supabase = init_supabase()
+    if not (supabase or uploader):
         print("\n❌ Cannot proceed without Supabase credentials")
         print("\nTo set credentials:")
         print("  export SUPABASE_URL='https://your-project.supabase.co'")
         print("  export SUPABASE_KEY='your-anon-key'")
         return
     
-    data_dir = "../data_generators/generated_data"
+    metrics = ImportInstrumentation()
+    
+    selection = None
+    if args.entity or args.since or args.until:
+        manifest = load_manifest(data_dir)
+        if manifest is None:
+            print("\n❌ Partition filters need the partitioned layout (run the generators with --partitioned)")
+            return
+        selection = {"manifest": manifest, "entities": args.entity,
+                     "start_date": args.since, "end_date": args.until}
     
     try:
         # Import all modules
-        import_steel_data(supabase, data_dir)
-        import_production_data(supabase, data_dir)
-        import_dryfood_data(supabase, data_dir)
-        import_design_data(supabase, data_dir)
+        import_steel_data(supabase, data_dir, uploader, metrics, selection)
+        import_production_data(supabase, data_dir, uploader, metrics, selection)
+        import_dryfood_data(supabase, data_dir, uploader, metrics, selection)
+        import_design_data(supabase, data_dir, uploader, metrics, selection)
+        
+        if uploader:
+            report = uploader.report()
+            print(f"\n📦 Bytes on the wire: {report['baseline_bytes']:,} -> {report['wire_bytes']:,} "
+                  f"({report['reduction_percentage']}% less)")
         
         print("\n" + "=" * 60)
         print("✅ ALL DATA IMPORTED SUCCESSFULLY!")
@@ -171,6 +315,14 @@ def main():
         print(f"\n❌ Import failed: {str(e)}")
         import traceback
         traceback.print_exc()
+    
+    finally:
+        # Written for failed runs too, so CI can diff partial imports against a baseline
+        report = metrics.write_report(args.report)
+        phases = ", ".join(f"{phase} {seconds:.1f}s" for phase, seconds in report["phase_seconds"].items())
+        print(f"\n📊 {report['rows_inserted']:,} rows in {report['total_seconds']:.1f}s "
+              f"({report['rows_per_second'] or 0:,.0f} rows/s; {phases})")
+        print(f"   Run report written to {args.report}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,137 @@
+"""
+Import Instrumentation
+Per-table phase timings, throughput and request latency histograms for import runs, written as a JSON report
+"""
+
+import json
+import platform
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Optional
+
+PHASES = ("parse", "serialize", "network", "backoff")
+
+
+class LatencyHistogram:
+    """Request latencies in power-of-two millisecond buckets"""
+
+    def __init__(self, max_bucket_ms: int = 65536):
+        self.bounds: List[int] = []
+        bound = 1
+        while bound <= max_bucket_ms:
+            self.bounds.append(bound)
+            bound *= 2
+        self.counts = [0] * (len(self.bounds) + 1)  # Last bucket catches everything slower
+        self.samples: List[float] = []
+
+    def add(self, seconds: float):
+        ms = seconds * 1000
+        self.samples.append(ms)
+        for i, bound in enumerate(self.bounds):
+            if ms <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return round(ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))], 2)
+
+    def to_dict(self) -> Dict:
+        buckets = {f"le_{bound}ms": count for bound, count in zip(self.bounds, self.counts) if count}
+        if self.counts[-1]:
+            buckets[f"gt_{self.bounds[-1]}ms"] = self.counts[-1]
+        return {
+            "count": len(self.samples),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(max(self.samples), 2) if self.samples else None,
+            "buckets": buckets,
+        }
+
+
+class ImportInstrumentation:
+    """Collects timings for an import run and writes the machine-readable report"""
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self.tables: Dict[str, Dict] = {}
+
+    def _table(self, table: str) -> Dict:
+        stats = self.tables.get(table)
+        if stats is None:
+            stats = {
+                "rows": 0,
+                "rows_inserted": 0,
+                "requests": 0,
+                "failed_requests": 0,
+                "phase_seconds": {phase: 0.0 for phase in PHASES},
+                "first_started": time.perf_counter(),
+                "last_finished": None,
+                "latency": LatencyHistogram(),
+            }
+            self.tables[table] = stats
+        return stats
+
+    @contextmanager
+    def phase(self, table: str, phase: str):
+        """Time a block against one of the PHASES of a table"""
+        stats = self._table(table)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            finished = time.perf_counter()
+            stats["phase_seconds"][phase] += finished - started
+            stats["last_finished"] = finished
+
+    def record_rows(self, table: str, rows: int):
+        self._table(table)["rows"] += rows
+
+    def record_request(self, table: str, rows: int, seconds: float, ok: bool):
+        stats = self._table(table)
+        stats["requests"] += 1
+        stats["latency"].add(seconds)
+        if ok:
+            stats["rows_inserted"] += rows
+        else:
+            stats["failed_requests"] += 1
+
+    def report(self) -> Dict:
+        tables = {}
+        for table, stats in self.tables.items():
+            wall = (stats["last_finished"] or stats["first_started"]) - stats["first_started"]
+            tables[table] = {
+                "rows": stats["rows"],
+                "rows_inserted": stats["rows_inserted"],
+                "requests": stats["requests"],
+                "failed_requests": stats["failed_requests"],
+                "wall_seconds": round(wall, 3),
+                "rows_per_second": round(stats["rows_inserted"] / wall, 1) if wall > 0 else None,
+                "phase_seconds": {phase: round(s, 3) for phase, s in stats["phase_seconds"].items()},
+                "latency": stats["latency"].to_dict(),
+            }
+        total_seconds = time.perf_counter() - self._started
+        total_inserted = sum(t["rows_inserted"] for t in tables.values())
+        return {
+            "started_at": self.started_at.isoformat(),
+            "python": platform.python_version(),
+            "total_seconds": round(total_seconds, 3),
+            "rows_inserted": total_inserted,
+            "rows_per_second": round(total_inserted / total_seconds, 1) if total_seconds > 0 else None,
+            "phase_seconds": {
+                phase: round(sum(t["phase_seconds"][phase] for t in tables.values()), 3) for phase in PHASES
+            },
+            "tables": tables,
+        }
+
+    def write_report(self, path: str) -> Dict:
+        report = self.report()
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        return report
@@ -0,0 +1,398 @@
+"""
+Local Query API Server
+Serves the generated datasets with PostgREST-compatible queries as a local stand-in for Supabase
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from itertools import chain, islice
+from typing import Any, List, Dict, Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl
+
+from datasets import DEFAULT_DATA_DIR, available_tables, load_table
+
+FILTER_OPERATORS = {"eq", "neq", "gt", "gte", "lt", "lte", "like", "ilike", "in", "is"}
+
+
+class QueryError(Exception):
+    """A request the query engine cannot answer"""
+
+    def __init__(self, message: str, status: int = 400, code: str = "PGRST100"):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+def coerce(raw: str, sample: Any) -> Any:
+    """Convert a query-string value to the type of the column it filters"""
+    if isinstance(sample, bool):
+        if raw not in ("true", "false"):
+            raise QueryError(f"invalid boolean: {raw}")
+        return raw == "true"
+    if isinstance(sample, (int, float)):
+        try:
+            return int(raw) if isinstance(sample, int) and raw.lstrip("-").isdigit() else float(raw)
+        except ValueError:
+            raise QueryError(f"invalid number: {raw}")
+    return raw
+
+
+class TableIndex:
+    """Rows of one table plus lazily built per-column indexes.
+
+    Hash indexes (value -> row positions) answer ``eq``/``in`` filters and
+    sorted indexes answer range filters and ``order`` without touching rows
+    that are not returned. Queries run on worker threads, so an index is
+    built under a lock, once.
+    """
+
+    def __init__(self, rows: List[Dict]):
+        self.rows = rows
+        self.samples: Dict[str, Any] = {}
+        for row in rows:
+            for column, value in row.items():
+                if value is not None and column not in self.samples:
+                    self.samples[column] = value
+            if len(self.samples) == len(row):
+                break
+        self.columns = set(rows[0]) if rows else set()
+        self._hash: Dict[str, Dict[Any, List[int]]] = {}
+        self._sorted: Dict[str, Tuple[List[Any], List[int], List[int]]] = {}
+        self._build_lock = threading.Lock()
+
+    def hash_index(self, column: str) -> Dict[Any, List[int]]:
+        index = self._hash.get(column)
+        if index is None:
+            with self._build_lock:
+                index = self._hash.get(column)
+                if index is None:
+                    index = {}
+                    for pos, row in enumerate(self.rows):
+                        index.setdefault(row.get(column), []).append(pos)
+                    self._hash[column] = index
+        return index
+
+    def sorted_index(self, column: str) -> Tuple[List[Any], List[int], List[int]]:
+        """(sorted non-null values, their row positions, positions of nulls)"""
+        index = self._sorted.get(column)
+        if index is None:
+            with self._build_lock:
+                index = self._sorted.get(column)
+                if index is None:
+                    present = [(row[column], pos) for pos, row in enumerate(self.rows) if row.get(column) is not None]
+                    present.sort(key=lambda item: item[0])
+                    nulls = [pos for pos, row in enumerate(self.rows) if row.get(column) is None]
+                    index = ([v for v, _ in present], [p for _, p in present], nulls)
+                    self._sorted[column] = index
+        return index
+
+    def _check_column(self, column: str):
+        if column not in self.columns:
+            raise QueryError(f"column {column} does not exist", code="42703")
+
+    def _indexed_positions(self, column: str, op: str, value: Any) -> List[int]:
+        if op == "eq":
+            return self.hash_index(column).get(value, [])
+        if op == "in":
+            index = self.hash_index(column)
+            return [pos for v in value for pos in index.get(v, [])]
+        keys, positions, _ = self.sorted_index(column)
+        if op == "gt":
+            return positions[bisect_right(keys, value):]
+        if op == "gte":
+            return positions[bisect_left(keys, value):]
+        if op == "lt":
+            return positions[:bisect_left(keys, value)]
+        return positions[:bisect_right(keys, value)]  # lte
+
+    @staticmethod
+    def _predicate(column: str, op: str, value: Any):
+        if op == "neq":
+            return lambda row: row.get(column) is not None and row.get(column) != value
+        if op == "is":
+            return lambda row: row.get(column) is value
+        pattern = re.compile(
+            "^" + re.escape(value).replace(r"\*", ".*").replace("%", ".*") + "$",
+            re.IGNORECASE if op == "ilike" else 0
+        )
+        return lambda row: isinstance(row.get(column), str) and pattern.match(row[column]) is not None
+
+    def parse_filter(self, column: str, expression: str) -> Tuple[str, str, Any]:
+        self._check_column(column)
+        op, _, raw = expression.partition(".")
+        if op == "not":
+            raise QueryError("not. filters are not supported")
+        if op not in FILTER_OPERATORS:
+            raise QueryError(f"unknown operator: {op}")
+        sample = self.samples.get(column)
+        if op == "in":
+            items = raw.strip("()").split(",") if raw.strip("()") else []
+            return column, op, [coerce(item.strip('"'), sample) for item in items]
+        if op == "is":
+            if raw not in ("null", "true", "false"):
+                raise QueryError(f"invalid is. value: {raw}")
+            return column, op, {"null": None, "true": True, "false": False}[raw]
+        if op in ("like", "ilike"):
+            return column, op, raw
+        return column, op, coerce(raw, sample)
+
+    def parse_order(self, expression: str) -> List[Tuple[str, bool, bool]]:
+        """``col.desc.nullsfirst,col2`` -> [(column, descending, nulls_first)]"""
+        terms = []
+        for term in expression.split(","):
+            parts = term.split(".")
+            column = parts[0]
+            self._check_column(column)
+            descending = "desc" in parts[1:]
+            nulls_first = "nullsfirst" in parts[1:] or (descending and "nullslast" not in parts[1:])
+            terms.append((column, descending, nulls_first))
+        return terms
+
+    def query(self, filters: List[Tuple[str, str, Any]], order: List[Tuple[str, bool, bool]],
+              limit: Optional[int], offset: int, select: Optional[List[str]]) -> List[Dict]:
+        candidates: Optional[set] = None
+        predicates = []
+        for column, op, value in filters:
+            if op in ("eq", "in", "gt", "gte", "lt", "lte"):
+                matched = set(self._indexed_positions(column, op, value))
+                candidates = matched if candidates is None else candidates & matched
+            else:
+                predicates.append(self._predicate(column, op, value))
+
+        end = offset + limit if limit is not None else None
+        if candidates is None and not predicates and len(order) == 1:
+            # Whole-table single-column order: walk the sorted index, no sort needed
+            column, descending, nulls_first = order[0]
+            _, positions, nulls = self.sorted_index(column)
+            ordered = reversed(positions) if descending else positions
+            parts = (nulls, ordered) if nulls_first else (ordered, nulls)
+            positions = list(islice(chain(*parts), offset, end))
+        else:
+            positions = sorted(candidates) if candidates is not None else range(len(self.rows))
+            if predicates:
+                positions = [p for p in positions if all(pred(self.rows[p]) for pred in predicates)]
+            positions = list(positions)
+            for column, descending, nulls_first in reversed(order):
+                rows = self.rows
+                null_rank = 1 if nulls_first == descending else 0
+                positions.sort(
+                    key=lambda p: (null_rank, None) if rows[p].get(column) is None else (1 - null_rank, rows[p][column]),
+                    reverse=descending
+                )
+            positions = positions[offset:end]
+
+        if select:
+            return [{column: self.rows[p].get(column) for column in select} for p in positions]
+        return [self.rows[p] for p in positions]
+
+
+class ResponseCache:
+    """LRU cache of serialized responses with a per-entry time to live"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, int, bytes, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Tuple[int, bytes, str]]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1:]
+
+    def put(self, key: str, status: int, body: bytes, content_range: str):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, status, body, content_range)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class QueryService:
+    """Loads every generated table once and answers PostgREST-style requests"""
+
+    def __init__(self, data_dir: str = DEFAULT_DATA_DIR, cache: Optional[ResponseCache] = None):
+        self.tables = {table: TableIndex(load_table(data_dir, table)) for table in available_tables(data_dir)}
+        self.cache = cache if cache is not None else ResponseCache()
+
+    @staticmethod
+    def _parse(target: str) -> Tuple[str, str, List[Tuple[str, str]]]:
+        """(cache key, path, sorted query parameters) of a request target"""
+        url = urlsplit(target)
+        path = url.path
+        if path.startswith("/rest/v1"):
+            path = path[len("/rest/v1"):]
+        params = sorted(parse_qsl(url.query, keep_blank_values=True))
+        return path + "?" + "&".join(f"{k}={v}" for k, v in params), path, params
+
+    def _answer(self, path: str, params: List[Tuple[str, str]]) -> Tuple[int, bytes, Optional[str]]:
+        try:
+            payload, offset = self._execute(path.strip("/"), params)
+            status, content_range = 200, None
+            if isinstance(payload, list):
+                content_range = f"{offset}-{offset + len(payload) - 1}/*" if payload else "*/*"
+        except QueryError as e:
+            status, payload, content_range = e.status, {"code": e.code, "message": str(e)}, None
+        return status, json.dumps(payload, separators=(",", ":")).encode(), content_range
+
+    def handle(self, target: str) -> Tuple[int, bytes, str, bool]:
+        """Answer a request target; returns (status, body, content_range, cache_hit)"""
+        key, path, params = self._parse(target)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached[0], cached[1], cached[2], True
+        status, body, content_range = self._answer(path, params)
+        if status == 200:
+            self.cache.put(key, status, body, content_range)
+        return status, body, content_range, False
+
+    async def handle_async(self, target: str) -> Tuple[int, bytes, str, bool]:
+        """handle() for the event loop: cache hits are answered inline, misses on a worker thread
+
+        Filtering, sorting and serializing a miss can scan a whole table, which
+        would stall every other connection if it ran on the loop. The cache is
+        only touched from the loop thread.
+        """
+        key, path, params = self._parse(target)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached[0], cached[1], cached[2], True
+        status, body, content_range = await asyncio.to_thread(self._answer, path, params)
+        if status == 200:
+            self.cache.put(key, status, body, content_range)
+        return status, body, content_range, False
+
+    def _execute(self, table_name: str, params: List[Tuple[str, str]]) -> Tuple[Any, int]:
+        """The response payload and the offset of its first row"""
+        if not table_name:
+            return {name: len(index.rows) for name, index in self.tables.items()}, 0
+        table = self.tables.get(table_name)
+        if table is None:
+            raise QueryError(f"relation \"{table_name}\" does not exist", status=404, code="42P01")
+
+        filters, order, limit, offset, select = [], [], None, 0, None
+        for name, value in params:
+            if name == "select":
+                select = None if value in ("", "*") else [c.strip() for c in value.split(",")]
+                for column in select or []:
+                    table._check_column(column)
+            elif name == "order":
+                order = table.parse_order(value)
+            elif name in ("limit", "offset"):
+                try:
+                    number = int(value)
+                except ValueError:
+                    raise QueryError(f"invalid {name}: {value}")
+                if name == "limit":
+                    limit = number
+                else:
+                    offset = number
+            else:
+                filters.append(table.parse_filter(name, value))
+        return table.query(filters, order, limit, offset, select), offset
+
+
+CORS_HEADERS = (
+    "Access-Control-Allow-Origin: *\r\n"
+    "Access-Control-Allow-Methods: GET, HEAD, OPTIONS\r\n"
+    "Access-Control-Allow-Headers: apikey, authorization, content-type, range, prefer, x-client-info, accept-profile\r\n"
+    "Access-Control-Expose-Headers: Content-Range\r\n"
+)
+REASONS = {200: "OK", 204: "No Content", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+async def handle_connection(service: QueryService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Serve HTTP/1.1 requests on one keep-alive connection"""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            method, target, version = request_line.decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if headers.get("content-length"):
+                await reader.readexactly(int(headers["content-length"]))
+
+            extra = ""
+            if method == "OPTIONS":
+                status, body = 204, b""
+            elif method in ("GET", "HEAD"):
+                status, body, content_range, hit = await service.handle_async(target)
+                extra = "Content-Type: application/json; charset=utf-8\r\n"
+                extra += f"X-Cache: {'HIT' if hit else 'MISS'}\r\n"
+                if content_range:
+                    extra += f"Content-Range: {content_range}\r\n"
+            else:
+                status, body = 405, b'{"message":"method not allowed"}'
+
+            keep_alive = headers.get("connection", "").lower() != "close" and not version.startswith("HTTP/1.0")
+            writer.write(
+                f"HTTP/1.1 {status} {REASONS[status]}\r\n{CORS_HEADERS}{extra}"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+                + (body if method != "HEAD" else b"")
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(service: QueryService, host: str = "127.0.0.1", port: int = 8000) -> asyncio.AbstractServer:
+    """Start serving; port 0 picks a free port"""
+    return await asyncio.start_server(lambda r, w: handle_connection(service, r, w), host, port)
+
+
+def main():
+    """Run the local query API"""
+    parser = argparse.ArgumentParser(description="Serve generated data with PostgREST-style queries")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--cache-size", type=int, default=1024, help="Cached responses (0 disables caching)")
+    parser.add_argument("--cache-ttl", type=float, default=30.0, help="Seconds a cached response stays valid")
+    args = parser.parse_args()
+
+    print("🚀 Loading generated datasets...")
+    service = QueryService(args.data_dir, ResponseCache(args.cache_size, args.cache_ttl))
+    for name, index in service.tables.items():
+        print(f"   - {name}: {len(index.rows):,} rows")
+
+    async def serve():
+        server = await start_server(service, args.host, args.port)
+        print(f"\n✅ Serving on http://{args.host}:{args.port}/rest/v1/<table>")
+        print("   Set localStorage SUPABASE_URL to this address in the dashboards\n")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+
+
+if __name__ == "__main__":
+    main()
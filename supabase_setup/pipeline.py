@@ -0,0 +1,289 @@
+"""
+Generate-to-Import Pipeline
+Streams generator output straight into Supabase, a local database or JSON files, without intermediate files
+"""
+
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from itertools import chain
+from typing import Iterator, List, Dict, Optional, Tuple
+
+from datasets import DEFAULT_DATA_DIR, TABLES, TABLES_BY_NAME, add_generator_path
+
+add_generator_path()
+
+import generate_design_data as design
+import generate_dryfood_data as dryfood
+import generate_production_data as production
+import generate_steel_data as steel
+from adaptive_batching import AdaptiveBatchSizer
+from compact_upload import CompactUploader
+from export_local import connect, create_indexes, create_table, infer_columns, insert_rows
+from import_data import SUPABASE_KEY, SUPABASE_URL, batch_insert, credentials_set, init_supabase, initial_batch_size
+from import_metrics import ImportInstrumentation
+from record_ids import add_id_args, ids_from_args
+from table_chunks import CHUNK_ROWS, Chunk
+from timestamps import TimestampFormatter, add_timestamp_args
+
+# Chunks the queue holds before generation blocks: at most
+# CHUNK_ROWS * QUEUE_CHUNKS formatted rows wait for the sink
+QUEUE_CHUNKS = 8
+
+MODULES = ("steel", "production", "dryfood", "design")
+
+
+class SupabaseSink:
+    """batch_insert per chunk, keeping each table's adaptive batch size across chunks"""
+
+    def __init__(self, supabase, uploader: Optional[CompactUploader], metrics: ImportInstrumentation):
+        self.supabase = supabase
+        self.uploader = uploader
+        self.metrics = metrics
+        self._sizers: Dict[str, AdaptiveBatchSizer] = {}
+
+    def write(self, table: str, rows: List[Dict]):
+        sizer = self._sizers.get(table)
+        if sizer is None:
+            sizer = self._sizers[table] = AdaptiveBatchSizer(table, initial_size=initial_batch_size(table))
+        self.metrics.record_rows(table, len(rows))
+        batch_insert(self.supabase, table, rows, uploader=self.uploader, metrics=self.metrics, sizer=sizer)
+
+    def flush(self, table: str):
+        pass  # Every chunk is committed by the time batch_insert returns
+
+    def close(self):
+        pass
+
+
+class DatabaseSink:
+    """Embedded SQLite/DuckDB file; columns come from a table's first chunk, indexes follow its last
+
+    The connection is opened on the first write, on the sink thread, since
+    SQLite connections stay on the thread that created them.
+    """
+
+    def __init__(self, engine: str, path: str):
+        self.engine = engine
+        self.path = path
+        self.conn = None
+        self._columns: Dict[str, List[str]] = {}
+
+    def write(self, table: str, rows: List[Dict]):
+        if self.conn is None:
+            self.conn = connect(self.engine, self.path)
+        names = self._columns.get(table)
+        if names is None:
+            columns = infer_columns(rows, self.engine)
+            create_table(self.conn, table, columns)
+            names = self._columns[table] = [name for name, _ in columns]
+        insert_rows(self.conn, self.engine, table, names, rows)
+
+    def flush(self, table: str):
+        create_indexes(self.conn, TABLES_BY_NAME[table])
+        self.conn.commit()
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+
+class FileSink:
+    """The generators' JSON files (one row per line), written as chunks arrive"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._files = {}
+
+    def write(self, table: str, rows: List[Dict]):
+        f = self._files.get(table)
+        if f is None:
+            f = self._files[table] = open(os.path.join(self.directory, TABLES_BY_NAME[table]["file"]), "w")
+            f.write("[\n")
+        else:
+            f.write(",\n")
+        f.write(",\n".join(json.dumps(row) for row in rows))
+
+    def flush(self, table: str):
+        f = self._files.pop(table)
+        f.write("\n]\n")
+        f.close()
+
+    def close(self):
+        for table in list(self._files):
+            self.flush(table)
+
+
+def run_pipeline(producers: List[Iterator[Chunk]], sink, formatter: TimestampFormatter,
+                 chunk_rows: int = CHUNK_ROWS, queue_chunks: int = QUEUE_CHUNKS) -> Dict:
+    """Generate on this thread while a sink thread writes, through a bounded queue
+
+    A full queue blocks generation until the sink catches up, so memory for
+    rows in flight stays bounded and wall time tends to max(generate, sink)
+    instead of their sum. Tables arrive contiguously; each table's flush is
+    queued behind its last chunk and before any row of a table referencing
+    it, so parents are committed before their children.
+    """
+    chunks: "queue.Queue[Optional[Tuple[str, str, Optional[List[Dict]]]]]" = queue.Queue(maxsize=queue_chunks)
+    flushed: List[str] = []
+    rows_by_table: Dict[str, int] = {}
+    failures: List[Exception] = []
+    sink_seconds = 0.0
+    blocked = 0.0
+
+    def drain():
+        nonlocal sink_seconds
+        while True:
+            item = chunks.get()
+            if item is None:
+                try:
+                    sink.close()
+                except Exception as e:
+                    failures.append(e)
+                return
+            if failures:
+                continue  # Keep draining so generation never blocks on a dead sink
+            kind, table, rows = item
+            started = time.perf_counter()
+            try:
+                if kind == "rows":
+                    rows = formatter.format_records([dict(row) for row in rows], TABLES_BY_NAME[table]["timestamps"])
+                    sink.write(table, rows)
+                else:
+                    sink.flush(table)
+            except Exception as e:
+                failures.append(e)
+            sink_seconds += time.perf_counter() - started
+
+    def put(item):
+        nonlocal blocked
+        started = time.perf_counter()
+        chunks.put(item)
+        blocked += time.perf_counter() - started
+
+    def finish(table: str):
+        put(("flush", table, None))
+        flushed.append(table)
+
+    consumer = threading.Thread(target=drain, daemon=True)
+    consumer.start()
+    started = time.perf_counter()
+    current = None
+    try:
+        for table, rows in chain(*producers):
+            if failures:
+                break
+            if table != current:
+                if current:
+                    finish(current)
+                if table in flushed:
+                    raise RuntimeError(f"{table} produced again after it was flushed")
+                waiting = [parent for _, parent, _ in TABLES_BY_NAME[table]["foreign_keys"]
+                           if parent in TABLES_BY_NAME and parent not in flushed]
+                if waiting:
+                    raise RuntimeError(f"{table} produced before its parents {', '.join(waiting)}")
+                current = table
+            rows_by_table[table] = rows_by_table.get(table, 0) + len(rows)
+            for i in range(0, len(rows), chunk_rows):
+                put(("rows", table, rows[i:i + chunk_rows]))
+        if current and not failures:
+            finish(current)
+    finally:
+        generated = time.perf_counter()
+        chunks.put(None)
+        consumer.join()
+    if failures:
+        raise failures[0]
+
+    wall = time.perf_counter() - started
+    generate_seconds = generated - started - blocked
+    return {
+        "wall_seconds": round(wall, 3),
+        "generate_seconds": round(generate_seconds, 3),
+        "sink_seconds": round(sink_seconds, 3),
+        "backpressure_seconds": round(blocked, 3),
+        "sequential_seconds": round(generate_seconds + sink_seconds, 3),
+        "rows": sum(rows_by_table.values()),
+        "tables": rows_by_table,
+    }
+
+
+def main():
+    """Generate and import in one pass"""
+    parser = argparse.ArgumentParser(description="Stream generated data into Supabase, a local database or files")
+    parser.add_argument("--sink", choices=["supabase", "sqlite", "duckdb", "file"], default="supabase")
+    parser.add_argument("--output", help="Database file for sqlite/duckdb (default: generated_data/zero_ecosystem.<engine>) "
+                                         "or directory for file (default: generated_data)")
+    parser.add_argument("--module", action="append", choices=MODULES,
+                        help="Only generate this module (repeatable; default: all)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--queue-chunks", type=int, default=QUEUE_CHUNKS,
+                        help="Chunks waiting for the sink before generation blocks")
+    parser.add_argument("--compress", action="store_true", help="Gzip request bodies (compact upload mode)")
+    parser.add_argument("--strip-derivable", action="store_true",
+                        help="Omit columns the database can derive via defaults or joins")
+    parser.add_argument("--uncertainty-workers", type=int,
+                        help="Processes for the Monte Carlo DPP intervals (default: all CPUs for large runs)")
+    parser.add_argument("--report", default="import_report.json",
+                        help="Where to write the JSON run report (pipeline timings plus per-table import metrics)")
+    add_timestamp_args(parser)
+    add_id_args(parser)
+    args = parser.parse_args()
+    modules = args.module or list(MODULES)
+    ids = ids_from_args(args)
+
+    print("=" * 60)
+    print(f"🚰 GENERATE → {args.sink.upper()} PIPELINE")
+    print("=" * 60)
+
+    metrics = ImportInstrumentation()
+    if args.sink == "supabase":
+        # Compact mode posts to PostgREST itself and runs without the Supabase client
+        supabase = uploader = None
+        if args.compress or args.strip_derivable:
+            if credentials_set():
+                uploader = CompactUploader(SUPABASE_URL, SUPABASE_KEY, compress=args.compress,
+                                           strip_derivable=args.strip_derivable)
+        else:
+            supabase = init_supabase()
+        if not (supabase or uploader):
+            print("\n❌ Cannot proceed without Supabase credentials")
+            return
+        sink = SupabaseSink(supabase, uploader, metrics)
+    elif args.sink == "file":
+        sink = FileSink(args.output or DEFAULT_DATA_DIR)
+    else:
+        extension = "db" if args.sink == "sqlite" else "duckdb"
+        sink = DatabaseSink(args.sink, args.output or os.path.join(DEFAULT_DATA_DIR, f"zero_ecosystem.{extension}"))
+
+    producers = {
+        "steel": lambda: steel.tables(ids),
+        "production": lambda: production.tables(ids, uncertainty_workers=args.uncertainty_workers),
+        "dryfood": lambda: dryfood.tables(ids),
+        "design": lambda: design.tables(ids),
+    }
+    stats = run_pipeline([producers[module]() for module in modules], sink,
+                         TimestampFormatter(args.timestamp_format), args.chunk_rows, args.queue_chunks)
+
+    report = {"pipeline": stats, "import": metrics.report()}
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print("\n" + "=" * 60)
+    for table in (t["table"] for t in TABLES):
+        if table in stats["tables"]:
+            print(f"{table:.<40} {stats['tables'][table]:>10,}")
+    print("=" * 60)
+    print(f"✅ {stats['rows']:,} rows in {stats['wall_seconds']:.1f}s "
+          f"(generate {stats['generate_seconds']:.1f}s, {args.sink} {stats['sink_seconds']:.1f}s, "
+          f"{stats['sequential_seconds']:.1f}s back to back)")
+    print(f"   Generation waited {stats['backpressure_seconds']:.1f}s on a full queue")
+    print(f"   Run report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+"""
+Schema DDL Generator
+Writes data_generators/zero_*_schema.sql from the generated records: monthly range partitions, BRIN and B-tree indexes, KPI materialized views
+"""
+
+import argparse
+import os
+import re
+import tempfile
+from datetime import date
+from typing import List, Dict, Optional, Tuple
+
+from datasets import GENERATOR_DIR, TABLES, add_generator_path, available_tables, load_table
+
+add_generator_path()
+
+from build_cache import DEFAULT_CACHE_DIR, build
+from generate_dryfood_data import STORAGE_EFFICIENCY_NOTE, TRANSPORT_EFFICIENCY_NOTE
+from generate_production_data import DPP_CARE_INSTRUCTIONS, DPP_RECYCLING_INFO
+from generate_steel_data import FURNACES
+from partitioned_output import partition_date
+
+SCHEMA_DIR = GENERATOR_DIR
+MODULES = ("steel", "production", "dryfood", "design")
+LAYOUTS = ("tuned", "flat")
+SAMPLE_SEED = 0
+MONTHS_AHEAD = 3
+BRIN_PAGES_PER_RANGE = 32
+
+# Time columns tables are range-partitioned on by month. A table that other
+# tables reference stays unpartitioned: its primary key would have to
+# include the time column, and foreign keys could no longer point at it.
+PARTITION_COLUMNS = ("timestamp", "start_time")
+REFERENCED = {parent for t in TABLES for _, parent, _ in t["foreign_keys"]}
+
+# Written once, in time order, and never updated, so the time column follows
+# the physical row order: a BRIN index of a few pages answers time-range
+# scans. A table with a B-tree led by the time column gets no BRIN: the
+# dashboards ORDER BY ... LIMIT on that B-tree (BRIN yields no order and the
+# default partition rules out an ordered partition scan), and it answers the
+# same range scans, so a BRIN beside it would only slow the inserts down.
+APPEND_ONLY = {"steel_furnace_metrics", "dryfood_temperature_humidity_logs"}
+
+# Dashboard filters a plain column list cannot express: (table, columns, predicate)
+PARTIAL_INDEXES = [
+    ("steel_alerts", ("timestamp",), "NOT resolved"),
+]
+
+# Text every generated row carries unchanged, held as column defaults so
+# compact uploads (compact_upload.py --strip-derivable) can leave it out
+COLUMN_DEFAULTS = {
+    "production_dpp": {"recycling_info": DPP_RECYCLING_INFO, "care_instructions": DPP_CARE_INSTRUCTIONS},
+    "dryfood_waste_impact_analysis": {"storage_efficiency_improvement": STORAGE_EFFICIENCY_NOTE,
+                                      "transportation_efficiency": TRANSPORT_EFFICIENCY_NOTE},
+}
+
+# Identifiers that are also SQL keywords
+KEYWORDS = {"timestamp"}
+
+PG_TYPES = {bool: "BOOLEAN", int: "BIGINT", float: "DOUBLE PRECISION", str: "TEXT"}
+PG_TIMESTAMP = "TIMESTAMP"  # Generated times are naive wall-clock times
+CREATE_TABLE = re.compile(r"^CREATE TABLE IF NOT EXISTS (\w+) \(\n(.*?)\n\)", re.MULTILINE | re.DOTALL)
+
+# Rows the schema seeds itself: parents that generated tables reference
+REFERENCE_TABLES = {
+    "steel": [
+        ("steel_furnaces",
+         [("furnace_id", "TEXT PRIMARY KEY"), ("name", "TEXT NOT NULL"), ("furnace_type", "TEXT NOT NULL"),
+          ("capacity_tons", "DOUBLE PRECISION NOT NULL")],
+         [(f["id"], f["name"], f["type"], f["capacity"]) for f in FURNACES]),
+    ],
+}
+
+# Materialized views behind the summary cards, mirroring the generators'
+# *_summary.json: (view, unique key or None for single-row views, query)
+KPI_VIEWS = {
+    "steel": [
+        ("steel_kpi_summary", None, """
+SELECT count(*) AS total_batches,
+       round(sum(tonnage)::numeric, 2) AS total_production_tons,
+       round(sum(co2_emitted_kg)::numeric, 2) AS total_co2_emissions_kg,
+       round(sum(energy_used_mwh)::numeric, 2) AS total_energy_consumption_mwh,
+       round((sum(co2_emitted_kg) / nullif(sum(tonnage), 0))::numeric, 2) AS avg_co2_per_ton,
+       round((sum(energy_used_mwh) / nullif(sum(tonnage), 0))::numeric, 3) AS avg_energy_per_ton,
+       count(DISTINCT furnace_id) AS active_furnaces,
+       min(start_time) AS first_batch,
+       max(start_time) AS last_batch
+FROM steel_production_batches"""),
+        ("steel_furnace_daily", ("furnace_id", "day"), """
+SELECT furnace_id,
+       date_trunc('day', "timestamp") AS day,
+       count(*) AS readings,
+       count(*) FILTER (WHERE status = 'operational') AS operational_readings,
+       round(avg(temperature)::numeric, 1) AS avg_temperature,
+       round(avg(capacity_utilization)::numeric, 1) AS avg_capacity_utilization,
+       round(sum(co2_emissions_kg)::numeric, 2) AS co2_emissions_kg,
+       round(sum(energy_consumption_mwh)::numeric, 3) AS energy_consumption_mwh
+FROM steel_furnace_metrics
+GROUP BY furnace_id, date_trunc('day', "timestamp")"""),
+    ],
+    "production": [
+        ("production_kpi_summary", None, """
+SELECT (SELECT count(*) FROM production_orders) AS total_orders,
+       count(*) AS completed_orders,
+       (SELECT count(*) FROM production_orders WHERE status = 'in_progress') AS in_progress_orders,
+       coalesce(sum(quantity), 0) AS total_garments_produced,
+       round(coalesce(sum(total_co2_kg), 0)::numeric, 2) AS total_co2_emissions_kg,
+       round(coalesce(sum(water_usage_liters), 0)::numeric, 2) AS total_water_usage_liters,
+       round(coalesce(sum(total_co2_kg) / nullif(sum(quantity), 0), 0)::numeric, 3) AS avg_co2_per_garment,
+       round(coalesce(sum(water_usage_liters) / nullif(sum(quantity), 0), 0)::numeric, 2) AS avg_water_per_garment,
+       (SELECT count(*) FROM production_dpp) AS dpp_records_issued,
+       (SELECT round(100.0 * count(*) FILTER (WHERE result = 'pass') / nullif(count(*), 0), 1)
+        FROM production_quality_checks) AS quality_pass_rate
+FROM production_orders
+WHERE status = 'completed'"""),
+    ],
+    "dryfood": [
+        ("dryfood_kpi_summary", None, """
+SELECT (SELECT count(*) FROM dryfood_dehydration_batches) AS total_batches,
+       count(*) AS completed_batches,
+       round(sum(fresh_weight_kg)::numeric, 2) AS total_fresh_weight_kg,
+       round(sum(dried_weight_kg)::numeric, 2) AS total_dried_weight_kg,
+       round((100 * (sum(fresh_weight_kg) - sum(dried_weight_kg)) / nullif(sum(fresh_weight_kg), 0))::numeric, 1)
+           AS avg_weight_loss_percent,
+       round(sum(waste_prevented_kg)::numeric, 2) AS total_waste_prevented_kg,
+       round(sum(value_added_usd)::numeric, 2) AS total_value_added_usd,
+       round(sum(co2_emissions_kg)::numeric, 2) AS dehydration_co2_emissions_kg,
+       (SELECT round(sum(landfill_co2_prevented_kg)::numeric, 2) FROM dryfood_waste_impact_analysis)
+           AS landfill_co2_prevented_kg,
+       round(avg(shelf_life_extension_days)) AS avg_shelf_life_extension_days,
+       (SELECT count(DISTINCT food_category) FROM dryfood_dehydration_batches) AS food_categories_processed
+FROM dryfood_dehydration_batches
+WHERE status = 'completed'"""),
+    ],
+    "design": [
+        ("design_kpi_summary", None, """
+SELECT count(*) AS total_projects,
+       count(*) FILTER (WHERE phase = 'completed') AS completed_projects,
+       count(*) FILTER (WHERE phase <> 'completed') AS in_progress_projects,
+       round(sum(total_co2_kg)::numeric, 2) AS total_co2_emissions_kg,
+       round(avg(sustainability_score)::numeric, 1) AS avg_sustainability_score,
+       count(*) FILTER (WHERE target_met) AS sustainability_targets_met,
+       round(100.0 * count(*) FILTER (WHERE target_met) / nullif(count(*), 0), 1) AS target_achievement_rate,
+       round(avg(recyclability_percentage)::numeric, 1) AS avg_recyclability,
+       (SELECT count(*) FROM design_material_alternatives) AS material_alternatives_analyzed,
+       (SELECT count(*) FROM design_lifecycle_assessments) AS lca_reports_completed
+FROM design_projects"""),
+        ("design_industry_summary", ("industry",), """
+SELECT industry,
+       count(*) AS projects,
+       round(avg(co2_per_unit)::numeric, 3) AS avg_co2_per_unit,
+       round(avg(sustainability_score)::numeric, 1) AS avg_sustainability_score,
+       count(*) FILTER (WHERE target_met) AS targets_met
+FROM design_projects
+GROUP BY industry"""),
+    ],
+}
+
+
+def ident(name: str) -> str:
+    return f'"{name}"' if name in KEYWORDS else name
+
+
+def column_list(columns) -> str:
+    return ", ".join(ident(c) for c in columns)
+
+
+def sql_literal(value) -> str:
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return repr(value)
+
+
+def sample_records(data_dir: Optional[str] = None) -> Dict[str, List[Dict]]:
+    """Every table's records: from data_dir, or from a seeded build of the current generators"""
+    if data_dir:
+        return {table: load_table(data_dir, table) for table in available_tables(data_dir)}
+    with tempfile.TemporaryDirectory(prefix="schema_sample_") as out_dir:
+        build(list(MODULES), [], SAMPLE_SEED, out_dir, DEFAULT_CACHE_DIR)
+        return {table: load_table(out_dir, table) for table in available_tables(out_dir)}
+
+
+def partition_column(table_def: Dict) -> Optional[str]:
+    if table_def["table"] in REFERENCED:
+        return None
+    return next((c for c in PARTITION_COLUMNS if c in table_def["timestamps"]), None)
+
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month months after day's"""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_starts(first: date, last: date) -> List[date]:
+    """First day of every month from first's month through last's"""
+    months = [add_months(first, 0)]
+    while months[-1] < add_months(last, 0):
+        months.append(add_months(months[-1], 1))
+    return months
+
+
+def brin_statement(table: str, column: str) -> str:
+    return (f"CREATE INDEX IF NOT EXISTS {table}_{column}_brin ON {table} USING brin ({ident(column)}) "
+            f"WITH (pages_per_range = {BRIN_PAGES_PER_RANGE});")
+
+
+def infer_columns(rows: List[Dict]) -> List[Tuple[str, str]]:
+    columns: Dict[str, str] = {}
+    for row in rows:
+        for name, value in row.items():
+            if columns.get(name) is None:
+                columns[name] = PG_TYPES[type(value)] if value is not None else None
+    return [(name, pg_type or "TEXT") for name, pg_type in columns.items()]
+
+
+def table_columns(table_def: Dict, rows: List[Dict]) -> List[Tuple[str, str]]:
+    """Column types from the records; timestamp columns are TIMESTAMP whatever format they were written in"""
+    return [(name, PG_TIMESTAMP if name in table_def["timestamps"] else pg_type)
+            for name, pg_type in infer_columns(rows)]
+
+
+def index_statements(table_def: Dict, layout: str) -> List[str]:
+    table = table_def["table"]
+    time_column = partition_column(table_def) if layout == "tuned" else None
+    statements = []
+    for columns in table_def["indexes"]:
+        statements.append(
+            f"CREATE INDEX IF NOT EXISTS {table}_{'_'.join(columns)}_idx ON {table} ({column_list(columns)});")
+    if layout == "tuned":
+        if table in APPEND_ONLY and not any(columns[0] == time_column for columns in table_def["indexes"]):
+            statements.append(brin_statement(table, time_column))
+        for partial_table, columns, predicate in PARTIAL_INDEXES:
+            if partial_table == table:
+                statements.append(
+                    f"CREATE INDEX IF NOT EXISTS {table}_{'_'.join(columns)}_partial_idx "
+                    f"ON {table} ({column_list(columns)}) WHERE {predicate};")
+    return statements
+
+
+def key_statements(table: str, key: str, key_type: str) -> List[str]:
+    """Keep a partitioned table's key unique on its own: an unpartitioned {table}_keys
+    table holds every key, kept in step by statement triggers on the parent"""
+    keys = f"{table}_keys"
+    sync = f"""CREATE OR REPLACE FUNCTION {keys}_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        DELETE FROM {keys} k USING old_rows o WHERE k.{ident(key)} = o.{ident(key)};
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO {keys} ({ident(key)}) SELECT {ident(key)} FROM new_rows;
+    ELSIF TG_OP = 'TRUNCATE' THEN
+        TRUNCATE {keys};
+    END IF;
+    RETURN NULL;
+END $$;"""
+    transitions = {
+        "INSERT": "REFERENCING NEW TABLE AS new_rows ",
+        "UPDATE": "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows ",
+        "DELETE": "REFERENCING OLD TABLE AS old_rows ",
+        "TRUNCATE": "",
+    }
+    return [f"CREATE TABLE IF NOT EXISTS {keys} (\n    {ident(key)} {key_type} PRIMARY KEY\n);", sync] + [
+        f"CREATE OR REPLACE TRIGGER {keys}_{event.lower()} AFTER {event} ON {table} "
+        f"{referencing}FOR EACH STATEMENT EXECUTE FUNCTION {keys}_sync();"
+        for event, referencing in transitions.items()
+    ]
+
+
+def table_statements(table_def: Dict, rows: List[Dict], layout: str = "tuned", months_ahead: int = MONTHS_AHEAD,
+                     first_month: Optional[date] = None, indexes: bool = True) -> List[str]:
+    """CREATE TABLE, its monthly partitions and, unless a bulk load builds them afterwards, its indexes"""
+    table = table_def["table"]
+    time_column = partition_column(table_def) if layout == "tuned" else None
+    key = table_def["primary_key"]
+    not_null = {key, time_column} | {column for column, _, _ in table_def["foreign_keys"]}
+
+    defaults = COLUMN_DEFAULTS.get(table, {})
+    columns = table_columns(table_def, rows)
+    lines = [f"    {ident(name)} {pg_type}{' NOT NULL' if name in not_null else ''}"
+             f"{f' DEFAULT {sql_literal(defaults[name])}' if name in defaults else ''}"
+             for name, pg_type in columns]
+    if key:
+        # A partitioned table's unique keys must contain its partition column;
+        # key_statements keeps the key unique on its own
+        lines.append(f"    PRIMARY KEY ({column_list([key, time_column] if time_column else [key])})")
+    for column, parent, parent_column in table_def["foreign_keys"]:
+        lines.append(f"    FOREIGN KEY ({ident(column)}) REFERENCES {parent} ({ident(parent_column)})")
+    suffix = f" PARTITION BY RANGE ({ident(time_column)})" if time_column else ""
+    statements = [f"CREATE TABLE IF NOT EXISTS {table} (\n" + ",\n".join(lines) + f"\n){suffix};"]
+
+    if time_column:
+        days = [partition_date(row[time_column]) for row in rows if row.get(time_column) is not None]
+        today = date.today()
+        first = first_month or (date.fromisoformat(min(days)) if days else today)
+        last = max(date.fromisoformat(max(days)) if days else today, today)
+        for start in month_starts(first, add_months(last, months_ahead)):
+            end = add_months(start, 1)
+            statements.append(
+                f"CREATE TABLE IF NOT EXISTS {table}_{start:%Y_%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{start}') TO ('{end}');")
+        # Rows outside the generated months land here rather than failing the insert
+        statements.append(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT;")
+        if key:
+            statements += key_statements(table, key, dict(columns)[key])
+
+    return statements + (index_statements(table_def, layout) if indexes else [])
+
+
+def kpi_statements(module: str) -> List[str]:
+    statements = []
+    refreshes = []
+    for view, unique_key, query in KPI_VIEWS.get(module, []):
+        statements.append(f"CREATE MATERIALIZED VIEW IF NOT EXISTS {view} AS{query};")
+        if unique_key:
+            statements.append(f"CREATE UNIQUE INDEX IF NOT EXISTS {view}_key ON {view} ({column_list(unique_key)});")
+            refreshes.append(f"    REFRESH MATERIALIZED VIEW CONCURRENTLY {view};")
+        else:
+            refreshes.append(f"    REFRESH MATERIALIZED VIEW {view};")
+    if refreshes:
+        # Run after each import; also callable as supabase.rpc('refresh_zero_<module>_kpis')
+        statements.append(f"CREATE OR REPLACE FUNCTION refresh_zero_{module}_kpis() RETURNS void LANGUAGE sql AS $$\n"
+                          + "\n".join(refreshes) + "\n$$;")
+    return statements
+
+
+def reference_statements(module: str) -> List[str]:
+    """CREATE and seed the module's reference tables"""
+    statements = []
+    for table, columns, rows in REFERENCE_TABLES.get(module, []):
+        names = [name for name, _ in columns]
+        values = ",\n".join("    (" + ", ".join(sql_literal(v) for v in row) + ")" for row in rows)
+        statements += [
+            f"CREATE TABLE IF NOT EXISTS {table} (\n"
+            + ",\n".join(f"    {name} {spec}" for name, spec in columns) + "\n);",
+            f"INSERT INTO {table} ({', '.join(names)}) VALUES\n{values}\nON CONFLICT ({names[0]}) DO NOTHING;",
+        ]
+    return statements
+
+
+def module_sql(module: str, records: Dict[str, List[Dict]], layout: str = "tuned",
+               months_ahead: int = MONTHS_AHEAD, first_month: Optional[date] = None) -> str:
+    """One module's schema: reference tables, generated tables in dependency order, then KPI views"""
+    sections = [reference_statements(module)] if module in REFERENCE_TABLES else []
+    for table_def in TABLES:
+        if table_def["module"] == module and table_def["table"] in records:
+            sections.append(table_statements(table_def, records[table_def["table"]], layout, months_ahead, first_month))
+    if layout == "tuned" and module in KPI_VIEWS:
+        sections.append(kpi_statements(module))
+    return "\n\n".join("\n".join(section) for section in sections) + "\n"
+
+
+def write_schemas(records: Dict[str, List[Dict]], out_dir: str, months_ahead: int = MONTHS_AHEAD) -> List[str]:
+    paths = []
+    for module in MODULES:
+        path = os.path.join(out_dir, f"zero_{module}_schema.sql")
+        with open(path, "w") as f:
+            f.write(f"-- Zero@{module.capitalize()} schema, written by supabase_setup/schema_ddl.py; do not edit by hand.\n"
+                    f"-- Monthly partitions run {months_ahead} months past {date.today():%Y-%m}; rerun to add more.\n\n")
+            f.write(module_sql(module, records, "tuned", months_ahead))
+        paths.append(path)
+    return paths
+
+
+def declared_columns(schema_dir: str = SCHEMA_DIR) -> Dict[str, Dict[str, Tuple[str, bool]]]:
+    """(type, NOT NULL) of every column, by table, as the written zero_*_schema.sql files declare them"""
+    types = sorted({*PG_TYPES.values(), PG_TIMESTAMP}, key=len, reverse=True)
+    tables: Dict[str, Dict[str, Tuple[str, bool]]] = {}
+    for module in MODULES:
+        path = os.path.join(schema_dir, f"zero_{module}_schema.sql")
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            sql = f.read()
+        for table, body in CREATE_TABLE.findall(sql):
+            columns = tables[table] = {}
+            for line in body.splitlines():
+                line = line.strip().rstrip(",")
+                if line.startswith("PRIMARY KEY"):
+                    for name in line[line.index("(") + 1:line.rindex(")")].split(","):
+                        name = name.strip().strip('"')
+                        columns[name] = (columns[name][0], True)
+                elif not line.startswith("FOREIGN KEY"):
+                    name, definition = line.split(" ", 1)
+                    definition = definition.split(" DEFAULT ")[0]
+                    pg_type = next(t for t in types if definition.startswith(t))
+                    columns[name.strip('"')] = (pg_type, "NOT NULL" in definition or "PRIMARY KEY" in definition)
+    return tables
+
+
+def main():
+    """Write the zero_*_schema.sql files"""
+    parser = argparse.ArgumentParser(description="Generate the Postgres schema files from the generated records")
+    parser.add_argument("--data-dir", help="Infer columns from this generated data "
+                                           "(default: a seeded build of the current generators)")
+    parser.add_argument("--output-dir", default=SCHEMA_DIR)
+    parser.add_argument("--months-ahead", type=int, default=MONTHS_AHEAD,
+                        help="Monthly partitions to create past the current month")
+    args = parser.parse_args()
+
+    print("🗄️  Generating Postgres schemas...")
+    records = sample_records(args.data_dir)
+    for path in write_schemas(records, args.output_dir, args.months_ahead):
+        print(f"   ✅ {os.path.relpath(path)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Shared fixtures: a local Postgres and seeded generated data
+
+Tests that need Postgres use $TEST_DATABASE_URL when it is set. Otherwise a
+throwaway cluster is started with the initdb and pg_ctl on $PATH (or in
+$PG_BIN). Without either, or without psycopg, they are skipped.
+"""
+
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import uuid
+
+import pytest
+
+SETUP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SETUP_DIR)
+
+from datasets import add_generator_path
+
+add_generator_path()
+
+from build_cache import build
+
+TEST_SEED = 0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def pg_binary(name: str):
+    directory = os.getenv("PG_BIN")
+    path = os.path.join(directory, name) if directory else shutil.which(name)
+    return path if path and os.access(path, os.X_OK) else None
+
+
+@pytest.fixture(scope="session")
+def pg_dsn(tmp_path_factory):
+    psycopg = pytest.importorskip("psycopg")
+    pytest.importorskip("psycopg_pool")
+
+    dsn = os.getenv("TEST_DATABASE_URL")
+    if dsn:
+        try:
+            psycopg.connect(dsn, connect_timeout=5).close()
+        except psycopg.OperationalError as e:
+            pytest.skip(f"TEST_DATABASE_URL is not reachable: {e}")
+        yield dsn
+        return
+
+    initdb, pg_ctl = pg_binary("initdb"), pg_binary("pg_ctl")
+    if not initdb or not pg_ctl:
+        pytest.skip("No Postgres: set TEST_DATABASE_URL or put initdb and pg_ctl on PATH (or in PG_BIN)")
+    if hasattr(os, "geteuid") and os.geteuid() == 0:
+        pytest.skip("initdb refuses to run as root: set TEST_DATABASE_URL instead")
+
+    data_dir = tmp_path_factory.mktemp("pgdata")
+    port = free_port()
+    subprocess.run([initdb, "-D", str(data_dir), "-U", "postgres", "-E", "UTF8", "--locale=C", "--auth=trust"],
+                   check=True, capture_output=True)
+    subprocess.run([pg_ctl, "-D", str(data_dir), "-l", str(data_dir / "server.log"), "-w",
+                    "-o", f"-p {port} -k {data_dir} -c listen_addresses=127.0.0.1", "start"],
+                   check=True, capture_output=True)
+    try:
+        yield f"postgresql://postgres@127.0.0.1:{port}/postgres"
+    finally:
+        subprocess.run([pg_ctl, "-D", str(data_dir), "-m", "fast", "stop"], capture_output=True)
+
+
+@pytest.fixture
+def pg_schema(pg_dsn):
+    """A connection string scoped to a fresh schema, dropped afterwards"""
+    import psycopg
+    import psycopg.conninfo
+
+    schema = f"zero_test_{uuid.uuid4().hex[:8]}"
+    with psycopg.connect(pg_dsn, autocommit=True) as conn:
+        conn.execute(f"CREATE SCHEMA {schema}")
+    try:
+        yield psycopg.conninfo.make_conninfo(pg_dsn, options=f"-c search_path={schema}")
+    finally:
+        with psycopg.connect(pg_dsn, autocommit=True) as conn:
+            conn.execute(f"DROP SCHEMA {schema} CASCADE")
+
+
+@pytest.fixture(scope="session")
+def generated_data(tmp_path_factory) -> str:
+    """Every generator's output for a fixed seed, with ISO timestamps"""
+    out_dir = tmp_path_factory.mktemp("generated_data")
+    build(["steel", "production", "dryfood", "design"], [], TEST_SEED, str(out_dir),
+          str(tmp_path_factory.mktemp("build_cache")), use_cache=False)
+    return str(out_dir)
@@ -0,0 +1,59 @@
+import pytest
+
+from bench_schema import SCHEMAS, explain, layout_queries, prepare, query_window
+from datasets import TABLES_BY_NAME
+from schema_ddl import index_statements, partition_column, reference_statements, sample_records, table_statements
+
+
+def test_time_btree_and_brin_are_not_both_emitted():
+    for table, table_def in TABLES_BY_NAME.items():
+        statements = index_statements(table_def, "tuned")
+        time_column = partition_column(table_def)
+        if any(" USING brin " in statement for statement in statements):
+            assert all(columns[0] != time_column for columns in table_def["indexes"]), table
+
+
+def test_tuned_schema_runs_the_dashboard_queries(pg_dsn, generated_data):
+    import psycopg
+    import psycopg.conninfo
+
+    records = sample_records(generated_data)
+    since, first_month = query_window(records, history_windows=1)
+    schema = SCHEMAS["tuned"]
+    try:
+        stats = prepare(psycopg, pg_dsn, "tuned", records, generated_data, first_month, 1, workers=2)
+        # One window of history doubles the metrics
+        assert stats["metrics_rows"] == 2 * len(records["steel_furnace_metrics"])
+
+        scoped = psycopg.conninfo.make_conninfo(pg_dsn, options=f"-c search_path={schema}")
+        with psycopg.connect(scoped, autocommit=True) as conn:
+            for name, sql in layout_queries("tuned", since).items():
+                result = explain(conn, sql, repeats=1)
+                assert result["execution_ms"] >= 0, name
+                assert result["relations_scanned"] >= 1, name
+    finally:
+        with psycopg.connect(pg_dsn, autocommit=True) as conn:
+            conn.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+
+
+def test_partitioned_key_stays_unique_across_partitions(pg_schema, generated_data):
+    import psycopg
+
+    table_def = TABLES_BY_NAME["steel_production_batches"]
+    rows = sample_records(generated_data)["steel_production_batches"]
+    with psycopg.connect(pg_schema, autocommit=True) as conn:
+        for statement in reference_statements("steel") + table_statements(table_def, rows):
+            conn.execute(statement)
+        insert = "INSERT INTO steel_production_batches (batch_id, furnace_id, start_time) VALUES (%s, 'FNC-001', %s)"
+        conn.execute(insert, ("B-1", "2024-01-15"))
+        # Same key at another start time: the (batch_id, start_time) primary key lets it through
+        with pytest.raises(psycopg.errors.UniqueViolation):
+            conn.execute(insert, ("B-1", "2024-03-15"))
+
+        conn.execute("UPDATE steel_production_batches SET batch_id = 'B-2'")
+        conn.execute(insert, ("B-1", "2024-03-15"))
+        conn.execute("DELETE FROM steel_production_batches WHERE batch_id = 'B-2'")
+        conn.execute("TRUNCATE steel_production_batches")
+        conn.execute(insert, ("B-2", "2024-01-15"))
+        keys = conn.execute("SELECT batch_id FROM steel_production_batches_keys").fetchall()
+        assert keys == [("B-2",)]
@@ -0,0 +1,46 @@
+"""
+pytest-benchmark versions of bench_generators.py and bench_import.py at 1x
+
+The scripts stay for the 10x and 100x runs and their committed baselines;
+these give per-change numbers with pytest-benchmark's own compare tooling.
+"""
+
+import random
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import bench_generators
+import bench_import
+import import_data
+from datasets import available_tables, load_table
+
+
+@pytest.mark.parametrize("generator", list(bench_generators.BENCHMARKS))
+def test_generator_stages(benchmark, generator):
+    bench = bench_generators.BENCHMARKS[generator]
+
+    def run():
+        random.seed(1)
+        return bench(1)
+
+    stages = benchmark.pedantic(run, rounds=5, iterations=1)
+    assert all(stats["records"] for stats in stages.values())
+
+
+@pytest.fixture(scope="module")
+def fake_endpoint():
+    server = bench_import.start_fake_endpoint(0)
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.mark.parametrize("compress", [False, True], ids=["json", "gzip"])
+def test_batch_insert(benchmark, monkeypatch, generated_data, fake_endpoint, compress):
+    monkeypatch.setattr(import_data, "RATE_LIMIT_SECONDS", 0)
+    tables = {table: load_table(generated_data, table) for table in available_tables(generated_data)}
+
+    report = benchmark.pedantic(bench_import.run_import, args=(fake_endpoint, tables, compress),
+                                rounds=3, iterations=1)
+    assert report["rows_inserted"] == sum(len(rows) for rows in tables.values())
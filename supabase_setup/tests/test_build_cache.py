@@ -0,0 +1,18 @@
+import pytest
+
+from build_cache import split_options, target_order
+
+ALL = target_order(["steel", "production", "dryfood", "design", "emissions"])
+
+
+def test_options_reach_only_the_generators_that_define_them():
+    split = split_options(ALL, ["--uncertainty-workers", "2", "--timestamp-format=epoch", "--partitioned"])
+    assert split["production"] == ["--uncertainty-workers", "2", "--timestamp-format=epoch", "--partitioned"]
+    for name in ("steel", "dryfood", "design"):
+        assert split[name] == ["--timestamp-format=epoch", "--partitioned"]
+    assert split["emissions"] == []
+
+
+def test_unknown_option_is_rejected():
+    with pytest.raises(ValueError, match="--bogus"):
+        split_options(ALL, ["--bogus", "3"])
@@ -0,0 +1,24 @@
+import json
+
+import numpy as np
+
+from design_optimizer import optimize_projects, score_group
+
+MATERIALS = [
+    {"name": "Steel", "co2_kg_per_kg": 1.0, "price_per_kg": 1.0, "recyclable": True},
+    {"name": "Aluminium", "co2_kg_per_kg": 8.0, "price_per_kg": 3.0, "recyclable": True},
+    {"name": "Plastic", "co2_kg_per_kg": 3.0, "price_per_kg": 0.5, "recyclable": False},
+]
+
+
+def test_current_combination_is_not_its_own_alternative():
+    weights, units = np.array([[2.0, 1.0]]), np.array([10.0])
+    # With no slot matching, Steel + Plastic makes the front
+    unmatched = score_group(MATERIALS, weights, units, np.array([[-1, -1]]))[0]
+    assert ["Steel", "Plastic"] in [option["materials"] for option in unmatched]
+
+    project = {"project_id": "PRJ-1", "industry": "Test", "units_planned": 10,
+               "materials_used": json.dumps([{"name": "Steel", "weight_kg": 2.0},
+                                             {"name": "Plastic", "weight_kg": 1.0}])}
+    front = optimize_projects([project], lambda _: MATERIALS)["PRJ-1"]
+    assert [option for option in unmatched if option["materials"] != ["Steel", "Plastic"]] == front
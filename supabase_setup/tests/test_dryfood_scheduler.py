@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta
+
+import generate_dryfood_data
+from dryfood_scheduler import DehydratorScheduler
+from timestamps import to_epoch
+
+START = datetime(2024, 1, 1)
+FLEET = [{"id": "DH-001", "name": "Electric Dehydrator A", "capacity_kg": 100, "energy_type": "electric"}]
+
+
+def test_place_refuses_batches_that_end_past_the_horizon():
+    scheduler = DehydratorScheduler(FLEET, START)
+    horizon_end = START + timedelta(hours=20)
+
+    _, start, end = scheduler.place(50, START, 12, horizon_end)
+    assert (start, end) == (START, START + timedelta(hours=12))
+
+    # Queued behind the first batch it would run until hour 24
+    assert scheduler.place(50, START + timedelta(hours=1), 12, horizon_end) is None
+    # Nothing was booked, so a batch that fits still starts at hour 12
+    _, start, end = scheduler.place(50, START + timedelta(hours=1), 8, horizon_end)
+    assert (start, end) == (START + timedelta(hours=12), horizon_end)
+
+
+def test_generated_batches_end_before_generation_time():
+    # One machine cannot keep up with the requests, so the queue runs past now
+    scheduler = DehydratorScheduler(FLEET, datetime.now() - timedelta(days=60))
+    batches = list(generate_dryfood_data.iter_dehydration_batches(2000, scheduler))
+    now = to_epoch(datetime.now())
+    assert 0 < len(batches) < 2000
+    assert all(batch["end_time"] <= now for batch in batches)
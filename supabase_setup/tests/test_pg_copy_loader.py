@@ -0,0 +1,68 @@
+import pytest
+
+from datasets import TABLES_BY_NAME, available_tables, iso_timestamps, load_table
+from pg_copy_loader import csv_chunks, load_all
+from schema_ddl import partition_column
+
+
+def test_csv_chunks_keeps_null_apart_from_empty_text():
+    rows = [{"a": None, "b": "", "c": True, "d": 'say "hi"'}]
+    assert list(csv_chunks(rows, ["a", "b", "c", "d"])) == [',"",t,"say ""hi"""\n']
+
+
+def test_iso_timestamps_converts_epoch_seconds_only():
+    rows = [{"timestamp": 86400, "resolved_at": None}, {"timestamp": "1970-01-02T00:00:00", "resolved_at": 90000}]
+    assert iso_timestamps("steel_alerts", rows) == [
+        {"timestamp": "1970-01-02T00:00:00", "resolved_at": None},
+        {"timestamp": "1970-01-02T00:00:00", "resolved_at": "1970-01-02T01:00:00"},
+    ]
+
+
+def index_names(conn, table):
+    return {name for (name,) in conn.execute(
+        "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s", (table,))}
+
+
+def check_loaded(conninfo, data_dir, stats):
+    import psycopg
+
+    tables = available_tables(data_dir)
+    assert sorted(s["table"] for s in stats) == sorted(tables)
+    with psycopg.connect(conninfo) as conn:
+        for table in tables:
+            expected = len(load_table(data_dir, table))
+            assert conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0] == expected, table
+
+            table_def = TABLES_BY_NAME[table]
+            names = index_names(conn, table)
+            for columns in table_def["indexes"]:
+                assert f"{table}_{'_'.join(columns)}_idx" in names, (table, columns)
+            if partition_column(table_def):
+                # Indexes rebuilt on the parent must reach every partition
+                partitions = [name for (name,) in conn.execute(
+                    "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                    "WHERE i.inhparent = %s::regclass", (table,))]
+                assert partitions
+                for partition in partitions:
+                    assert len(index_names(conn, partition)) >= len(names), partition
+
+        invalid = conn.execute(
+            "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relnamespace = current_schema()::regnamespace AND NOT i.indisvalid").fetchall()
+        assert invalid == []
+
+
+def test_create_tables_then_reload(pg_schema, generated_data):
+    stats = load_all(pg_schema, generated_data, workers=2, create=True, truncate=False)
+    check_loaded(pg_schema, generated_data, stats)
+    assert all(s["indexes_rebuilt"] >= len(TABLES_BY_NAME[s["table"]]["indexes"]) for s in stats)
+
+    # A reload drops the secondary indexes it finds and rebuilds them after the COPY
+    reloaded = load_all(pg_schema, generated_data, workers=2, create=False, truncate=True)
+    check_loaded(pg_schema, generated_data, reloaded)
+    assert {s["table"]: s["indexes_rebuilt"] for s in reloaded} == {s["table"]: s["indexes_rebuilt"] for s in stats}
+
+
+def test_missing_table_without_create_fails(pg_schema, generated_data):
+    with pytest.raises(RuntimeError, match="does not exist"):
+        load_all(pg_schema, generated_data, workers=1, create=False, truncate=False)
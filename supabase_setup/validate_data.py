@@ -0,0 +1,214 @@
+"""
+Pre-Import Data Validator
+Checks foreign keys, primary keys, and the column types and nullability the schema declares, in one streamed pass per table
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from datasets import (
+    DEFAULT_DATA_DIR, REFERENCE_KEYS, TABLES, TABLES_BY_NAME, available_tables, iter_partition, iter_table,
+    load_manifest, load_waves,
+)
+from schema_ddl import SCHEMA_DIR, declared_columns
+
+TYPE_NAMES = {bool: "boolean", int: "integer", float: "float", str: "text", list: "array", dict: "object"}
+# JSON values each declared column type takes. Timestamps are ISO text, or
+# epoch seconds that the loaders convert (datasets.iso_timestamps)
+ACCEPTED_TYPES = {
+    "BOOLEAN": frozenset({bool}),
+    "BIGINT": frozenset({int}),
+    "DOUBLE PRECISION": frozenset({int, float}),
+    "TEXT": frozenset({str}),
+    "TIMESTAMP": frozenset({str, int}),
+}
+
+
+def iter_rows(data_dir: str, table: str, manifest: Optional[Dict] = None) -> Iterable[Dict]:
+    """Rows of a table streamed from its JSON file, or from its NDJSON partitions without one"""
+    if table in available_tables(data_dir):
+        yield from iter_table(data_dir, table)
+        return
+    entry = (manifest or {}).get("tables", {}).get(table)
+    for partition in (entry or {}).get("partitions", []):
+        yield from iter_partition(data_dir, partition)
+
+
+class TableReport:
+    """Issue counts per (problem, column) plus a capped list of offending rows"""
+
+    def __init__(self, table: str, max_examples: int):
+        self.table = table
+        self.max_examples = max_examples
+        self.rows = 0
+        self.counts: Dict[Tuple[str, str], int] = {}
+        self.examples: List[Dict] = []
+
+    def add(self, row: int, column: str, problem: str, value: Any):
+        key = (problem, column)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        if len(self.examples) < self.max_examples:
+            self.examples.append({"row": row, "column": column, "problem": problem, "value": value})
+
+    @property
+    def errors(self) -> int:
+        return sum(self.counts.values())
+
+    def to_dict(self) -> Dict:
+        return {
+            "rows": self.rows,
+            "errors": self.errors,
+            "by_problem": [
+                {"problem": problem, "column": column, "count": count}
+                for (problem, column), count in sorted(self.counts.items())
+            ],
+            "examples": self.examples,
+        }
+
+
+def validate_table(rows: Iterable[Dict], table_def: Dict, declared: Dict[str, Tuple[str, bool]],
+                   key_sets: Dict[Tuple[str, str], Set], collect: List[str], max_examples: int = 20) -> TableReport:
+    """Check one table's rows against its declared columns, collecting the key columns its children reference
+
+    ``declared`` maps each column of the schema to its (type, NOT NULL).
+    Every value must have a JSON type the column's type takes, and NOT NULL
+    columns must be present and non-null. The first row fixes the column
+    set the others must share. Primary keys must be unique and foreign keys
+    must hit a key in ``key_sets``.
+    """
+    report = TableReport(table_def["table"], max_examples)
+    primary_key = table_def["primary_key"]
+    foreign_keys = [(column, key_sets.get((parent, parent_column)))
+                    for column, parent, parent_column in table_def["foreign_keys"]]
+    accepted = {column: ACCEPTED_TYPES[pg_type] for column, (pg_type, _) in declared.items()}
+    required = [column for column, (_, not_null) in declared.items() if not_null]
+    collected = {column: key_sets.setdefault((table_def["table"], column), set()) for column in collect}
+    seen_keys: Set = set()
+    columns: Optional[Set[str]] = None
+
+    for index, row in enumerate(rows):
+        report.rows += 1
+        if columns is None:
+            columns = set(row)
+        elif row.keys() != columns:
+            for column in columns - row.keys():
+                report.add(index, column, "missing column", None)
+            for column in row.keys() - columns:
+                if column in accepted:  # Undeclared columns are reported below
+                    report.add(index, column, "unexpected column", row[column])
+
+        for column, value in row.items():
+            kinds = accepted.get(column)
+            if kinds is None:
+                report.add(index, column, "column not in schema", value)
+            elif value is not None and type(value) not in kinds:
+                kind = type(value)
+                report.add(index, column, f"expected {declared[column][0].lower()}, "
+                                          f"got {TYPE_NAMES.get(kind, kind.__name__)}", value)
+
+        for column in required:
+            if row.get(column) is None:
+                report.add(index, column, "null in non-null column", None)
+
+        if primary_key:
+            key = row.get(primary_key)
+            if key in seen_keys:
+                report.add(index, primary_key, "duplicate primary key", key)
+            seen_keys.add(key)
+
+        for column, parent_keys in foreign_keys:
+            value = row.get(column)
+            if parent_keys is not None and value is not None and value not in parent_keys:
+                report.add(index, column, "foreign key has no parent", value)
+
+        for column, keys in collected.items():
+            keys.add(row.get(column))
+
+    return report
+
+
+def validate(data_dir: str, max_examples: int = 20, schema_dir: str = SCHEMA_DIR) -> Dict:
+    """Validate every available table against the schema files in schema_dir, parents first
+
+    Returns the JSON-ready report.
+    """
+    started = time.perf_counter()
+    schema = declared_columns(schema_dir)
+    tables = available_tables(data_dir)
+    manifest = load_manifest(data_dir)
+    if manifest:
+        tables += [t["table"] for t in TABLES if t["table"] in manifest["tables"] and t["table"] not in tables]
+
+    # Only keep key sets for the parent columns something references
+    referenced: Dict[str, List[str]] = {}
+    for table_def in TABLES:
+        for _, parent, parent_column in table_def["foreign_keys"]:
+            referenced.setdefault(parent, [])
+            if parent_column not in referenced[parent]:
+                referenced[parent].append(parent_column)
+    key_sets: Dict[Tuple[str, str], Set] = {key: set(values) for key, values in REFERENCE_KEYS.items()}
+
+    reports = {}
+    for wave in load_waves(tables):
+        for table in wave:
+            if table not in schema:
+                raise ValueError(f"{table} is not in the schema files in {schema_dir} (run schema_ddl.py)")
+            report = validate_table(iter_rows(data_dir, table, manifest), TABLES_BY_NAME[table], schema[table],
+                                    key_sets, referenced.get(table, []), max_examples)
+            reports[table] = report.to_dict()
+
+    # Foreign keys into tables that are neither generated nor seeded cannot be checked
+    unchecked = sorted({
+        f"{t['table']}.{column} -> {parent}"
+        for t in TABLES if t["table"] in reports
+        for column, parent, parent_column in t["foreign_keys"]
+        if (parent, parent_column) not in key_sets
+    })
+    return {
+        "seconds": round(time.perf_counter() - started, 3),
+        "rows": sum(r["rows"] for r in reports.values()),
+        "errors": sum(r["errors"] for r in reports.values()),
+        "unchecked_foreign_keys": unchecked,
+        "tables": reports,
+    }
+
+
+def print_report(report: Dict):
+    for table, stats in report["tables"].items():
+        mark = "✅" if not stats["errors"] else "❌"
+        print(f"   {mark} {table}: {stats['rows']:,} rows, {stats['errors']:,} problems")
+        for problem in stats["by_problem"]:
+            print(f"      - {problem['column']}: {problem['problem']} ({problem['count']:,} rows)")
+        for example in stats["examples"][:5]:
+            print(f"        row {example['row']}: {example['column']} = {example['value']!r}")
+    for fk in report["unchecked_foreign_keys"]:
+        print(f"   ⚠️  Not checked (parent not available): {fk}")
+    print(f"\n{'✅' if not report['errors'] else '❌'} {report['rows']:,} rows validated in "
+          f"{report['seconds']:.2f}s, {report['errors']:,} problems")
+
+
+def main():
+    """Validate generated data before importing it"""
+    parser = argparse.ArgumentParser(description="Validate generated data before import")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--max-examples", type=int, default=20, help="Offending rows kept per table")
+    parser.add_argument("--schema-dir", default=SCHEMA_DIR, help="Where the zero_*_schema.sql files to check against are")
+    parser.add_argument("--report", help="Also write the full report as JSON")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🔎 PRE-IMPORT VALIDATION")
+    print("=" * 60)
+    report = validate(args.data_dir, args.max_examples, args.schema_dir)
+    print_report(report)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+    sys.exit(1 if report["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()